@@ -1,10 +1,11 @@
 from django.contrib import admin
-from api.models import AttendeeUser,Organizer,Event,Ticket,Comment,Bookmarks
+from api.models import AttendeeUser,Organizer,Event,Ticket,Comment,Bookmarks,Tag
 
 # Register your models here.
 admin.site.register(Ticket)
 admin.site.register(Comment)
 admin.site.register(Bookmarks)
+admin.site.register(Tag)
 
 
 @admin.register(AttendeeUser)
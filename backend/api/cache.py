@@ -0,0 +1,340 @@
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+EVENT_VERSION_KEY = 'event:{id}:version'
+EVENT_LIST_VERSION_KEY = 'events:list:version'
+USER_ENGAGEMENT_KEY = 'user:{id}:engagement'
+# Engagement sets are dropped on every write, so they can live for a long time
+USER_ENGAGEMENT_TIMEOUT = 60 * 60 * 24
+
+
+def _cache_get_many(keys: Iterable[str]) -> dict:
+    """
+    Read several cache entries, treating an unreachable cache as a miss.
+
+    The cached responses are only a shortcut to the database, so a cache outage must
+    slow requests down rather than fail them.
+
+    Args:
+        keys (Iterable[str]): The cache keys.
+
+    Returns:
+        dict: The entries found, by key; empty if the cache could not be read.
+    """
+    try:
+        return cache.get_many(keys)
+    except Exception as e:
+        logger.warning(f"Cache read failed, falling back to the database: {str(e)}")
+        return {}
+
+
+def _cache_get(key: str):
+    """Read a cache entry, returning None if it is missing or the cache could not be read."""
+    return _cache_get_many([key]).get(key)
+
+
+def _cache_set(key: str, value, timeout: Optional[int]) -> None:
+    """Store a cache entry, logging instead of failing if the cache could not be written."""
+    try:
+        cache.set(key, value, timeout=timeout)
+    except Exception as e:
+        logger.warning(f"Cache write of {key} failed: {str(e)}")
+
+
+def _fresh_version() -> int:
+    """
+    Start a version counter that was evicted or never set.
+
+    Counters start at the current time in milliseconds rather than at 1, so a recreated
+    counter never points back at entries that were cached under an earlier version.
+    """
+    return int(time.time() * 1000)
+
+
+def _get_versions(keys: List[str]) -> Dict[str, int]:
+    """
+    Read several version counters at once, starting the ones that are missing.
+
+    Args:
+        keys (List[str]): The version keys.
+
+    Returns:
+        Dict[str, int]: The current version of each key.
+    """
+    versions = _cache_get_many(keys)
+    for key in keys:
+        if key not in versions:
+            try:
+                cache.add(key, _fresh_version(), timeout=None)
+                versions[key] = cache.get(key) or _fresh_version()
+            except Exception as e:
+                # Keys under a fresh version are never found, so every read is a miss
+                logger.warning(f"Cache version {key} unavailable: {str(e)}")
+                versions[key] = _fresh_version()
+    return versions
+
+
+def _bump_version(key: str) -> None:
+    """
+    Move a version counter forward, so every entry cached under the old version is skipped.
+
+    Args:
+        key (str): The version key.
+    """
+    try:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _fresh_version(), timeout=None)
+    except Exception as e:
+        logger.error(f"Failed to bump cache version {key}: {str(e)}")
+
+
+def get_cached_events(event_ids: Iterable[int]) -> Tuple[Dict[int, dict], Dict[int, str]]:
+    """
+    Look up the cached anonymous payloads of several events.
+
+    The payload keys embed each event's current version, so they must be read before the
+    events are loaded from the database: a payload built from a row that changed in the
+    meantime is then stored under an outdated key and never served.
+
+    Args:
+        event_ids (Iterable[int]): The IDs of the events.
+
+    Returns:
+        Tuple[Dict[int, dict], Dict[int, str]]: The cached payloads by event ID, and the
+        cache key of every event for storing the missing payloads with `cache_events`.
+    """
+    event_ids = list(event_ids)
+    versions = _get_versions([EVENT_VERSION_KEY.format(id=event_id) for event_id in event_ids])
+    keys = {
+        event_id: f'event:{event_id}:v{versions[EVENT_VERSION_KEY.format(id=event_id)]}:payload'
+        for event_id in event_ids
+    }
+    cached = _cache_get_many(keys.values())
+    payloads = {event_id: cached[key] for event_id, key in keys.items() if key in cached}
+    return payloads, keys
+
+
+def payload_timeout(payload: dict, now: Optional[datetime] = None) -> int:
+    """
+    Get how long an event payload may be cached.
+
+    The registration and event statuses in the payload depend on the current time, so the
+    payload expires at the next registration or event date, and after
+    `EVENT_CACHE_TIMEOUT` seconds at the latest.
+
+    Args:
+        payload (dict): The event payload.
+        now (Optional[datetime]): The current time.
+
+    Returns:
+        int: The timeout in seconds.
+    """
+    now = now or timezone.now()
+    timeout = settings.EVENT_CACHE_TIMEOUT
+    for field in ('start_date_register', 'end_date_register', 'start_date_event', 'end_date_event'):
+        moment = payload.get(field)
+        if moment and moment > now:
+            timeout = min(timeout, int((moment - now).total_seconds()) + 1)
+    return timeout
+
+
+def cache_events(keys: Dict[int, str], payloads: Dict[int, dict]) -> None:
+    """
+    Store the anonymous payloads of events built after a cache miss.
+
+    Args:
+        keys (Dict[int, str]): The cache keys returned by `get_cached_events`.
+        payloads (Dict[int, dict]): The payloads to store, by event ID.
+    """
+    now = timezone.now()
+    for event_id, payload in payloads.items():
+        _cache_set(keys[event_id], payload, payload_timeout(payload, now))
+
+
+def get_cached_availability(event_id: int) -> Tuple[Optional[dict], str]:
+    """
+    Look up the cached seat availability of an event.
+
+    Args:
+        event_id (int): The ID of the event.
+
+    Returns:
+        Tuple[Optional[dict], str]: The cached availability or None, and the cache key for
+        storing it with `cache_availability`.
+    """
+    version_key = EVENT_VERSION_KEY.format(id=event_id)
+    key = f'event:{event_id}:v{_get_versions([version_key])[version_key]}:availability'
+    return _cache_get(key), key
+
+
+def cache_availability(key: str, availability: dict) -> None:
+    """
+    Store the seat availability of an event until its event version changes.
+
+    Args:
+        key (str): The cache key returned by `get_cached_availability`.
+        availability (dict): The availability, with the registration dates it depends on.
+    """
+    _cache_set(key, availability, payload_timeout(availability))
+
+
+def _listing_key(suffix: str) -> str:
+    """
+    Build the cache key of an entry derived from the public event list, such as a page or
+    the facet counts, under the current list version.
+
+    Args:
+        suffix (str): What the entry holds.
+
+    Returns:
+        str: The cache key.
+    """
+    version = _get_versions([EVENT_LIST_VERSION_KEY])[EVENT_LIST_VERSION_KEY]
+    return f'events:list:v{version}:{suffix}'
+
+
+def get_cached_event_page(cursor: Optional[str], limit: Optional[int],
+                          filters: str = '') -> Tuple[Optional[Tuple[List[int], Optional[str]]], str]:
+    """
+    Look up a cached page of the public event list.
+
+    Only the IDs of the events in the page and the next cursor are cached; the events
+    themselves come from their own payload entries, so a like on one event does not
+    invalidate every page.
+
+    Args:
+        cursor (Optional[str]): The cursor of the page.
+        limit (Optional[int]): The page size.
+        filters (str): The canonical query string of the list filters, empty if unfiltered.
+
+    Returns:
+        Tuple: The cached `(event_ids, next_cursor)` of the page or None, and the cache key
+        for storing the page with `cache_event_page`.
+    """
+    key = _listing_key(f'{filters}:{cursor or ""}:{limit or ""}')
+    return _cache_get(key), key
+
+
+def cache_event_page(key: str, event_ids: List[int], next_cursor: Optional[str]) -> None:
+    """
+    Store a page of the public event list.
+
+    Args:
+        key (str): The cache key returned by `get_cached_event_page`.
+        event_ids (List[int]): The IDs of the events in the page, in order.
+        next_cursor (Optional[str]): The cursor of the next page.
+    """
+    _cache_set(key, (event_ids, next_cursor), settings.EVENT_CACHE_TIMEOUT)
+
+
+def get_cached_facets(filters: str = '') -> Tuple[Optional[dict], str]:
+    """
+    Look up the cached facet counts of the public event list.
+
+    Args:
+        filters (str): The canonical query string of the list filters, empty if unfiltered.
+
+    Returns:
+        Tuple[Optional[dict], str]: The cached facet counts or None, and the cache key for
+        storing them with `cache_facets`.
+    """
+    key = _listing_key(f'facets:{filters}')
+    return _cache_get(key), key
+
+
+def cache_facets(key: str, facets: dict) -> None:
+    """
+    Store the facet counts of the public event list.
+
+    Args:
+        key (str): The cache key returned by `get_cached_facets`.
+        facets (dict): The facet counts.
+    """
+    _cache_set(key, facets, settings.EVENT_CACHE_TIMEOUT)
+
+
+def invalidate_events(event_ids: Iterable[int], listing: bool = False) -> None:
+    """
+    Invalidate the cached payloads of events after they were written to.
+
+    The versions are bumped straight away and again when the current transaction
+    commits, so a request that read the old rows while the transaction was open cannot
+    leave them cached.
+
+    Args:
+        event_ids (Iterable[int]): The IDs of the events that changed.
+        listing (bool): Whether the event list changed as well, e.g. an event was
+            created, deleted or its creation date edited.
+    """
+    keys = [EVENT_VERSION_KEY.format(id=event_id) for event_id in event_ids]
+    if listing:
+        keys.append(EVENT_LIST_VERSION_KEY)
+
+    def bump():
+        for key in keys:
+            _bump_version(key)
+
+    try:
+        bump()
+        transaction.on_commit(bump)
+    except Exception as e:
+        logger.error(f"Failed to invalidate cached events {keys}: {str(e)}")
+
+
+def get_user_engagement(user_id: int) -> Optional[Dict[str, Set[int]]]:
+    """
+    Get the cached IDs of the events a user liked, bookmarked and registered for.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        Optional[Dict[str, Set[int]]]: The `liked`, `bookmarked` and `applied` event ID
+        sets, or None if they are not cached.
+    """
+    return _cache_get(USER_ENGAGEMENT_KEY.format(id=user_id))
+
+
+def cache_user_engagement(user_id: int, engagement: Dict[str, Set[int]]) -> None:
+    """
+    Store the event ID sets of a user, as returned by `get_user_engagement`.
+
+    Args:
+        user_id (int): The ID of the user.
+        engagement (Dict[str, Set[int]]): The `liked`, `bookmarked` and `applied` event ID sets.
+    """
+    _cache_set(USER_ENGAGEMENT_KEY.format(id=user_id), engagement, USER_ENGAGEMENT_TIMEOUT)
+
+
+def invalidate_user_engagement(user_id: int) -> None:
+    """
+    Drop the cached event ID sets of a user after they liked, bookmarked or registered.
+
+    Like the event versions, the sets are dropped straight away and again when the
+    current transaction commits.
+
+    Args:
+        user_id (int): The ID of the user.
+    """
+    key = USER_ENGAGEMENT_KEY.format(id=user_id)
+
+    def drop():
+        try:
+            cache.delete(key)
+        except Exception as e:
+            logger.error(f"Failed to invalidate cached engagement of user {user_id}: {str(e)}")
+
+    drop()
+    transaction.on_commit(drop)
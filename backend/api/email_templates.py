@@ -0,0 +1,179 @@
+from html import escape
+from string import Template
+from typing import Dict
+
+
+EMAIL_FOOTER = """
+            <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #eee;">
+                <small style="color: #666;">This is an automated message, please do not reply directly to this email.</small>
+            </div>"""
+
+REMINDER_HTML = """
+        <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+            <h2 style="color: #333;">Event Reminder</h2>
+            <p>Dear ${full_name},</p>
+            <p>This is a reminder that <strong>${event_name}</strong> will take place tomorrow.</p>
+
+            <div style="background-color: #f8f9fa; padding: 20px; margin: 20px 0; border-radius: 5px;">
+                <h3 style="margin-top: 0;">Event Details</h3>
+                <p><strong>Event:</strong> ${event_name}</p>
+                <p><strong>Date:</strong> ${start_date}</p>
+                <p><strong>Location:</strong> ${address}</p>
+            </div>
+
+            <p>We look forward to seeing you there!</p>
+            ${footer}
+        </div>
+        """
+
+REGISTRATION_HTML = """
+        <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+            <h2 style="color: #333;">Registration Confirmed</h2>
+            <p>Dear ${full_name},</p>
+            <p>Your registration for <strong>${event_name}</strong> has been confirmed!</p>
+
+            <div style="background-color: #f8f9fa; padding: 20px; margin: 20px 0; border-radius: 5px;">
+                <h3 style="margin-top: 0;">Event Details</h3>
+                <p><strong>Event:</strong> ${event_name}</p>
+                <p><strong>Date:</strong> ${start_date}</p>
+                <p><strong>Location:</strong> ${address}</p>
+                <p><strong>Ticket Number:</strong> ${ticket_number}</p>
+            </div>
+
+            <div style="background-color: #e9ecef; padding: 20px; margin: 20px 0; border-radius: 5px;">
+                <h3 style="margin-top: 0;">Important Information</h3>
+                <p>${description}</p>
+            </div>
+
+            <p>Please keep your ticket number for reference: <strong>${ticket_number}</strong></p>
+            ${footer}
+        </div>
+        """
+
+CANCELLATION_HTML = """
+        <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+            <h2 style="color: #333;">Ticket Cancellation Confirmation</h2>
+            <p>Dear ${full_name},</p>
+            <p>Your ticket for <strong>${event_name}</strong> has been cancelled.</p>
+
+            <div style="background-color: #f8f9fa; padding: 20px; margin: 20px 0; border-radius: 5px;">
+                <h3 style="margin-top: 0;">Cancellation Details</h3>
+                <p><strong>Event:</strong> ${event_name}</p>
+                <p><strong>Ticket Number:</strong> ${ticket_number}</p>
+                <p><strong>Cancellation Date:</strong> ${cancellation_date}</p>
+            </div>
+
+            <p>If you have any questions about this cancellation, please contact our support team.</p>
+            ${footer}
+        </div>
+        """
+
+
+class EmailTemplate:
+    """
+    An HTML email template rendered in two stages.
+
+    The fields that are the same for every attendee of an event are substituted once by
+    `bind`, which returns a smaller template that only has the attendee placeholders left.
+    Rendering a message then only substitutes the attendee's own fields.
+    """
+    def __init__(self, source: str):
+        """
+        Args:
+            source (str): The template source, with `${field}` placeholders.
+        """
+        self.template = Template(Template(source).safe_substitute(footer=EMAIL_FOOTER))
+
+    @staticmethod
+    def event_fields(event) -> Dict[str, str]:
+        """
+        Get the escaped, formatted per-event fields of an event.
+
+        The values end up in the source of the bound template, so a `$` in them is doubled
+        to stay literal text instead of being read as a placeholder by the second stage.
+
+        Args:
+            event (Event): The event the email is about.
+
+        Returns:
+            Dict[str, str]: The per-event template fields.
+        """
+        fields = {
+            'event_name': escape(event.event_name or ''),
+            'start_date': event.start_date_event.strftime('%B %d, %Y %I:%M %p'),
+            'address': escape(event.address or ''),
+            'description': escape(event.description or ''),
+        }
+        return {name: value.replace('$', '$$') for name, value in fields.items()}
+
+    def bind(self, event) -> Template:
+        """
+        Substitute the per-event fields of the template.
+
+        Args:
+            event (Event): The event the email is about.
+
+        Returns:
+            Template: A template with only the per-attendee placeholders left.
+        """
+        return Template(self.template.safe_substitute(self.event_fields(event)))
+
+
+# Compiled once when the module is imported
+EMAIL_TEMPLATES = {
+    'reminder': EmailTemplate(REMINDER_HTML),
+    'registration': EmailTemplate(REGISTRATION_HTML),
+    'cancellation': EmailTemplate(CANCELLATION_HTML),
+}
+
+
+# Per-event bound templates, keyed on template name, event ID and last update time
+_bound_templates: Dict[tuple, Template] = {}
+BOUND_TEMPLATE_CACHE_SIZE = 256
+
+
+def bind_event_template(name: str, event) -> Template:
+    """
+    Get a template with the per-event fields of an event already substituted.
+
+    The result is cached, so the per-event part is rendered once per event, and again
+    after the event is edited.
+
+    Args:
+        name (str): The template name, one of `EMAIL_TEMPLATES`.
+        event (Event): The event the email is about.
+
+    Returns:
+        Template: A template with only the per-attendee placeholders left.
+    """
+    if event.pk is None:
+        return EMAIL_TEMPLATES[name].bind(event)
+    key = (name, event.pk, event.updated_at)
+    bound = _bound_templates.get(key)
+    if bound is None:
+        if len(_bound_templates) >= BOUND_TEMPLATE_CACHE_SIZE:
+            _bound_templates.clear()
+        bound = _bound_templates[key] = EMAIL_TEMPLATES[name].bind(event)
+    return bound
+
+
+def render_ticket_email(name: str, ticket, **fields) -> str:
+    """
+    Render a ticket email for one attendee.
+
+    Only the attendee's name, the ticket number and any extra fields are substituted
+    per call; the rest comes from `bind_event_template`.
+
+    Args:
+        name (str): The template name, one of `EMAIL_TEMPLATES`.
+        ticket (Ticket): The ticket the email is about.
+        **fields: Extra per-message fields, such as `cancellation_date`.
+
+    Returns:
+        str: The rendered HTML content
+    """
+    return bind_event_template(name, ticket.event).substitute(
+        full_name=escape(ticket.attendee.full_name),
+        ticket_number=ticket.ticket_number,
+        **fields,
+    )
@@ -0,0 +1,184 @@
+import math
+from typing import List, Optional, Tuple
+
+
+GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+# Precision of the geohash stored on every event, about 1.2 m by 0.6 m
+GEOHASH_PRECISION = 10
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def has_location(latitude, longitude) -> bool:
+    """
+    Check whether coordinates were actually set.
+
+    Events and users default to (0, 0), which therefore means "no location" rather
+    than a point in the Gulf of Guinea.
+
+    Args:
+        latitude: The latitude, or None.
+        longitude: The longitude, or None.
+
+    Returns:
+        bool: Whether the coordinates are a location.
+    """
+    if latitude is None or longitude is None:
+        return False
+    return bool(float(latitude) or float(longitude))
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """
+    Encode coordinates as a geohash.
+
+    Points close to each other share a long geohash prefix, so a B-tree index on the
+    geohash answers "which points lie in this cell" with a single range scan.
+
+    Args:
+        latitude (float): The latitude in degrees.
+        longitude (float): The longitude in degrees.
+        precision (int): The number of characters of the geohash.
+
+    Returns:
+        str: The geohash.
+    """
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+    geohash, bits, value, even = [], 0, 0, True
+    while len(geohash) < precision:
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            geohash.append(GEOHASH_BASE32[value])
+            bits, value = 0, 0
+    return ''.join(geohash)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """
+    Get the size of the geohash cells of a precision.
+
+    Args:
+        precision (int): The number of characters of the geohash.
+
+    Returns:
+        Tuple[float, float]: The height and width of a cell in degrees.
+    """
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Get the latitude and longitude ranges that contain a circle.
+
+    Args:
+        latitude (float): The latitude of the centre in degrees.
+        longitude (float): The longitude of the centre in degrees.
+        radius_km (float): The radius in kilometres.
+
+    Returns:
+        Tuple[float, float, float, float]: The minimum and maximum latitude and longitude. The
+        longitudes go past -180 or 180 when the circle crosses the antimeridian, and span
+        more than 360 degrees when it contains a pole.
+    """
+    latitude, longitude = float(latitude), float(longitude)
+    lat_delta = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0)
+    # Near the poles a degree of longitude shrinks to nothing, so the box spans every longitude
+    widest = max(abs(min_lat), abs(max_lat))
+    lng_delta = 360.0 if widest >= 89.9 else lat_delta / math.cos(math.radians(widest))
+    return min_lat, max_lat, longitude - lng_delta, longitude + lng_delta
+
+
+def covering_prefixes(latitude: float, longitude: float, radius_km: float, max_cells: int = 32) -> List[str]:
+    """
+    Find the geohash prefixes of the cells that together cover a circle.
+
+    The finest precision whose cells cover the circle's bounding box with at most
+    `max_cells` cells is used, so the circle takes a few index range scans and the cells
+    hold little more than the circle itself.
+
+    Args:
+        latitude (float): The latitude of the centre in degrees.
+        longitude (float): The longitude of the centre in degrees.
+        radius_km (float): The radius in kilometres.
+        max_cells (int): The maximum number of cells.
+
+    Returns:
+        List[str]: The sorted geohash prefixes. A single empty prefix covers the whole world.
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+    best = ['']
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        height, width = cell_size(precision)
+        lng_cells = int(360 / width)
+        rows = range(int((min_lat + 90) // height), min(int((max_lat + 90) // height), int(180 / height) - 1) + 1)
+        first = int((min_lng + 180) // width)
+        last = int((max_lng + 180) // width)
+        columns = {column % lng_cells for column in range(first, min(last, first + lng_cells - 1) + 1)}
+        if len(rows) * len(columns) > max_cells:
+            break
+        best = sorted({
+            encode_geohash(-90 + (row + 0.5) * height, -180 + (column + 0.5) * width, precision)
+            for row in rows for column in columns
+        })
+    return best
+
+
+def prefix_range(prefix: str) -> Tuple[str, str]:
+    """
+    Turn a geohash prefix into the range of geohashes that start with it.
+
+    Args:
+        prefix (str): The geohash prefix.
+
+    Returns:
+        Tuple[str, str]: The inclusive lower and exclusive upper bound.
+    """
+    # '{' sorts right after 'z', the last geohash character
+    return prefix, prefix + '{'
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """
+    Get the great-circle distance between two points.
+
+    Args:
+        lat1 (float): The latitude of the first point in degrees.
+        lng1 (float): The longitude of the first point in degrees.
+        lat2 (float): The latitude of the second point in degrees.
+        lng2 (float): The longitude of the second point in degrees.
+
+    Returns:
+        float: The distance in kilometres.
+    """
+    lat1, lng1, lat2, lng2 = map(math.radians, (float(lat1), float(lng1), float(lat2), float(lng2)))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def event_geohash(latitude, longitude) -> Optional[str]:
+    """
+    Get the geohash stored on an event.
+
+    Args:
+        latitude: The latitude of the event, or None.
+        longitude: The longitude of the event, or None.
+
+    Returns:
+        Optional[str]: The geohash, or None if the event has no location.
+    """
+    if not has_location(latitude, longitude):
+        return None
+    return encode_geohash(latitude, longitude)
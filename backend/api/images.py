@@ -0,0 +1,183 @@
+import io
+import logging
+import os
+from concurrent.futures import Executor
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from api.cache import invalidate_events
+from api.storage import ImageUploadService
+
+
+logger = logging.getLogger(__name__)
+
+# Widths of the resized copies made of every uploaded image
+IMAGE_VARIANT_WIDTHS = (320, 640, 1280)
+
+# Variant format -> (Pillow format, content type, save options)
+IMAGE_VARIANT_FORMATS = {
+    'webp': ('WEBP', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# Image field -> JSON field holding the keys of its variants
+IMAGE_VARIANT_FIELDS = {
+    'event_image': 'image_variants',
+    'logo': 'logo_variants',
+}
+
+
+def variant_key(key: str, width: int, fmt: str) -> str:
+    """
+    Build the object key of a variant of an image.
+
+    Args:
+        key (str): The object key of the original image.
+        width (int): The width of the variant.
+        fmt (str): The variant format, one of `IMAGE_VARIANT_FORMATS`.
+
+    Returns:
+        str: The variant key, e.g. `event_images/<name>_640w.webp`.
+    """
+    return f'{os.path.splitext(key)[0]}_{width}w.{fmt}'
+
+
+def variant_keys(variants: Dict[str, Dict[str, str]]) -> List[str]:
+    """
+    List every object key stored in an image's variants.
+
+    Args:
+        variants (Dict[str, Dict[str, str]]): Variant keys by width and format.
+
+    Returns:
+        List[str]: The object keys.
+    """
+    return [key for formats in (variants or {}).values() for key in formats.values()]
+
+
+def variant_urls(variants: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+    """
+    Turn the stored variant keys of an image into public URLs.
+
+    Args:
+        variants (Dict[str, Dict[str, str]]): Variant keys by width and format.
+
+    Returns:
+        Dict[str, Dict[str, str]]: Variant URLs by width and format.
+    """
+    return {
+        width: {fmt: ImageUploadService.file_url(key) for fmt, key in formats.items()}
+        for width, formats in (variants or {}).items()
+    }
+
+
+def _prepare(image: Image.Image) -> Image.Image:
+    """
+    Apply the EXIF orientation and flatten transparency onto white, so every format can be saved.
+    """
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _render_width(image: Image.Image, width: int) -> Dict[str, bytes]:
+    """
+    Resize an image to a width and encode it in every variant format.
+    """
+    height = max(1, round(image.height * width / image.width))
+    resized = image.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+    encoded = {}
+    for fmt, (pil_format, _, options) in IMAGE_VARIANT_FORMATS.items():
+        buffer = io.BytesIO()
+        resized.save(buffer, pil_format, **options)
+        encoded[fmt] = buffer.getvalue()
+    return encoded
+
+
+def render_variants(data: bytes, widths: Iterable[int] = IMAGE_VARIANT_WIDTHS,
+                    executor: Optional[Executor] = None) -> Dict[int, Dict[str, bytes]]:
+    """
+    Render the resized copies of an image in every variant format.
+
+    Images are never enlarged: widths at or above the original width are skipped, and an
+    image narrower than every width gets a single variant at its own width. Pillow releases
+    the GIL while resizing and encoding, so the widths can be rendered on a thread pool.
+
+    Args:
+        data (bytes): The original image file.
+        widths (Iterable[int]): The widths to render.
+        executor (Optional[Executor]): Renders the widths in parallel when given.
+
+    Returns:
+        Dict[int, Dict[str, bytes]]: The encoded variants by width and format.
+
+    Raises:
+        PIL.UnidentifiedImageError: If the data is not an image.
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        image = _prepare(original)
+    targets = [width for width in sorted(widths) if width < image.width] or [image.width]
+    if executor is None:
+        rendered = [_render_width(image, width) for width in targets]
+    else:
+        rendered = list(executor.map(lambda width: _render_width(image, width), targets))
+    return dict(zip(targets, rendered))
+
+
+def invalidate_image_owner(model_name: str, pk: int) -> None:
+    """
+    Invalidate the cached event responses that show an image whose variants changed.
+
+    Args:
+        model_name (str): The model of the image owner, `event` or `organizer`.
+        pk (int): The ID of the image owner.
+    """
+    from api.models.event import Event
+    if model_name == 'event':
+        invalidate_events([pk])
+    else:
+        invalidate_events(Event.objects.filter(organizer_id=pk).values_list('id', flat=True))
+
+
+def schedule_image_variants(instance, field: str) -> None:
+    """
+    Discard the variants of an image that was just replaced and queue new ones to be generated.
+
+    The old variant objects are deleted and the stored keys cleared straight away, so
+    responses fall back to the original image until the task has finished. The task is
+    queued once the current transaction commits.
+
+    Args:
+        instance (Model): The event or organizer whose image changed.
+        field (str): The image field, one of `IMAGE_VARIANT_FIELDS`.
+    """
+    variants_field = IMAGE_VARIANT_FIELDS[field]
+    old_variants = getattr(instance, variants_field)
+    if old_variants:
+        uploads = ImageUploadService(os.path.dirname(getattr(instance, field).name or ''))
+        for key in variant_keys(old_variants):
+            uploads.delete(key)
+        setattr(instance, variants_field, {})
+        type(instance).objects.filter(pk=instance.pk).update(**{variants_field: {}})
+        invalidate_image_owner(instance._meta.model_name, instance.pk)
+
+    if not getattr(instance, field):
+        return
+
+    from api.utils import generate_image_variants
+    model_name = instance._meta.model_name
+    pk = instance.pk
+
+    def dispatch():
+        try:
+            generate_image_variants.delay(model_name, pk, field)
+        except Exception as e:
+            logger.error(f"Failed to queue image variants for {model_name} {pk}: {str(e)}")
+
+    transaction.on_commit(dispatch)
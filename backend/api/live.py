@@ -0,0 +1,308 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, Optional, Set
+
+import redis
+import redis.asyncio as aioredis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import StreamingHttpResponse
+
+
+logger = logging.getLogger(__name__)
+
+COMMENT_CHANNEL = 'event:{id}:comments'
+AVAILABILITY_CHANNEL = 'event:{id}:availability'
+# Messages a slow stream may fall behind by before it misses some
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class LiveHub(ABC):
+    """
+    Fan-out of live messages to the streams open in this process.
+
+    Every stream subscribes to a channel with its own queue, but the hub listens to each
+    channel only once per process however many streams follow it, and hands every message
+    to all their queues. Messages are published from request threads and delivered on the
+    event loop of the ASGI server.
+    """
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @abstractmethod
+    def publish(self, channel: str, message: str) -> None:
+        """
+        Send a message to every stream following a channel, in any process.
+
+        Args:
+            channel (str): The channel name.
+            message (str): The message, already encoded for the streams.
+        """
+
+    @abstractmethod
+    async def _listen(self, channel: str) -> None:
+        """Start receiving the messages of a channel that got its first subscriber."""
+
+    @abstractmethod
+    async def _unlisten(self, channel: str) -> None:
+        """Stop receiving the messages of a channel that lost its last subscriber."""
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[asyncio.Queue]:
+        """
+        Follow a channel for as long as the context is open.
+
+        Args:
+            channel (str): The channel name.
+
+        Yields:
+            asyncio.Queue: The queue the messages of the channel are put in; None is put
+            in it when the hub can no longer deliver them and the stream should end.
+        """
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._loop = asyncio.get_running_loop()
+        first = not self._subscribers[channel]
+        self._subscribers[channel].add(queue)
+        try:
+            if first:
+                await self._listen(channel)
+            yield queue
+        finally:
+            subscribers = self._subscribers[channel]
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[channel]
+                await self._unlisten(channel)
+
+    def subscriber_count(self, channel: str) -> int:
+        """Get the number of streams in this process following a channel."""
+        return len(self._subscribers.get(channel, ()))
+
+    def _end_streams(self) -> None:
+        """End every open stream, so its client reconnects and follows the channel afresh."""
+        subscribers, self._subscribers = self._subscribers, defaultdict(set)
+        for queues in subscribers.values():
+            for queue in queues:
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def _dispatch(self, channel: str, message: str) -> None:
+        """Hand a message to the queue of every stream following its channel, on the event loop."""
+        for queue in list(self._subscribers.get(channel, ())):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning(f"Dropped a live message on {channel} for a stream that fell behind.")
+
+
+class RedisLiveHub(LiveHub):
+    """
+    Hub that fans messages out across processes through Redis pub/sub.
+
+    Each process holds a single pub/sub connection, subscribed to the channels its streams
+    follow, so thousands of viewers cost one subscription per worker.
+    """
+    def __init__(self, url: str):
+        super().__init__()
+        self.url = url
+        self._publisher = redis.Redis.from_url(url)
+        self._client = None
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+
+    def publish(self, channel: str, message: str) -> None:
+        try:
+            self._publisher.publish(channel, message)
+        except redis.RedisError as e:
+            logger.error(f"Failed to publish a live message on {channel}: {str(e)}")
+
+    async def _listen(self, channel: str) -> None:
+        if self._pubsub is None:
+            self._client = aioredis.Redis.from_url(self.url)
+            self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            await self._pubsub.subscribe(channel)
+            self._reader = asyncio.create_task(self._read(self._pubsub))
+        else:
+            await self._pubsub.subscribe(channel)
+
+    async def _unlisten(self, channel: str) -> None:
+        if self._pubsub is None:
+            return
+        if self._subscribers:
+            await self._pubsub.unsubscribe(channel)
+            return
+        # The last stream of the process closed, so the connection is released
+        client, pubsub, reader = self._client, self._pubsub, self._reader
+        self._client, self._pubsub, self._reader = None, None, None
+        reader.cancel()
+        await asyncio.gather(reader, return_exceptions=True)
+        await pubsub.aclose()
+        await client.aclose()
+
+    async def _read(self, pubsub) -> None:
+        """
+        Deliver the messages of the pub/sub connection until it is closed.
+
+        If the connection is lost, messages published meanwhile are missed, so every open
+        stream is ended instead. `EventSource` clients then reconnect, the next stream opens
+        a new connection and starts with the current state.
+        """
+        try:
+            async for message in pubsub.listen():
+                if message['type'] == 'message':
+                    self._dispatch(message['channel'].decode(), message['data'].decode())
+        except asyncio.CancelledError:
+            return
+        except redis.RedisError as e:
+            logger.error(f"Live message connection lost, ending its streams: {str(e)}")
+        if self._pubsub is not pubsub:
+            return
+        client = self._client
+        self._client, self._pubsub, self._reader = None, None, None
+        self._end_streams()
+        try:
+            await pubsub.aclose()
+            await client.aclose()
+        except redis.RedisError:
+            pass
+
+
+class InProcessLiveHub(LiveHub):
+    """Hub that only reaches the streams of this process, for tests and a single worker."""
+
+    def publish(self, channel: str, message: str) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed() or channel not in self._subscribers:
+            return
+        loop.call_soon_threadsafe(self._dispatch, channel, message)
+
+    async def _listen(self, channel: str) -> None:
+        pass
+
+    async def _unlisten(self, channel: str) -> None:
+        pass
+
+
+_hub: Optional[LiveHub] = None
+
+
+def get_live_hub() -> LiveHub:
+    """
+    Get the live message hub of this process.
+
+    Returns:
+        LiveHub: The Redis hub, or the in-process hub when `LIVE_PUBSUB_URL` is not set.
+    """
+    global _hub
+    if _hub is None:
+        url = settings.LIVE_PUBSUB_URL
+        _hub = RedisLiveHub(url) if url else InProcessLiveHub()
+    return _hub
+
+
+def sse_frame(name: str, payload: dict) -> str:
+    """
+    Encode a server-sent event.
+
+    Args:
+        name (str): The event name.
+        payload (dict): The event data, sent as JSON.
+
+    Returns:
+        str: The frame.
+    """
+    return f"event: {name}\ndata: {json.dumps(payload, cls=DjangoJSONEncoder)}\n\n"
+
+
+def publish_on_commit(channel: str, name: str, payload: Callable[[], Optional[dict]]) -> None:
+    """
+    Push a server-sent event to the live streams of a channel once the transaction commits.
+
+    Args:
+        channel (str): The channel name.
+        name (str): The event name.
+        payload (Callable[[], Optional[dict]]): Builds the event data after the commit, so
+            it reflects the committed rows; nothing is sent if it returns None.
+    """
+    def publish():
+        data = payload()
+        if data is not None:
+            get_live_hub().publish(channel, sse_frame(name, data))
+
+    transaction.on_commit(publish)
+
+
+def publish_comment(event_id: int, action: str, payload: dict) -> None:
+    """
+    Push a comment change to the live streams of its event once the transaction commits.
+
+    Args:
+        event_id (int): The ID of the event of the comment.
+        action (str): `created`, `edited` or `deleted`.
+        payload (dict): The comment data sent to the clients.
+    """
+    publish_on_commit(COMMENT_CHANNEL.format(id=event_id), f'comment.{action}', lambda: payload)
+
+
+async def sse_messages(channel: str, initial: Optional[Callable[[], str]] = None) -> AsyncIterator[str]:
+    """
+    Follow a channel as server-sent events.
+
+    A comment line is sent when nothing happened for `LIVE_KEEPALIVE_SECONDS`, so proxies
+    keep the connection open. The stream ends after `LIVE_STREAM_SECONDS`: Django does not
+    notice clients that went away while a response streams, so streams are bounded, and
+    `EventSource` clients reconnect on their own after the `retry` delay. The stream also
+    ends early when the hub loses its connection to Redis.
+
+    Args:
+        channel (str): The channel name.
+        initial (Optional[Callable[[], str]]): Builds a frame sent first, such as the current
+            state. It runs once the channel is followed, so no later change is missed.
+
+    Yields:
+        str: The server-sent event frames.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.LIVE_STREAM_SECONDS
+    async with get_live_hub().subscribe(channel) as messages:
+        yield "retry: 3000\n\n"
+        if initial:
+            yield await sync_to_async(initial)()
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                message = await asyncio.wait_for(messages.get(), min(remaining, settings.LIVE_KEEPALIVE_SECONDS))
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if message is None:
+                # The hub lost its connection, so the client reconnects
+                return
+            yield message
+
+
+def sse_response(channel: str, initial: Optional[Callable[[], str]] = None) -> StreamingHttpResponse:
+    """
+    Stream a channel to the client as server-sent events.
+
+    The stream is an asynchronous iterator, so it must be served by the ASGI application,
+    where waiting for messages holds no worker thread.
+
+    Args:
+        channel (str): The channel name.
+        initial (Optional[Callable[[], str]]): Builds a frame sent first, such as the current state.
+
+    Returns:
+        StreamingHttpResponse: The `text/event-stream` response.
+    """
+    response = StreamingHttpResponse(sse_messages(channel, initial), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
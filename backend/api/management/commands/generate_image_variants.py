@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from api.models.event import Event
+from api.models.organizer import Organizer
+from api.utils import generate_image_variants
+
+
+class Command(BaseCommand):
+    """
+    Queue variant generation for event images and organizer logos that do not have
+    resized copies yet, e.g. images uploaded before the variants existed.
+    """
+    help = "Queue the generation of resized image variants for images that have none."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report how many images are missing variants, do not queue anything.",
+        )
+
+    def handle(self, *args, **options):
+        missing = [
+            ('event', 'event_image', Event.objects.exclude(event_image='').exclude(event_image__isnull=True)
+             .filter(image_variants={}).values_list('id', flat=True)),
+            ('organizer', 'logo', Organizer.objects.exclude(logo='').exclude(logo__isnull=True)
+             .filter(logo_variants={}).values_list('id', flat=True)),
+        ]
+        queued = 0
+        for model_name, field, ids in missing:
+            ids = list(ids)
+            self.stdout.write(f"{len(ids)} {model_name} image(s) without variants.")
+            if options['dry_run']:
+                continue
+            for pk in ids:
+                generate_image_variants.delay(model_name, pk, field)
+            queued += len(ids)
+
+        if not options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"Queued variant generation for {queued} image(s)."))
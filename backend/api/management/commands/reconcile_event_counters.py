@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from api.models.event import Event
+
+
+class Command(BaseCommand):
+    """
+    Recount the denormalized engagement counters of events whose stored values drifted
+    from their tickets, likes and bookmarks.
+    """
+    help = "Reconcile Event.attendee_count, like_count and bookmark_count with their source rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report the drifted events, do not update them.",
+        )
+
+    def handle(self, *args, **options):
+        drifted = Event.objects.with_counter_drift().values(
+            'id', 'attendee_count', 'actual_attendee_count', 'like_count',
+            'actual_like_count', 'bookmark_count', 'actual_bookmark_count',
+        )
+        drifted_ids = []
+        for event in drifted:
+            drifted_ids.append(event['id'])
+            self.stdout.write(
+                f"Event {event['id']}: attendees {event['attendee_count']} -> {event['actual_attendee_count']}, "
+                f"likes {event['like_count']} -> {event['actual_like_count']}, "
+                f"bookmarks {event['bookmark_count']} -> {event['actual_bookmark_count']}"
+            )
+
+        if options['dry_run'] or not drifted_ids:
+            self.stdout.write(f"{len(drifted_ids)} event(s) with drifted counters.")
+            return
+
+        updated = Event.objects.filter(id__in=drifted_ids).reconcile_counters()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled counters of {updated} event(s)."))
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.16 on 2026-10-18 18:05
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Event = apps.get_model('api', 'Event')
+    Like = apps.get_model('api', 'Like')
+    Bookmarks = apps.get_model('api', 'Bookmarks')
+    Ticket = apps.get_model('api', 'Ticket')
+
+    def count_per_event(queryset):
+        counts = (
+            queryset.filter(event=OuterRef('pk'))
+            .order_by()
+            .values('event')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        return Coalesce(Subquery(counts[:1]), 0)
+
+    Event.objects.update(
+        like_count=count_per_event(Like.objects.filter(status='like')),
+        bookmark_count=count_per_event(Bookmarks.objects.all()),
+        attendee_count=count_per_event(Ticket.objects.all()),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0026_event_other_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='attendee_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='bookmark_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.16 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0027_event_engagement_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, help_text='Object keys of the resized copies of the event image, by width and format'),
+        ),
+        migrations.AddField(
+            model_name='organizer',
+            name='logo_variants',
+            field=models.JSONField(blank=True, default=dict, help_text='Object keys of the resized copies of the logo, by width and format'),
+        ),
+    ]
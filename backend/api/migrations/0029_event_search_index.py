@@ -0,0 +1,52 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:40
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    # The backfill is a copy of the search backends' rebuild as of this migration, so later
+    # changes to the Event model or to api.search do not change what this migration does
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute("ALTER TABLE api_event ADD COLUMN search_vector tsvector")
+        schema_editor.execute("CREATE INDEX api_event_search_vector_gin ON api_event USING GIN (search_vector)")
+        schema_editor.execute(
+            "UPDATE api_event e SET search_vector = "
+            "setweight(to_tsvector('english', coalesce(e.event_name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(e.tags, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(o.organizer_name, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(e.description, '')), 'C') || "
+            "setweight(to_tsvector('english', coalesce(e.detailed_description, '')), 'D') "
+            "FROM api_organizer o WHERE o.id = e.organizer_id"
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE api_event_fts USING fts5("
+            "event_name, tags, organizer_name, description, detailed_description, "
+            "tokenize='porter unicode61')"
+        )
+        schema_editor.execute(
+            "INSERT INTO api_event_fts (rowid, event_name, tags, organizer_name, description, detailed_description) "
+            "SELECT e.id, e.event_name, e.tags, o.organizer_name, e.description, e.detailed_description "
+            "FROM api_event e LEFT JOIN api_organizer o ON o.id = e.organizer_id"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS api_event_search_vector_gin")
+        schema_editor.execute("ALTER TABLE api_event DROP COLUMN IF EXISTS search_vector")
+    elif vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS api_event_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0028_image_variants"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
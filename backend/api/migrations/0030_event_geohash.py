@@ -0,0 +1,61 @@
+from django.db import migrations, models
+
+
+# A frozen copy of the encoder in api.geo, so this migration keeps its meaning if the app code changes
+GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 10
+
+
+def event_geohash(latitude, longitude):
+    """Encode the coordinates of an event as a geohash, or None for the default (0, 0)."""
+    if latitude is None or longitude is None or not (float(latitude) or float(longitude)):
+        return None
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+    geohash, bits, value, even = [], 0, 0, True
+    while len(geohash) < GEOHASH_PRECISION:
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            geohash.append(GEOHASH_BASE32[value])
+            bits, value = 0, 0
+    return ''.join(geohash)
+
+
+def fill_geohashes(apps, schema_editor):
+    """Compute the geohash of every event that already has coordinates."""
+    Event = apps.get_model('api', 'Event')
+    events = Event.objects.exclude(latitude=None).exclude(longitude=None).only('id', 'latitude', 'longitude')
+    batch = []
+    for event in events.iterator(chunk_size=2000):
+        event.geohash = event_geohash(event.latitude, event.longitude)
+        if event.geohash:
+            batch.append(event)
+        if len(batch) >= 2000:
+            Event.objects.bulk_update(batch, ['geohash'])
+            batch = []
+    Event.objects.bulk_update(batch, ['geohash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0029_event_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Geohash of the coordinates, kept by save() for finding nearby events', max_length=12, null=True),
+        ),
+        migrations.RunPython(fill_geohashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0030_event_geohash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-event_create_date', '-id'], name='event_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['category', '-event_create_date', '-id'], name='event_category_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['is_free', 'is_online', '-event_create_date', '-id'], name='event_price_online_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status_registeration', '-event_create_date', '-id'], name='event_reg_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['start_date_event'], name='event_start_date_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:01
+
+from django.db import migrations, models
+
+
+def parse_tags(text):
+    """Split comma-separated tags into distinct lowercase names with single spaces, as entered then."""
+    names = (' '.join(name.split()).lower()[:50] for name in (text or '').split(','))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def link_tags(apps, schema_editor):
+    """Create the tags of every event from its comma-separated `tags` text."""
+    Event = apps.get_model('api', 'Event')
+    Tag = apps.get_model('api', 'Tag')
+    links = {}
+    for event_id, text in Event.objects.exclude(tags='').values_list('id', 'tags').iterator(chunk_size=2000):
+        for name in parse_tags(text):
+            links.setdefault(name, []).append(event_id)
+    Tag.objects.bulk_create([Tag(name=name) for name in links], ignore_conflicts=True)
+    tag_ids = dict(Tag.objects.values_list('name', 'id'))
+    Through = Tag.events.through
+    Through.objects.bulk_create(
+        [Through(tag_id=tag_ids[name], event_id=event_id) for name, event_ids in links.items() for event_id in event_ids],
+        batch_size=2000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0031_event_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('events', models.ManyToManyField(blank=True, related_name='tag_set', to='api.event')),
+            ],
+        ),
+        migrations.RunPython(link_tags, migrations.RunPython.noop),
+    ]
@@ -5,7 +5,8 @@ from api.models.ticket import Ticket
 from api.models.bookmarks import Bookmarks
 from api.models.like import Like
 from api.models.comment import Comment, CommentReaction
+from api.models.tag import Tag
 
 __all__ = ['AttendeeUser', 'Event', 'Organizer',
            'Session', 'Ticket', 'Bookmarks', 'Like',
-           'Comment', 'CommentReaction']
\ No newline at end of file
+           'Comment', 'CommentReaction', 'Tag']
\ No newline at end of file
@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from .event import Event
 from .user import AttendeeUser
+from api.cache import invalidate_user_engagement
 from django.utils import timezone
 
 
@@ -25,6 +26,24 @@ class Bookmarks(models.Model):
     attendee = models.ForeignKey(AttendeeUser, on_delete= models.CASCADE)
     bookmark_at = models.DateTimeField('Bookmark at', default = timezone.now)
     
+    def save(self, *args, **kwargs):
+        """Override save method to count new bookmarks on the event."""
+        with transaction.atomic():
+            is_new = self._state.adding
+            super().save(*args, **kwargs)
+            if is_new:
+                Event.adjust_counter(self.event_id, 'bookmark_count', 1)
+                invalidate_user_engagement(self.attendee_id)
+
+    def delete(self, *args, **kwargs):
+        """Override delete method to uncount the bookmark on the event."""
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            # A concurrent delete may have removed the row already
+            if result[1].get(self._meta.label):
+                Event.adjust_counter(self.event_id, 'bookmark_count', -1)
+                invalidate_user_engagement(self.attendee_id)
+        return result
     
     def __str__(self):
         return f"Attendee : {self.attendee.first_name}, Event : {self.event.event_name}"
@@ -1,7 +1,43 @@
+from typing import Dict, Iterable, List, Optional
 from django.db import models
+from django.db.models import Count, Q
+from django.db.models.expressions import RawSQL
 from api.models.user import AttendeeUser
 from api.models.event import Event
 
+
+class CommentQuerySet(models.QuerySet):
+    def descendants_of(self, comment_ids: List[int]):
+        """
+        Get every reply below some comments, at any depth.
+
+        A recursive CTE walks down the `parent` links, so a whole thread is found by one
+        query however deep and wide it is.
+
+        Args:
+            comment_ids (List[int]): The IDs of the comments whose threads to load.
+
+        Returns:
+            QuerySet: The replies, excluding the comments themselves.
+        """
+        if not comment_ids:
+            return self.none()
+        table = self.model._meta.db_table
+        placeholders = ', '.join(['%s'] * len(comment_ids))
+        thread = RawSQL(
+            f"""
+            WITH RECURSIVE thread(id) AS (
+                SELECT id FROM {table} WHERE parent_id IN ({placeholders})
+                UNION ALL
+                SELECT reply.id FROM {table} reply JOIN thread ON reply.parent_id = thread.id
+            )
+            SELECT id FROM thread
+            """,
+            list(comment_ids),
+        )
+        return self.filter(id__in=thread)
+
+
 class Comment(models.Model):
     """Model for session comments with threading and moderation capabilities"""
 
@@ -27,6 +63,8 @@ class Comment(models.Model):
         default=Status.APPROVED
     )
 
+    objects = CommentQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
 
@@ -34,6 +72,49 @@ class Comment(models.Model):
         return f"Comment by {self.user.username} on {self.session.session_name}"
     
     
+class CommentReactionQuerySet(models.QuerySet):
+    def summarize(self, comment_ids: Iterable[int], user: Optional[AttendeeUser] = None) -> Dict[int, Dict]:
+        """
+        Count the reactions of some comments by type, with the types the user reacted with.
+
+        One grouped query covers every comment, using the index of the unique constraint,
+        whose leading column is the comment.
+
+        Args:
+            comment_ids (Iterable[int]): The IDs of the comments.
+            user (Optional[AttendeeUser]): The user whose own reactions to include, if any.
+
+        Returns:
+            Dict[int, Dict]: For every comment ID, the `reaction_counts` of every reaction
+            type and the `my_reactions` types of the user.
+        """
+        comment_ids = list(comment_ids)
+        summary = {
+            comment_id: {
+                "reaction_counts": {reaction_type: 0 for reaction_type, _ in CommentReaction.REACTION_CHOICES},
+                "my_reactions": [],
+            }
+            for comment_id in comment_ids
+        }
+        if not comment_ids:
+            return summary
+        user_id = user.id if user is not None and user.is_authenticated else None
+        rows = (
+            self.filter(comment_id__in=comment_ids)
+            .values('comment_id', 'reaction_type')
+            .annotate(count=Count('id'), mine=Count('id', filter=Q(user_id=user_id)))
+            .order_by()
+        )
+        mine = set()
+        for row in rows:
+            summary[row['comment_id']]["reaction_counts"][row['reaction_type']] = row['count']
+            if row['mine']:
+                mine.add((row['comment_id'], row['reaction_type']))
+        for comment_id, counts in summary.items():
+            counts["my_reactions"] = [reaction for reaction in counts["reaction_counts"] if (comment_id, reaction) in mine]
+        return summary
+
+
 class CommentReaction(models.Model):
     """Model for comment reactions (likes, etc.)"""
 
@@ -48,6 +129,8 @@ class CommentReaction(models.Model):
     reaction_type = models.CharField(max_length=20, choices=REACTION_CHOICES)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = CommentReactionQuerySet.as_manager()
+
     class Meta:
         unique_together = ['comment', 'user', 'reaction_type']
         
\ No newline at end of file
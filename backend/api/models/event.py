@@ -1,10 +1,110 @@
 import re
+from functools import lru_cache
+from typing import FrozenSet, Optional
 from django.db import models
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.core.files.storage import default_storage
 from django.core.validators import MaxValueValidator, FileExtensionValidator
 from django.core.exceptions import ValidationError
 from api.models.organizer import Organizer
+from api.images import variant_urls
+from api.cache import cache_availability, get_cached_availability, invalidate_events
+from api.search import SEARCH_FIELDS, get_search_backend
+from api.geo import event_geohash
+
+
+# Fields the public event list can be filtered and ordered by; changing one changes the list
+LISTING_FIELDS = ('event_create_date', 'category', 'is_free', 'is_online', 'dress_code',
+                  'status_registeration', 'start_date_event', 'tags')
+
+
+@lru_cache(maxsize=4096)
+def parse_email_domains(text: str) -> FrozenSet[str]:
+    """
+    Parse the comma-separated allowed email domains of an event.
+
+    The result only depends on the text, so it is cached per process and every event
+    with the same domains shares one parsed set.
+
+    Args:
+        text (str): The comma-separated domains.
+
+    Returns:
+        FrozenSet[str]: The lowercase domains.
+    """
+    return frozenset(domain.strip().lower() for domain in text.split(',') if domain.strip())
+
+
+class EventQuerySet(models.QuerySet):
+    """
+    QuerySet helpers for checking and repairing the denormalized engagement counters.
+    """
+
+    @staticmethod
+    def _count_per_event(queryset):
+        """
+        Build a correlated subquery counting the rows of `queryset` that belong to the outer event.
+
+        Args:
+            queryset (QuerySet): Rows with an `event` foreign key to count.
+
+        Returns:
+            Coalesce: An expression evaluating to the row count, or 0 when there is none.
+        """
+        counts = (
+            queryset.filter(event=OuterRef('pk'))
+            .order_by()
+            .values('event')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        return Coalesce(Subquery(counts[:1]), 0)
+
+    def _actual_counts(self):
+        """
+        Get the expressions counting each engagement from its source rows.
+
+        Returns:
+            Dict: Counter field names mapped to their counting subquery.
+        """
+        from api.models.bookmarks import Bookmarks
+        from api.models.like import Like
+        from api.models.ticket import Ticket
+
+        return {
+            'like_count': self._count_per_event(Like.objects.filter(status='like')),
+            'bookmark_count': self._count_per_event(Bookmarks.objects.all()),
+            'attendee_count': self._count_per_event(Ticket.objects.all()),
+        }
+
+    def with_counter_drift(self):
+        """
+        Filter events whose stored counters differ from the counted source rows.
+
+        Returns:
+            EventQuerySet: Drifted events annotated with `actual_like_count`,
+            `actual_bookmark_count` and `actual_attendee_count`.
+        """
+        actual = {f'actual_{field}': expression for field, expression in self._actual_counts().items()}
+        return self.annotate(**actual).exclude(
+            like_count=F('actual_like_count'),
+            bookmark_count=F('actual_bookmark_count'),
+            attendee_count=F('actual_attendee_count'),
+        )
+
+    def reconcile_counters(self) -> int:
+        """
+        Recount the engagement counters of the events from their source rows.
+
+        Returns:
+            int: The number of events updated.
+        """
+        event_ids = list(self.values_list('id', flat=True))
+        updated = self.update(**self._actual_counts())
+        invalidate_events(event_ids)
+        return updated
 
 
 class Event(models.Model):
@@ -66,6 +166,14 @@ class Event(models.Model):
     address = models.CharField(max_length=500, null = True, blank = True)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null = True, blank= True, default= 0.00)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null = True, blank= True, default= 0.00)
+    geohash = models.CharField(
+        max_length=12,
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        help_text="Geohash of the coordinates, kept by save() for finding nearby events"
+    )
 
     # Image fields
     event_image = models.ImageField(
@@ -75,6 +183,11 @@ class Event(models.Model):
         blank=True,
         validators=[FileExtensionValidator(['jpg', 'jpeg', 'png', 'gif'])]
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Object keys of the resized copies of the event image, by width and format"
+    )
     
     # Pricing
     is_free = models.BooleanField(default=True)
@@ -135,27 +248,75 @@ class Event(models.Model):
     
     terms_and_conditions = models.TextField(null=True, blank=True)
 
+    # Engagement counters, kept in step by Ticket, Like and Bookmarks
+    attendee_count = models.PositiveIntegerField(default=0)
+    like_count = models.PositiveIntegerField(default=0)
+    bookmark_count = models.PositiveIntegerField(default=0)
+
+    objects = EventQuerySet.as_manager()
+
+    class Meta:
+        # The public list is ordered by creation date, newest first, and filtered by these fields
+        indexes = [
+            models.Index(fields=['-event_create_date', '-id'], name='event_created_idx'),
+            models.Index(fields=['category', '-event_create_date', '-id'], name='event_category_created_idx'),
+            models.Index(fields=['is_free', 'is_online', '-event_create_date', '-id'], name='event_price_online_idx'),
+            models.Index(fields=['status_registeration', '-event_create_date', '-id'], name='event_reg_status_idx'),
+            models.Index(fields=['start_date_event'], name='event_start_date_idx'),
+        ]
         
     @property
     def current_number_attendee(self):
         """
         Get the total Event's ticket number.
         """
-        return self.ticket_set.count()
-    
+        return self.attendee_count
+
     @property
-    def like_count(self):
+    def image_variant_urls(self):
         """
-        Get the total Event's likes.
+        Get the URLs of the resized copies of the event image, by width and format.
         """
-        return self.likes.filter(status='like').count()
-    
-    @property
-    def bookmark_count(self):
+        return variant_urls(self.image_variants)
+
+    @classmethod
+    def adjust_counter(cls, event_id: int, field: str, delta: int):
         """
-        Get the total Event's bookmarks.
+        Atomically add `delta` to one of an event's engagement counters.
+
+        The update is done with an F-expression in the database, so concurrent
+        writers never overwrite each other's changes. Counters never go below zero.
+
+        Args:
+            event_id (int): The ID of the event to update.
+            field (str): The counter field name.
+            delta (int): The amount to add, negative to decrement.
+        """
+        events = cls.objects.filter(pk=event_id)
+        if delta < 0:
+            events = events.filter(**{f'{field}__gte': -delta})
+        events.update(**{field: F(field) + delta})
+        invalidate_events([event_id])
+
+    @classmethod
+    def reserve_seat(cls, event_id: int) -> bool:
+        """
+        Atomically take one seat of an event if it still has one.
+
+        The capacity check and the increment are a single conditional UPDATE, so
+        concurrent registrations can never push `attendee_count` past `max_attendee`.
+
+        Args:
+            event_id (int): The ID of the event to reserve a seat in.
+
+        Returns:
+            bool: True if a seat was reserved, False if the event is full.
         """
-        return self.bookmarks_set.count() 
+        has_seat = Q(max_attendee__isnull=True) | Q(max_attendee=0) | Q(attendee_count__lt=F('max_attendee'))
+        reserved = cls.objects.filter(has_seat, pk=event_id).update(attendee_count=F('attendee_count') + 1) == 1
+        if reserved:
+            invalidate_events([event_id])
+        return reserved
     
 
     def available_spot(self) -> int:
@@ -169,6 +330,48 @@ class Event(models.Model):
             return self.current_number_attendee
         return self.max_attendee - self.current_number_attendee  
     
+    def availability(self) -> dict:
+        """
+        Get the seat availability of the event.
+
+        Return:
+            dict: The attendee count and limit, the spots left (None if there is no limit),
+            the current registration status and the registration dates.
+        """
+        return {
+            'event_id': self.id,
+            'max_attendee': self.max_attendee,
+            'attendee_count': self.attendee_count,
+            'available_spot': max(self.available_spot(), 0) if self.max_attendee else None,
+            'status_registeration': self.compute_registeration_status(),
+            'start_date_register': self.start_date_register,
+            'end_date_register': self.end_date_register,
+        }
+
+    @classmethod
+    def get_availability(cls, event_id: int) -> Optional[dict]:
+        """
+        Get the seat availability of an event, from the cache when possible.
+
+        The entry is dropped with the event's other cached responses whenever a seat is
+        taken or released, so watchers of a busy event only reach the database once per change.
+
+        Args:
+            event_id (int): The ID of the event.
+
+        Returns:
+            Optional[dict]: The availability, or None if the event does not exist.
+        """
+        availability, key = get_cached_availability(event_id)
+        if availability is None:
+            fields = ('id', 'max_attendee', 'attendee_count', 'start_date_register', 'end_date_register')
+            event = cls.objects.only(*fields).filter(id=event_id).first()
+            if event is None:
+                return None
+            availability = event.availability()
+            cache_availability(key, availability)
+        return availability
+
     def is_max_attendee(self) -> bool:
         """
         Check if event is slots are full
@@ -178,7 +381,7 @@ class Event(models.Model):
         """
         if self.max_attendee == 0:
             return False
-        if self.current_number_attendee == self.max_attendee:
+        if self.max_attendee and self.current_number_attendee >= self.max_attendee:
             return True
         return False  
     
@@ -216,27 +419,34 @@ class Event(models.Model):
         else:
             self.status = 'COMPLETED'
             
-    def set_registeration_status(self):
+    def compute_registeration_status(self) -> str:
         """
-        Set the status of the event registration based on the current date and time.
+        Compute the status of the event registration based on the current date and time.
 
-        The status can be 'CLOSED', 'FULL', or 'OPEN' depending on whether the current time is
-        after the event registration end date, whether the maximum number of attendee has been
-        reached, or neither of the above has occurred.
+        The status is 'CLOSED' once the registration end date has passed, 'FULL' when the
+        maximum number of attendees has been reached, and 'OPEN' otherwise.
 
-        The function will save the event object after setting the status.
+        Return:
+            str: The registration status.
         """
         if not self.end_date_register:
             raise ValueError("End date of registration cannot be null")
         now = timezone.now()
-        if self.max_attendee:
-            if self.current_number_attendee >= self.max_attendee:
-                self.status_registeration = "FULL"
-        elif now > self.end_date_register:
-            self.status_registeration = "CLOSED"
-        else:
-            self.status_registeration = "OPEN"
-        self.save()
+        if now > self.end_date_register:
+            return "CLOSED"
+        if self.max_attendee and self.current_number_attendee >= self.max_attendee:
+            return "FULL"
+        return "OPEN"
+
+    def set_registeration_status(self):
+        """
+        Set the status of the event registration based on the current date and time.
+
+        The status is only updated on the instance and is not saved, so it is safe to call
+        on read paths. The stored statuses are refreshed in bulk by the
+        `refresh_event_statuses` task.
+        """
+        self.status_registeration = self.compute_registeration_status()
  
     def is_email_allowed(self, email: str) -> bool:
         """
@@ -255,13 +465,8 @@ class Event(models.Model):
             domain = email.split('@')[1].lower()
         except IndexError:
             return False
-        allowed_domains = [
-            d.strip().lower()
-            for d in self.allowed_email_domains.split(',')
-            if d.strip()
-        ]
 
-        return domain in allowed_domains
+        return domain in parse_email_domains(self.allowed_email_domains)
 
     def clean(self):
         """
@@ -285,6 +490,49 @@ class Event(models.Model):
         if self.start_date_event >= self.end_date_event:
             raise ValidationError("End date must be after start date.")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored listing fields so that a change of the filtered event lists can be detected on save."""
+        instance = super().from_db(db, field_names, values)
+        instance._stored_listing = {field: instance.__dict__.get(field) for field in LISTING_FIELDS}
+        return instance
+
+    def _listing_changed(self) -> bool:
+        """Check whether saving the event changes which event lists it appears in or its place in them."""
+        if self._state.adding or not hasattr(self, '_stored_listing'):
+            return True
+        return any(
+            field in self.__dict__ and self.__dict__[field] != stored
+            for field, stored in self._stored_listing.items()
+        )
+
+    def save(self, *args, **kwargs):
+        """Override save method to keep the geohash and tags, invalidate the cached responses of the event and re-index it for search."""
+        listing = self._listing_changed()
+        update_fields = kwargs.get('update_fields')
+        self.geohash = event_geohash(self.latitude, self.longitude)
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = update_fields = {*update_fields, 'geohash'}
+        tags_changed = self._state.adding or not hasattr(self, '_stored_listing') or (
+            'tags' in self.__dict__ and self._stored_listing['tags'] != self.tags
+        )
+        super().save(*args, **kwargs)
+        self._stored_listing = {field: self.__dict__.get(field) for field in LISTING_FIELDS}
+        if tags_changed and (update_fields is None or 'tags' in update_fields):
+            from api.models.tag import Tag
+            Tag.objects.sync_event(self)
+        if update_fields is None or set(update_fields) & {*SEARCH_FIELDS, 'organizer'}:
+            get_search_backend().index_events([self.pk])
+        invalidate_events([self.pk], listing=listing)
+
+    def delete(self, *args, **kwargs):
+        """Override delete method to drop the event from the cached responses and the search index."""
+        event_id = self.pk
+        result = super().delete(*args, **kwargs)
+        get_search_backend().remove_events([event_id])
+        invalidate_events([event_id], listing=True)
+        return result
+
     def __str__(self) -> str:
         """
         Return a string representation of the event, displaying its name.
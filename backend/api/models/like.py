@@ -1,7 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from api.models.event import Event
 from api.models.user import AttendeeUser
+from api.cache import invalidate_user_engagement
 
 
 class LikeManager(models.Manager):
@@ -38,5 +39,33 @@ class Like(models.Model):
     class Meta:
         unique_together = ('event', 'user')
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored status so that a status change can be counted on save."""
+        instance = super().from_db(db, field_names, values)
+        instance._stored_status = instance.status
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Override save method to keep the event's like count in step with the status."""
+        was_liked = not self._state.adding and getattr(self, '_stored_status', None) == 'like'
+        is_liked = self.status == 'like'
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if was_liked != is_liked:
+                Event.adjust_counter(self.event_id, 'like_count', 1 if is_liked else -1)
+                invalidate_user_engagement(self.user_id)
+        self._stored_status = self.status
+
+    def delete(self, *args, **kwargs):
+        """Override delete method to uncount the like on the event."""
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            # A concurrent delete may have removed the row already
+            if result[1].get(self._meta.label) and getattr(self, '_stored_status', self.status) == 'like':
+                Event.adjust_counter(self.event_id, 'like_count', -1)
+                invalidate_user_engagement(self.user_id)
+        return result
+
     def __str__(self):
         return f"{self.user.username} liked {self.event.event_name} at {self.liked_at}"
@@ -3,6 +3,9 @@ from django.utils import timezone
 from django.core.files.storage import default_storage
 from django.core.validators import FileExtensionValidator, EmailValidator
 from api.models.user import AttendeeUser
+from api.images import variant_urls
+from api.cache import invalidate_events
+from api.search import get_search_backend
 
 
 
@@ -46,6 +49,11 @@ class Organizer(models.Model):
         blank=True,
         validators=[FileExtensionValidator(['jpg', 'jpeg', 'png'])]
     )
+    logo_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Object keys of the resized copies of the logo, by width and format"
+    )
 
     # Detailed Information
     description = models.TextField(blank=True)
@@ -75,9 +83,40 @@ class Organizer(models.Model):
         if self.logo:
             return self.logo.url
         return None
+
+    @property
+    def logo_variant_urls(self):
+        """Return the URLs of the resized copies of the logo, by width and format."""
+        return variant_urls(self.logo_variants)
     
 
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored name so that a rename can be re-indexed for search on save."""
+        instance = super().from_db(db, field_names, values)
+        instance._stored_name = instance.__dict__.get('organizer_name')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Override save method to refresh the cached responses and search index of the organizer's events."""
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            event_ids = list(self.events.values_list('id', flat=True))
+            if getattr(self, '_stored_name', None) != self.organizer_name:
+                get_search_backend().index_events(event_ids)
+            invalidate_events(event_ids)
+        self._stored_name = self.organizer_name
+
+    def delete(self, *args, **kwargs):
+        """Override delete method to drop the organizer's events from the cached responses and search index."""
+        event_ids = list(self.events.values_list('id', flat=True))
+        result = super().delete(*args, **kwargs)
+        get_search_backend().remove_events(event_ids)
+        invalidate_events(event_ids, listing=True)
+        return result
+
     def is_organizer(self, this_user):
         """
         Check if a given user is an organizer.
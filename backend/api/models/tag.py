@@ -0,0 +1,87 @@
+from typing import List
+from django.db import models
+from django.db.models import Count, Q
+from django.utils import timezone
+from api.models.event import Event
+
+
+TAG_MAX_LENGTH = 50
+
+
+def normalize_tag(name: str) -> str:
+    """
+    Normalize a tag name, so "Tech  Talks" and "tech talks" are the same tag.
+
+    Args:
+        name (str): The tag as entered.
+
+    Returns:
+        str: The tag in lowercase with single spaces, empty if it has no text.
+    """
+    return ' '.join(name.split()).lower()[:TAG_MAX_LENGTH]
+
+
+def parse_tags(text: str) -> List[str]:
+    """
+    Split the comma-separated tags of an event into normalized tag names.
+
+    Args:
+        text (str): The comma-separated tags.
+
+    Returns:
+        List[str]: The distinct tag names, in the order they were entered.
+    """
+    names = (normalize_tag(name) for name in (text or '').split(','))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+class TagManager(models.Manager):
+    def sync_event(self, event: Event) -> None:
+        """
+        Link an event to the tags in its `tags` text, creating the tags that are new.
+
+        Args:
+            event (Event): The saved event.
+        """
+        names = parse_tags(event.tags)
+        if names:
+            self.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+        event.tag_set.set(self.filter(name__in=names))
+
+    def popular(self, limit: int):
+        """
+        Get the tags of the most published events.
+
+        Args:
+            limit (int): The maximum number of tags.
+
+        Returns:
+            QuerySet: The tags with their `event_count`, most used first.
+        """
+        published = Q(events__event_create_date__lte=timezone.now())
+        return (
+            self.annotate(event_count=Count('events', filter=published))
+            .filter(event_count__gt=0)
+            .order_by('-event_count', 'name')[:limit]
+        )
+
+
+class Tag(models.Model):
+    """
+    A normalized event tag.
+
+    The comma-separated `Event.tags` stays the text organizers edit; saving an event links
+    it to one Tag per entry, so events with a tag are found through the indexed join table
+    instead of matching the text of every event.
+
+    Fields:
+        name (CharField): The normalized tag name.
+        events (ManyToManyField): The events with the tag.
+    """
+    name = models.CharField(max_length=TAG_MAX_LENGTH, unique=True)
+    events = models.ManyToManyField(Event, related_name='tag_set', blank=True)
+
+    objects = TagManager()
+
+    def __str__(self):
+        return f"Tag: {self.name}"
@@ -1,5 +1,5 @@
 from typing import Optional, Dict
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 import random
 import string
@@ -8,6 +8,7 @@ from api.models.organizer import Organizer
 from api.models.event import Event
 from api.models.user import AttendeeUser
 from api.utils import TicketNotificationManager
+from api.cache import invalidate_user_engagement
 
 
 class Ticket(models.Model):
@@ -59,7 +60,24 @@ class Ticket(models.Model):
         """Override save method to handle ticket number generation and validation."""
         self.ticket_number = self.generate_ticket_number()
         
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            # Take the seat first; a failed insert rolls the reservation back with it
+            is_new = self._state.adding
+            if is_new and not Event.reserve_seat(self.event_id):
+                raise ValidationError("This event has reached the maximum number of attendees.")
+            super().save(*args, **kwargs)
+            if is_new:
+                invalidate_user_engagement(self.attendee_id)
+
+    def delete(self, *args, **kwargs):
+        """Override delete method to release the seat held by the ticket."""
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            # A concurrent delete may have removed the row already
+            if result[1].get(self._meta.label):
+                Event.adjust_counter(self.event_id, 'attendee_count', -1)
+                invalidate_user_engagement(self.attendee_id)
+        return result
             
     def send_event_reminder(self) -> bool:
         """Send event reminder email to ticket holder"""
@@ -103,7 +121,7 @@ class Ticket(models.Model):
         return {
             "id": self.id,
             "ticket_number": self.ticket_number,
-            "event_id": self.event.id,
+            "event_id": self.event_id,
             "fullname": self.attendee.full_name,
             "register_date": self.register_date,
             "status": self.status,
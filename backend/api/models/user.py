@@ -98,6 +98,16 @@ class AttendeeUser(AbstractUser):
         if not self.username:
             self.username = self.email  # Set username to email if not provided
         super().save(*args, **kwargs)
+        from api.auth import verified_tokens
+        verified_tokens.forget_user(self.pk)
+
+    def delete(self, *args, **kwargs):
+        """Override delete method to stop accepting the user's cached tokens."""
+        from api.auth import verified_tokens
+        user_id = self.pk
+        result = super().delete(*args, **kwargs)
+        verified_tokens.forget_user(user_id)
+        return result
                 
     def send_verification_email(self):
         """Generate and send verification email with a secure token."""
@@ -0,0 +1,222 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional
+
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+
+# Event fields that are searched; changing any of them re-indexes the event
+SEARCH_FIELDS = ('event_name', 'tags', 'description', 'detailed_description', 'organizer_id')
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class EventSearchBackend(ABC):
+    """
+    Full-text search over the name, tags, description and detailed description of events
+    and the name of their organizer.
+
+    The index is kept in step by the application: `Event.save`, `Event.delete` and
+    `Organizer.save` call `index_events` and `remove_events`, so no database triggers
+    have to survive the table rebuilds SQLite does for schema changes.
+    """
+
+    @abstractmethod
+    def search(self, query: str, limit: int, offset: int = 0) -> List[int]:
+        """
+        Find the events matching a query, best match first.
+
+        Only events that are already published (created up to now) are returned.
+
+        Args:
+            query (str): The search text entered by the user.
+            limit (int): The maximum number of results.
+            offset (int): The number of results to skip.
+
+        Returns:
+            List[int]: The IDs of the matching events, ordered by rank.
+        """
+
+    def index_events(self, event_ids: Iterable[int]) -> None:
+        """
+        Add or refresh events in the search index.
+
+        Args:
+            event_ids (Iterable[int]): The IDs of the events.
+        """
+
+    def remove_events(self, event_ids: Iterable[int]) -> None:
+        """
+        Remove deleted events from the search index.
+
+        Args:
+            event_ids (Iterable[int]): The IDs of the events.
+        """
+
+    def rebuild(self) -> None:
+        """Rebuild the search index of every event, e.g. after a bulk import."""
+
+    @staticmethod
+    def words(query: str) -> List[str]:
+        """
+        Split a query into plain words, dropping any search operators.
+
+        Args:
+            query (str): The search text entered by the user.
+
+        Returns:
+            List[str]: The words of the query, at most 16.
+        """
+        return WORD_RE.findall(query)[:16]
+
+
+class PostgresEventSearch(EventSearchBackend):
+    """
+    Search with PostgreSQL full-text search over the `search_vector` tsvector column,
+    which has a GIN index. The event name weighs most, then the tags and organizer name,
+    the description and last the detailed description.
+    """
+    VECTOR_SQL = """
+        setweight(to_tsvector('english', coalesce(e.event_name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(e.tags, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(o.organizer_name, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(e.description, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(e.detailed_description, '')), 'D')
+    """
+
+    def search(self, query: str, limit: int, offset: int = 0) -> List[int]:
+        words = self.words(query)
+        if not words:
+            return []
+        # Every word must match; the last one may be a prefix of a longer word
+        tsquery = ' & '.join(words[:-1] + [f'{words[-1]}:*'])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT e.id FROM api_event e, to_tsquery('english', %s) query
+                WHERE e.search_vector @@ query AND e.event_create_date <= %s
+                ORDER BY ts_rank_cd(e.search_vector, query) DESC, e.id DESC
+                LIMIT %s OFFSET %s
+                """,
+                [tsquery, timezone.now(), limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def index_events(self, event_ids: Iterable[int]) -> None:
+        event_ids = list(event_ids)
+        if not event_ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE api_event e SET search_vector = {self.VECTOR_SQL}
+                FROM api_organizer o WHERE o.id = e.organizer_id AND e.id = ANY(%s)
+                """,
+                [event_ids],
+            )
+
+    def rebuild(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE api_event e SET search_vector = {self.VECTOR_SQL} "
+                "FROM api_organizer o WHERE o.id = e.organizer_id"
+            )
+
+
+class SQLiteEventSearch(EventSearchBackend):
+    """
+    Search with an SQLite FTS5 table, `api_event_fts`, whose rowid is the event ID.
+    Results are ranked by BM25 with the same field weights as the PostgreSQL backend.
+    """
+    # bm25() weights of event_name, tags, organizer_name, description, detailed_description
+    WEIGHTS = (10.0, 4.0, 4.0, 2.0, 1.0)
+
+    SELECT_SQL = """
+        SELECT e.id, e.event_name, e.tags, o.organizer_name, e.description, e.detailed_description
+        FROM api_event e LEFT JOIN api_organizer o ON o.id = e.organizer_id
+    """
+
+    def search(self, query: str, limit: int, offset: int = 0) -> List[int]:
+        words = self.words(query)
+        if not words:
+            return []
+        # Quote every word so FTS5 operators in the input are matched as text
+        match = ' '.join(f'"{word}"' for word in words[:-1]) + f' "{words[-1]}"*'
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT e.id FROM api_event_fts JOIN api_event e ON e.id = api_event_fts.rowid
+                WHERE api_event_fts MATCH %s AND e.event_create_date <= %s
+                ORDER BY bm25(api_event_fts, {', '.join(map(str, self.WEIGHTS))}), e.id DESC
+                LIMIT %s OFFSET %s
+                """,
+                [match.strip(), timezone.now(), limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def index_events(self, event_ids: Iterable[int]) -> None:
+        event_ids = list(event_ids)
+        if not event_ids:
+            return
+        placeholders = ', '.join(['%s'] * len(event_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM api_event_fts WHERE rowid IN ({placeholders})", event_ids)
+            cursor.execute(
+                "INSERT INTO api_event_fts (rowid, event_name, tags, organizer_name, description, detailed_description) "
+                f"{self.SELECT_SQL} WHERE e.id IN ({placeholders})",
+                event_ids,
+            )
+
+    def remove_events(self, event_ids: Iterable[int]) -> None:
+        event_ids = list(event_ids)
+        if not event_ids:
+            return
+        placeholders = ', '.join(['%s'] * len(event_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM api_event_fts WHERE rowid IN ({placeholders})", event_ids)
+
+    def rebuild(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM api_event_fts")
+            cursor.execute(
+                "INSERT INTO api_event_fts (rowid, event_name, tags, organizer_name, description, detailed_description) "
+                f"{self.SELECT_SQL}"
+            )
+
+
+class SimpleEventSearch(EventSearchBackend):
+    """
+    Fallback for databases without a full-text index: events containing every word in any
+    searched field, newest first.
+    """
+    def search(self, query: str, limit: int, offset: int = 0) -> List[int]:
+        from api.models.event import Event
+        words = self.words(query)
+        if not words:
+            return []
+        events = Event.objects.filter(event_create_date__lte=timezone.now())
+        for word in words:
+            events = events.filter(
+                Q(event_name__icontains=word) | Q(tags__icontains=word) | Q(description__icontains=word)
+                | Q(detailed_description__icontains=word) | Q(organizer__organizer_name__icontains=word)
+            )
+        return list(events.order_by('-event_create_date', '-id').values_list('id', flat=True)[offset:offset + limit])
+
+
+def get_search_backend(vendor: Optional[str] = None) -> EventSearchBackend:
+    """
+    Get the event search backend for a database.
+
+    Args:
+        vendor (Optional[str]): The database vendor, that of the default database if not given.
+
+    Returns:
+        EventSearchBackend: The search backend.
+    """
+    backends = {
+        'postgresql': PostgresEventSearch,
+        'sqlite': SQLiteEventSearch,
+    }
+    return backends.get(vendor or connection.vendor, SimpleEventSearch)()
@@ -0,0 +1,205 @@
+import logging
+import os
+import threading
+import uuid
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """
+    Get the S3 client shared by the current process, creating it on first use.
+
+    boto3 clients are thread-safe, so one client (and its connection pool) is reused by
+    every request instead of resolving credentials and opening connections each time.
+
+    Returns:
+        botocore.client.S3: The shared S3 client.
+    """
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = boto3.client(
+                    's3',
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                    region_name=settings.AWS_S3_REGION_NAME,
+                    config=Config(
+                        max_pool_connections=settings.AWS_S3_MAX_POOL_CONNECTIONS,
+                        retries={'max_attempts': 3, 'mode': 'standard'},
+                    ),
+                )
+    return _s3_client
+
+
+def reset_s3_client():
+    """Drop the shared S3 client, so the next call to `get_s3_client` creates a new one."""
+    global _s3_client
+    with _s3_client_lock:
+        _s3_client = None
+
+
+class ImageUploadService:
+    """
+    Uploads images to the storage bucket under a key prefix and deletes replaced ones.
+    """
+    def __init__(self, prefix: str):
+        """
+        Args:
+            prefix (str): The folder of the bucket the images are stored in, e.g. `logos`.
+        """
+        self.prefix = prefix
+
+    def build_key(self, filename: str) -> str:
+        """
+        Build a unique object key for an uploaded file, keeping its extension.
+
+        Args:
+            filename (str): The name of the uploaded file.
+
+        Returns:
+            str: The object key.
+        """
+        return f'{self.prefix}/{uuid.uuid4()}{os.path.splitext(filename)[1]}'
+
+    @staticmethod
+    def file_url(key: str) -> str:
+        """
+        Get the public URL of an object.
+
+        Args:
+            key (str): The object key.
+
+        Returns:
+            str: The URL of the object.
+        """
+        return f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/{key}"
+
+    def upload(self, file, key: str = None) -> str:
+        """
+        Upload a file to the bucket.
+
+        Args:
+            file (UploadedFile): The file to upload.
+            key (str, optional): The object key, built from the file name if not given.
+
+        Returns:
+            str: The key of the uploaded object.
+
+        Raises:
+            ClientError: If the upload fails.
+        """
+        key = key or self.build_key(file.name)
+        get_s3_client().upload_fileobj(
+            file.file,
+            settings.AWS_STORAGE_BUCKET_NAME,
+            key,
+            ExtraArgs={'ContentType': file.content_type}
+        )
+        logger.info(f"Successfully uploaded file to S3: {self.file_url(key)}")
+        return key
+
+    def upload_bytes(self, key: str, body: bytes, content_type: str) -> str:
+        """
+        Upload generated content, such as a resized image, to the bucket.
+
+        Args:
+            key (str): The object key.
+            body (bytes): The content to upload.
+            content_type (str): The content type of the object.
+
+        Returns:
+            str: The key of the uploaded object.
+
+        Raises:
+            ClientError: If the upload fails.
+        """
+        get_s3_client().put_object(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+            Key=key,
+            Body=body,
+            ContentType=content_type,
+            CacheControl='public, max-age=31536000, immutable',
+        )
+        return key
+
+    def download(self, key: str) -> bytes:
+        """
+        Download an object from the bucket.
+
+        Args:
+            key (str): The object key.
+
+        Returns:
+            bytes: The content of the object.
+
+        Raises:
+            ClientError: If the object does not exist or cannot be read.
+        """
+        response = get_s3_client().get_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+        return response['Body'].read()
+
+    def presign_post(self, key: str, content_type: str, max_size: int, expires_in: int) -> dict:
+        """
+        Create a presigned POST that lets a client upload one object straight to the bucket.
+
+        The policy pins the object key and content type and limits the size, so the client
+        cannot upload anything else with it.
+
+        Args:
+            key (str): The object key the client must upload to.
+            content_type (str): The content type the client must send.
+            max_size (int): The maximum object size in bytes.
+            expires_in (int): How long the presigned POST is valid, in seconds.
+
+        Returns:
+            dict: The `url` to post to and the form `fields` to send with the file.
+        """
+        return get_s3_client().generate_presigned_post(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+            Key=key,
+            Fields={'Content-Type': content_type},
+            Conditions=[
+                {'Content-Type': content_type},
+                ['content-length-range', 1, max_size],
+            ],
+            ExpiresIn=expires_in,
+        )
+
+    def head(self, key: str) -> dict:
+        """
+        Get the metadata of an object.
+
+        Args:
+            key (str): The object key.
+
+        Returns:
+            dict: The object metadata, including `ContentLength` and `ContentType`.
+
+        Raises:
+            ClientError: If the object does not exist.
+        """
+        return get_s3_client().head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+
+    def delete(self, key: str) -> None:
+        """
+        Delete an object from the bucket, logging instead of raising if it fails.
+
+        Args:
+            key (str): The object key.
+        """
+        try:
+            get_s3_client().delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+            logger.info(f"Deleted old image from S3: {key}")
+        except ClientError as e:
+            logger.error(f"Failed to delete old image from S3: {str(e)}")
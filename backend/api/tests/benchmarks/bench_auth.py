@@ -0,0 +1,45 @@
+"""
+Per-request overhead benchmark for JWT authentication.
+
+Not collected by the default test run. Run it explicitly with:
+
+    python manage.py test api.tests.benchmarks.bench_auth
+
+Compares authenticating the same bearer token with the stock `JWTAuth`, which
+verifies the signature and loads the user on every request, against
+`CachedJWTAuth`. Set BENCH_AUTH_REQUESTS to change the number of requests.
+"""
+import os
+import time
+
+from django.test import RequestFactory, TestCase
+from ninja_jwt.authentication import JWTAuth
+from ninja_jwt.tokens import RefreshToken
+
+from api.auth import CachedJWTAuth, verified_tokens
+from api.models import AttendeeUser
+
+REQUESTS = int(os.getenv('BENCH_AUTH_REQUESTS', 2000))
+
+
+class AuthBenchmark(TestCase):
+
+    def setUp(self):
+        verified_tokens.clear()
+        self.user = AttendeeUser.objects.create_user(
+            username='bench', password='password123', email='bench@example.com'
+        )
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.request = RequestFactory().get('/api/events/events', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+    def authenticate_all(self, auth):
+        started = time.perf_counter()
+        for _ in range(REQUESTS):
+            user = auth.authenticate(self.request, self.token)
+        self.assertEqual(user.pk, self.user.pk)
+        return (time.perf_counter() - started) / REQUESTS * 1e6
+
+    def test_auth_overhead(self):
+        stock = self.authenticate_all(JWTAuth())
+        cached = self.authenticate_all(CachedJWTAuth())
+        print(f"\n{REQUESTS} requests: JWTAuth {stock:.1f} us/request, CachedJWTAuth {cached:.1f} us/request")
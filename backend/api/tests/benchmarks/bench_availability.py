@@ -0,0 +1,95 @@
+"""
+Load benchmark for watching the seat availability of an event during a ticket drop.
+
+Not collected by the default test run. Run it explicitly with:
+
+    python manage.py test api.tests.benchmarks.bench_availability
+
+Times polling the event detail against polling the availability endpoint, counting the
+database queries of each, then opens BENCH_AVAILABILITY_WATCHERS streams (2,000 by
+default) and counts the queries made while REGISTRATIONS tickets are sold to them.
+"""
+import os
+import statistics
+import time
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.live import AVAILABILITY_CHANNEL, sse_messages
+from api.models import AttendeeUser, Event, Organizer, Ticket
+from api.views.strategy.ticket_strategy import publish_availability
+
+WATCHERS = int(os.getenv('BENCH_AVAILABILITY_WATCHERS', 2000))
+POLLS = 500
+REGISTRATIONS = 20
+
+
+@override_settings(LIVE_STREAM_SECONDS=3600, LIVE_KEEPALIVE_SECONDS=3600)
+class AvailabilityBenchmark(TestCase):
+
+    def setUp(self):
+        user = AttendeeUser.objects.create(username='bench', email='bench@example.com', birth_date='1990-01-01')
+        organizer = Organizer.objects.create(user=user, organizer_name='Bench', email='bench@example.com')
+        now = timezone.now()
+        self.event = Event.objects.create(
+            event_name='Bench', organizer=organizer, start_date_event=now + timezone.timedelta(days=2),
+            end_date_event=now + timezone.timedelta(days=3), start_date_register=now - timezone.timedelta(days=1),
+            end_date_register=now + timezone.timedelta(days=1), max_attendee=1000,
+            description='Ticket drop ' * 30, detailed_description='Line up early. ' * 200,
+        )
+        self.buyers = AttendeeUser.objects.bulk_create(
+            AttendeeUser(username=f'buyer{n}', email=f'buyer{n}@example.com', birth_date='1990-01-01')
+            for n in range(REGISTRATIONS)
+        )
+
+    def poll(self, url):
+        """Time repeated requests for a URL, returning the median duration, queries per request and size."""
+        self.client.get(url)
+        durations = []
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(POLLS):
+                started = time.perf_counter()
+                response = self.client.get(url)
+                durations.append(time.perf_counter() - started)
+        return statistics.median(durations), len(queries) / POLLS, len(response.content)
+
+    def sell(self, buyer):
+        """Sell a ticket the way the register strategy does, publishing the availability on commit."""
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(event=self.event, attendee=buyer)
+            publish_availability(self.event.id)
+
+    async def watch(self):
+        """Open the streams and time how long each sale takes to reach every watcher."""
+        channel = AVAILABILITY_CHANNEL.format(id=self.event.id)
+        streams = [sse_messages(channel) for _ in range(WATCHERS)]
+        for stream in streams:
+            await anext(stream)
+        durations = []
+        for buyer in self.buyers:
+            started = time.perf_counter()
+            await sync_to_async(self.sell)(buyer)
+            for stream in streams:
+                await anext(stream)
+            durations.append(time.perf_counter() - started)
+        for stream in streams:
+            await stream.aclose()
+        return durations
+
+    def test_watching_availability(self):
+        for name, url in (('event detail', f'/api/events/{self.event.id}'),
+                          ('availability', f'/api/events/{self.event.id}/availability')):
+            duration, queries, size = self.poll(url)
+            print(f"\n{name} polled: {duration * 1000:.2f} ms, {queries:.1f} queries and {size} bytes per request",
+                  end='')
+        with CaptureQueriesContext(connection) as queries:
+            durations = async_to_sync(self.watch)()
+        sale_queries = len(queries) / REGISTRATIONS
+        print(f"\n{WATCHERS} watchers streaming: each sale reaches all in p50 {statistics.median(durations) * 1000:.1f} ms "
+              f"with {sale_queries:.1f} queries, none per watcher")
+
+        self.assertLess(sale_queries, 10)
@@ -0,0 +1,63 @@
+"""
+Render throughput benchmark for ticket email templates.
+
+Not collected by the default test run. Run it explicitly with:
+
+    python manage.py test api.tests.benchmarks.bench_email_templates
+
+Set BENCH_RECIPIENTS to change the number of attendees of the event.
+"""
+import os
+import time
+from html import escape
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from api.email_templates import EMAIL_TEMPLATES, render_ticket_email
+from api.models import AttendeeUser, Event, Ticket
+
+RECIPIENTS = int(os.getenv('BENCH_RECIPIENTS', 10000))
+
+
+class EmailTemplateBenchmark(SimpleTestCase):
+
+    def setUp(self):
+        event = Event(
+            id=1,
+            event_name='Benchmark conference',
+            start_date_event=timezone.now(),
+            address='1 Benchmark Road',
+            description='A long description of the event. ' * 20,
+            updated_at=timezone.now(),
+        )
+        self.tickets = [
+            Ticket(
+                event=event,
+                attendee=AttendeeUser(first_name=f'Attendee{index}', last_name='Doe'),
+                ticket_number=f'TICKET-{index:08d}',
+            )
+            for index in range(RECIPIENTS)
+        ]
+
+    def render_per_message(self, ticket):
+        """Render everything for every message, like the previous f-string methods did."""
+        return EMAIL_TEMPLATES['registration'].bind(ticket.event).substitute(
+            full_name=escape(ticket.attendee.full_name),
+            ticket_number=ticket.ticket_number,
+        )
+
+    def test_render_throughput(self):
+        started = time.perf_counter()
+        per_message = [self.render_per_message(ticket) for ticket in self.tickets]
+        per_message_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        bound = [render_ticket_email('registration', ticket) for ticket in self.tickets]
+        bound_elapsed = time.perf_counter() - started
+
+        print(
+            f"\n{RECIPIENTS} registration emails: full render {RECIPIENTS / per_message_elapsed:.0f}/s, "
+            f"event bound once {RECIPIENTS / bound_elapsed:.0f}/s"
+        )
+        self.assertEqual(per_message, bound)
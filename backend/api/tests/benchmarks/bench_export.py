@@ -0,0 +1,117 @@
+"""
+Memory benchmark for the streaming attendee export.
+
+Not collected by the default test run. Run it explicitly with:
+
+    python manage.py test api.tests.benchmarks.bench_export
+
+Exports the attendees of a small and a large event, a quarter and all of
+BENCH_EXPORT_ATTENDEES (20,000 by default, at least 8 export chunks), and records the
+peak Python heap and the peak growth of the resident set size while the export streams.
+The streaming export must use about the same memory for both events; the in-memory
+attendee list it replaces is measured for comparison. The export is read the way the ASGI
+handler sends it, as an asynchronous iterator.
+"""
+import os
+import time
+import tracemalloc
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import make_password
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from api.exports import EXPORT_CHUNK_SIZE
+from api.models import AttendeeUser, Event, Organizer, Ticket
+from api.views.strategy.event_strategy import EventEngagement
+
+# The small event must fill at least two chunks, or its export holds fewer rows at a time
+ATTENDEES = max(int(os.getenv('BENCH_EXPORT_ATTENDEES', 20000)), 8 * EXPORT_CHUNK_SIZE)
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+
+def current_rss() -> int:
+    """Get the current resident set size of the process in bytes."""
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * PAGE_SIZE
+
+
+class AttendeeExportBenchmark(TestCase):
+
+    def setUp(self):
+        password = make_password('bench')
+        self.organizer_user = AttendeeUser.objects.create(username='bench', email='bench@example.com', password=password)
+        organizer = Organizer.objects.create(user=self.organizer_user, organizer_name='Bench', email='bench@example.com')
+        now = timezone.now()
+        self.events = {}
+        for name, size in (('small', ATTENDEES // 4), ('large', ATTENDEES)):
+            self.events[name] = (Event.objects.create(
+                event_name=name, organizer=organizer, start_date_event=now, end_date_event=now,
+                start_date_register=now, end_date_register=now,
+            ), size)
+        users = AttendeeUser.objects.bulk_create(
+            (AttendeeUser(username=f'attendee{n}', email=f'attendee{n}@example.com', first_name='Attendee',
+                          last_name=str(n), password=password, phone_number='0800000000')
+             for n in range(ATTENDEES)),
+            batch_size=2000,
+        )
+        for name, (event, size) in self.events.items():
+            Ticket.objects.bulk_create(
+                (Ticket(event=event, attendee=user, ticket_number=f'{name}-{n}') for n, user in enumerate(users[:size])),
+                batch_size=2000,
+            )
+
+    def strategy(self, name, event):
+        request = RequestFactory().get('/')
+        request.user = self.organizer_user
+        return EventEngagement.get_engagement_strategy(name, request, event.id)
+
+    def measure_stream(self, event):
+        """Stream an export, returning its peak heap, peak RSS growth, size and duration."""
+        baseline = current_rss()
+        peak_rss = baseline
+        tracemalloc.start()
+        started = time.perf_counter()
+        response = self.strategy('event_attendee_export', event).execute('csv')
+
+        async def read():
+            nonlocal peak_rss
+            size = 0
+            async for chunk in response.streaming_content:
+                size += len(chunk)
+                peak_rss = max(peak_rss, current_rss())
+            return size
+
+        size = async_to_sync(read)()
+        elapsed = time.perf_counter() - started
+        _, peak_heap = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak_heap, max(peak_rss, current_rss()) - baseline, size, elapsed
+
+    def measure_list(self, event):
+        """Build the in-memory attendee list response, returning its peak heap and RSS growth."""
+        baseline = current_rss()
+        tracemalloc.start()
+        self.strategy('event_attendee', event).execute()
+        _, peak_heap = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak_heap, current_rss() - baseline
+
+    def test_export_memory(self):
+        mb = 1024 * 1024
+        streamed = {}
+        for name, (event, size) in self.events.items():
+            self.measure_stream(event)  # Warm up imports and query compilation
+            peak_heap, rss_growth, file_size, elapsed = self.measure_stream(event)
+            streamed[name] = (peak_heap, rss_growth)
+            print(f"\n{size} attendees streamed: {file_size / mb:.1f} MB CSV in {elapsed:.2f}s, "
+                  f"peak heap {peak_heap / mb:.1f} MB, peak RSS growth {rss_growth / mb:.1f} MB")
+        event, size = self.events['large']
+        peak_heap, rss_growth = self.measure_list(event)
+        print(f"{size} attendees as an in-memory list: peak heap {peak_heap / mb:.1f} MB, "
+              f"RSS growth {rss_growth / mb:.1f} MB")
+
+        # Four times the attendees must not take noticeably more memory
+        self.assertLess(streamed['large'][0], streamed['small'][0] * 1.5)
+        self.assertLess(streamed['large'][0], peak_heap / 4)
+        self.assertLess(streamed['large'][1], 16 * mb)
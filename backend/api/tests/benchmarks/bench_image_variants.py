@@ -0,0 +1,63 @@
+"""
+Throughput benchmark for generating responsive image variants.
+
+Not collected by the default test run. Run it explicitly with:
+
+    python manage.py test api.tests.benchmarks.bench_image_variants
+
+Renders a batch of sample photos one after another, then on a thread pool the way
+concurrent worker processes would. Pillow releases the GIL while resizing and
+encoding, so the pooled run scales with the number of CPU cores.
+
+Set BENCH_IMAGES to change the number of sample images and BENCH_IMAGE_WORKERS
+to change the size of the thread pool.
+"""
+import io
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import SimpleTestCase
+from PIL import Image, ImageDraw
+
+from api.images import render_variants
+
+IMAGES = int(os.getenv('BENCH_IMAGES', 12))
+WORKERS = int(os.getenv('BENCH_IMAGE_WORKERS', 4))
+
+
+class ImageVariantBenchmark(SimpleTestCase):
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.images = []
+        for _ in range(IMAGES):
+            image = Image.new('RGB', (3000, 2000), (255, 255, 255))
+            draw = ImageDraw.Draw(image)
+            for _ in range(200):
+                x, y = rng.randrange(3000), rng.randrange(2000)
+                colour = tuple(rng.randrange(256) for _ in range(3))
+                draw.ellipse((x, y, x + rng.randrange(50, 400), y + rng.randrange(50, 400)), fill=colour)
+            buffer = io.BytesIO()
+            image.save(buffer, 'JPEG', quality=92)
+            self.images.append(buffer.getvalue())
+
+    def test_variant_throughput(self):
+        started = time.perf_counter()
+        serial = [render_variants(data) for data in self.images]
+        serial_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+            pooled = list(executor.map(render_variants, self.images))
+        pooled_elapsed = time.perf_counter() - started
+
+        original = sum(len(data) for data in self.images) / IMAGES
+        smallest = sum(len(variants[320]['webp']) for variants in pooled) / IMAGES
+        print(
+            f"\n{IMAGES} images of 3000x2000: serial {IMAGES / serial_elapsed:.2f}/s, "
+            f"{WORKERS} threads {IMAGES / pooled_elapsed:.2f}/s; "
+            f"original {original / 1024:.0f} KB, 320w WebP {smallest / 1024:.0f} KB"
+        )
+        self.assertEqual([list(variants) for variants in serial], [list(variants) for variants in pooled])
@@ -0,0 +1,96 @@
+"""
+Fan-out benchmark for the live comment stream.
+
+Not collected by the default test run. Run it explicitly with:
+
+    python manage.py test api.tests.benchmarks.bench_live
+
+Opens BENCH_LIVE_VIEWERS streams (5,000 by default) on the comments of one event and
+times how long a new comment takes to reach all of them, against the cost of every
+viewer polling the comment list of an event with BENCH_LIVE_COMMENTS comments (200 by
+default) once every POLL_SECONDS instead.
+
+The tests use the in-process hub; with Redis each worker holds one pub/sub subscription
+for all its streams, so the Redis round trip is added once per worker, not per viewer.
+"""
+import asyncio
+import os
+import statistics
+import time
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.live import COMMENT_CHANNEL, get_live_hub, sse_messages
+from api.models import AttendeeUser, Comment, Event, Organizer
+
+VIEWERS = int(os.getenv('BENCH_LIVE_VIEWERS', 5000))
+COMMENTS = int(os.getenv('BENCH_LIVE_COMMENTS', 200))
+MESSAGES = 20
+POLL_SECONDS = 5
+
+
+@override_settings(LIVE_STREAM_SECONDS=3600, LIVE_KEEPALIVE_SECONDS=3600)
+class LiveCommentBenchmark(TestCase):
+
+    def setUp(self):
+        user = AttendeeUser.objects.create(username='bench', email='bench@example.com', birth_date='1990-01-01')
+        organizer = Organizer.objects.create(user=user, organizer_name='Bench', email='bench@example.com')
+        now = timezone.now()
+        self.event = Event.objects.create(
+            event_name='Bench', organizer=organizer, start_date_event=now, end_date_event=now,
+            start_date_register=now, end_date_register=now,
+        )
+        roots = Comment.objects.bulk_create(
+            Comment(event=self.event, user=user, content=f'comment {n}') for n in range(COMMENTS // 2)
+        )
+        Comment.objects.bulk_create(
+            Comment(event=self.event, user=user, parent=root, content=f'reply {n}') for n, root in enumerate(roots)
+        )
+
+    def time_polling(self):
+        """Time one request for the comment list, returning its duration and size."""
+        url = f'/api/events/{self.event.id}/comments'
+        self.client.get(url)
+        durations = []
+        for _ in range(20):
+            started = time.perf_counter()
+            response = self.client.get(url)
+            durations.append(time.perf_counter() - started)
+        return statistics.median(durations), len(response.content)
+
+    async def time_fan_out(self):
+        """Open the streams and time the delivery of each message to all of them."""
+        hub = get_live_hub()
+        channel = COMMENT_CHANNEL.format(id=self.event.id)
+        streams = [sse_messages(channel) for _ in range(VIEWERS)]
+        for stream in streams:
+            await anext(stream)
+        assert hub.subscriber_count(channel) == VIEWERS
+
+        durations = []
+        for n in range(MESSAGES):
+            started = time.perf_counter()
+            hub.publish(channel, f'event: comment.created\ndata: {{"id": {n}}}\n\n')
+            await asyncio.gather(*(anext(stream) for stream in streams))
+            durations.append(time.perf_counter() - started)
+        for stream in streams:
+            await stream.aclose()
+        assert hub.subscriber_count(channel) == 0
+        return durations
+
+    def test_fan_out(self):
+        poll_duration, poll_size = self.time_polling()
+        durations = async_to_sync(self.time_fan_out)()
+        push = statistics.median(durations)
+        polls_per_second = VIEWERS / POLL_SECONDS
+
+        print(f"\n{VIEWERS} viewers polling {COMMENTS} comments every {POLL_SECONDS}s: "
+              f"{polls_per_second:.0f} requests/s of {poll_duration * 1000:.1f} ms and {poll_size / 1024:.0f} KB, "
+              f"{polls_per_second * poll_duration:.1f} CPU-seconds per second")
+        print(f"{VIEWERS} viewers streaming: one new comment reaches all in p50 {push * 1000:.1f} ms, "
+              f"max {max(durations) * 1000:.1f} ms")
+
+        # Pushing a comment to every viewer costs less than a single round of polling
+        self.assertLess(push, poll_duration * polls_per_second)
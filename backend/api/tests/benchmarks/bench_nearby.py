@@ -0,0 +1,96 @@
+"""
+Latency benchmark for the nearby events query.
+
+Not collected by the default test run. Run it explicitly with:
+
+    python manage.py test api.tests.benchmarks.bench_nearby
+
+Fills the database with synthetic upcoming events spread over Thailand, a tenth of them
+clustered around twenty cities, and times the nearby query around random points and
+around the city centres, where the most events fall inside the radius.
+
+Set BENCH_NEARBY_EVENTS to change the number of events, BENCH_NEARBY_QUERIES to change
+the number of timed queries per kind and BENCH_NEARBY_RADIUS to change the radius in km.
+Each query runs once untimed first, so the event payloads of the page come from the cache.
+"""
+import os
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from api.geo import encode_geohash
+from api.models import AttendeeUser, Event, Organizer
+from api.views.strategy.event_strategy import EventStrategy
+
+EVENTS = int(os.getenv('BENCH_NEARBY_EVENTS', 1000000))
+QUERIES = int(os.getenv('BENCH_NEARBY_QUERIES', 50))
+RADIUS = float(os.getenv('BENCH_NEARBY_RADIUS', 10))
+
+# Rough bounding box of Thailand: (min lat, max lat, min lng, max lng)
+AREA = (5.6, 20.5, 97.3, 105.6)
+
+
+class NearbyEventsBenchmark(TestCase):
+
+    def setUp(self):
+        rng = random.Random(0)
+        user = AttendeeUser.objects.create(username='bench', email='bench@example.com', birth_date='1990-01-01')
+        organizer = Organizer.objects.create(user=user, organizer_name='Bench', email='bench@example.com')
+        self.cities = [(rng.uniform(*AREA[:2]), rng.uniform(*AREA[2:])) for _ in range(20)]
+        now = timezone.now()
+
+        def location(n):
+            if n % 10 == 0:
+                lat, lng = rng.choice(self.cities)
+                # About 15 km of spread around the city centre
+                return lat + rng.gauss(0, 0.135), lng + rng.gauss(0, 0.135)
+            return rng.uniform(*AREA[:2]), rng.uniform(*AREA[2:])
+
+        def events():
+            for n in range(EVENTS):
+                lat, lng = location(n)
+                lat, lng = round(lat, 6), round(lng, 6)
+                yield Event(
+                    event_name=f'Event {n}', organizer=organizer, event_create_date=now - timedelta(days=1),
+                    start_date_event=now, end_date_event=now + timedelta(days=30), start_date_register=now,
+                    end_date_register=now, latitude=lat, longitude=lng, geohash=encode_geohash(lat, lng),
+                )
+
+        # bulk_create skips save(), so the geohashes are set above and the search index is not needed
+        Event.objects.bulk_create(events(), batch_size=5000)
+
+    def time_queries(self, points):
+        factory = RequestFactory()
+        timings = []
+        for lat, lng in points:
+            request = factory.get('/api/events/nearby')
+            request.user = AnonymousUser()
+            strategy = EventStrategy.get_strategy('nearby_events', request)
+            # The first call caches the payloads of the page, as in a warm deployment
+            strategy.execute(lat, lng, RADIUS)
+            started = time.perf_counter()
+            strategy.execute(lat, lng, RADIUS)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+    def test_nearby_latency(self):
+        rng = random.Random(1)
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN SELECT id FROM api_event WHERE geohash >= 'w4rq' AND geohash < 'w4rq{'")
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        kinds = {
+            'random': [(rng.uniform(*AREA[:2]), rng.uniform(*AREA[2:])) for _ in range(QUERIES)],
+            'city centre': [rng.choice(self.cities) for _ in range(QUERIES)],
+        }
+        print(f"\n{EVENTS} events, radius {RADIUS:g} km; plan: {plan}")
+        for kind, points in kinds.items():
+            p50, p95 = self.time_queries(points)
+            print(f"  {kind:11}: p50 {p50:.1f} ms p95 {p95:.1f} ms")
+        self.assertIn('geohash', plan)
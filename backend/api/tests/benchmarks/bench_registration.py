@@ -0,0 +1,119 @@
+"""
+Concurrency benchmark for ticket registration.
+
+Not collected by the default test run. Run it explicitly with:
+
+    python manage.py test api.tests.benchmarks.bench_registration
+
+Set BENCH_REGISTRATIONS / BENCH_CAPACITY / BENCH_WORKERS to change the load.
+The shared in-memory SQLite test database fails a write while another connection
+holds the table instead of waiting for it, so on SQLite the benchmark moves to a
+database file in WAL mode with a busy timeout. SQLite still runs one write
+transaction at a time and cannot upgrade a read transaction once another writer
+committed, so some registrations there fail with "database is locked" and are
+reported as other; the run checks that the seat counter, the tickets and the
+capacity agree under parallel requests. Against PostgreSQL the writers truly overlap.
+"""
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase
+from django.utils import timezone
+from ninja.testing import TestClient
+from ninja_jwt.tokens import RefreshToken
+
+from api.models import AttendeeUser, Organizer, Event, Ticket
+from api.urls import api
+import datetime
+
+REGISTRATIONS = int(os.getenv('BENCH_REGISTRATIONS', 300))
+CAPACITY = int(os.getenv('BENCH_CAPACITY', 50))
+WORKERS = int(os.getenv('BENCH_WORKERS', 32))
+
+
+class RegistrationConcurrencyBenchmark(TransactionTestCase):
+    client = TestClient(api)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.sqlite_settings = None
+        if connection.vendor == 'sqlite':
+            # The worker threads build their connections from this same settings dict
+            cls.sqlite_settings = dict(connection.settings_dict)
+            cls.sqlite_dir = tempfile.TemporaryDirectory()
+            # Closing the last connection to the in-memory database would drop it
+            cls.memory_connection, connection.connection = connection.connection, None
+            connection.settings_dict.update(
+                NAME=os.path.join(cls.sqlite_dir.name, 'bench.sqlite3'),
+                OPTIONS={**cls.sqlite_settings['OPTIONS'], 'timeout': 60},
+            )
+            call_command('migrate', verbosity=0)
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode=WAL')
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.sqlite_settings:
+            connection.close()
+            connection.settings_dict.update(cls.sqlite_settings)
+            connection.connection = cls.memory_connection
+            cls.sqlite_dir.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        owner = AttendeeUser.objects.create_user(username='bench_owner', password='password123')
+        organizer = Organizer.objects.create(user=owner, organizer_name='bench_owner')
+        self.event = Event.objects.create(
+            event_name='Benchmark event',
+            organizer=organizer,
+            start_date_register=timezone.now() - datetime.timedelta(days=1),
+            end_date_register=timezone.now() + datetime.timedelta(days=1),
+            start_date_event=timezone.now() + datetime.timedelta(days=2),
+            end_date_event=timezone.now() + datetime.timedelta(days=3),
+            max_attendee=CAPACITY,
+            description='Benchmark event',
+        )
+        AttendeeUser.objects.bulk_create([
+            AttendeeUser(username=f'bench_{index}', birth_date='1995-06-15', email=f'bench_{index}@example.com')
+            for index in range(REGISTRATIONS)
+        ])
+        self.tokens = [
+            str(RefreshToken.for_user(user).access_token)
+            for user in AttendeeUser.objects.filter(username__startswith='bench_').exclude(id=owner.id)
+        ]
+
+    def register(self, token):
+        try:
+            response = self.client.post(
+                f'/api/tickets/event/{self.event.id}/register',
+                headers={'Authorization': f'Bearer {token}'}
+            )
+            return response.status_code, response.json().get('error')
+        finally:
+            connection.close()
+
+    @patch('api.utils.send_ticket_email.delay')
+    def test_parallel_registrations_do_not_oversell(self, mock_delay):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+            results = list(executor.map(self.register, self.tokens))
+        elapsed = time.perf_counter() - started
+
+        registered = sum(1 for status, _ in results if status == 201)
+        full = sum(1 for _, error in results if error and 'maximum number of attendees' in error)
+        self.event.refresh_from_db()
+
+        print(
+            f"\n{len(results)} registrations, {WORKERS} workers, capacity {CAPACITY}: "
+            f"{registered} registered, {full} full, {len(results) - registered - full} other, "
+            f"{elapsed:.2f}s ({len(results) / elapsed:.0f} req/s) on {connection.vendor}"
+        )
+        self.assertLessEqual(registered, CAPACITY)
+        self.assertEqual(Ticket.objects.filter(event=self.event).count(), registered)
+        self.assertEqual(self.event.attendee_count, registered)
@@ -0,0 +1,100 @@
+"""
+Latency benchmark for full-text event search.
+
+Not collected by the default test run. Run it explicitly with:
+
+    python manage.py test api.tests.benchmarks.bench_search
+
+Fills the database with synthetic events, rebuilds the search index and times a mix of
+common, rare and prefix queries against the indexed search and against the plain
+`icontains` scan it replaces. Event text is drawn from a Zipf-distributed vocabulary,
+so a few words appear in most events and most words in only a handful, as in real text.
+
+Set BENCH_SEARCH_EVENTS to change the number of events and BENCH_SEARCH_QUERIES to
+change the number of timed queries per kind.
+"""
+import os
+import random
+import statistics
+import time
+
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import AttendeeUser, Event, Organizer
+from api.search import SimpleEventSearch, get_search_backend
+
+EVENTS = int(os.getenv('BENCH_SEARCH_EVENTS', 100000))
+QUERIES = int(os.getenv('BENCH_SEARCH_QUERIES', 50))
+
+WORDS = (
+    'music festival workshop coding hackathon startup pitch yoga retreat marathon charity '
+    'gala jazz night photography walk robotics seminar design sprint cooking class wine '
+    'tasting film screening poetry slam chess tournament volunteer cleanup career fair '
+    'python django cloud security data science art exhibition theatre comedy dance'
+).split()
+VOCABULARY_SIZE = 20000
+
+
+class EventSearchBenchmark(TestCase):
+
+    def setUp(self):
+        rng = random.Random(0)
+        letters = 'abcdefghijklmnopqrstuvwxyz'
+        self.vocabulary = WORDS + [''.join(rng.choices(letters, k=rng.randint(4, 10))) for _ in range(VOCABULARY_SIZE)]
+        weights = [1 / rank for rank in range(1, len(self.vocabulary) + 1)]
+        user = AttendeeUser.objects.create(username='bench', email='bench@example.com', birth_date='1990-01-01')
+        organizers = Organizer.objects.bulk_create(
+            Organizer(user=user, organizer_name=f'{rng.choice(WORDS).title()} Society {n}', email=f'o{n}@example.com')
+            for n in range(20)
+        )
+        now = timezone.now()
+
+        def text(count):
+            return ' '.join(rng.choices(self.vocabulary, weights, k=count))
+
+        Event.objects.bulk_create(
+            (Event(
+                event_name=text(3).title(),
+                organizer=organizers[n % len(organizers)],
+                event_create_date=now,
+                start_date_event=now,
+                end_date_event=now,
+                start_date_register=now,
+                end_date_register=now,
+                tags=','.join(rng.sample(WORDS, 3)),
+                description=text(30),
+                detailed_description=text(120),
+            ) for n in range(EVENTS)),
+            batch_size=2000,
+        )
+        started = time.perf_counter()
+        get_search_backend().rebuild()
+        self.index_elapsed = time.perf_counter() - started
+
+    def time_queries(self, backend, queries):
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            backend.search(query, 20)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+    def test_search_latency(self):
+        rng = random.Random(1)
+        rare = self.vocabulary[len(WORDS) + 1000:]
+        kinds = {
+            'common': [rng.choice(WORDS) for _ in range(QUERIES)],
+            'rare': [rng.choice(rare) for _ in range(QUERIES)],
+            'two words': [f'{rng.choice(WORDS)} {rng.choice(rare)}' for _ in range(QUERIES)],
+            'prefix': [rng.choice(rare)[:4] for _ in range(QUERIES)],
+        }
+        backend = get_search_backend()
+        print(f"\n{EVENTS} events, index built in {self.index_elapsed:.1f}s ({type(backend).__name__})")
+        for kind, queries in kinds.items():
+            indexed = self.time_queries(backend, queries)
+            scan = self.time_queries(SimpleEventSearch(), queries[:5])
+            print(f"  {kind:10}: indexed p50 {indexed[0]:.1f} ms p95 {indexed[1]:.1f} ms; "
+                  f"icontains scan p50 {scan[0]:.1f} ms")
+        self.assertTrue(backend.search(WORDS[0], 20))
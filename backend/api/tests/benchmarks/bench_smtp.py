@@ -0,0 +1,85 @@
+"""
+Throughput benchmark for the pooled SMTP sender against a local stub SMTP server.
+
+Not collected by the default test run. Run it explicitly with:
+
+    python manage.py test api.tests.benchmarks.bench_smtp
+
+Needs aiosmtpd, from requirements-dev.txt. Set BENCH_MESSAGES / BENCH_POOL_SIZE to change the load.
+"""
+import os
+import smtplib
+import socket
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+
+from django.test import SimpleTestCase
+
+from api.utils import SMTPConnectionPool
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:
+    Controller = None
+
+MESSAGES = int(os.getenv('BENCH_MESSAGES', 2000))
+POOL_SIZE = int(os.getenv('BENCH_POOL_SIZE', 4))
+
+
+class CountingHandler:
+    """aiosmtpd handler that only counts delivered messages."""
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return '250 Message accepted for delivery'
+
+
+@unittest.skipIf(Controller is None, "aiosmtpd is not installed")
+class SMTPPoolBenchmark(SimpleTestCase):
+
+    def setUp(self):
+        self.handler = CountingHandler()
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            self.port = probe.getsockname()[1]
+        self.controller = Controller(self.handler, hostname='127.0.0.1', port=self.port)
+        self.controller.start()
+
+    def tearDown(self):
+        self.controller.stop()
+
+    def build_message(self, index):
+        message = MIMEText(f'<p>Reminder {index}</p>', 'html')
+        message['Subject'] = 'Event reminder'
+        message['From'] = 'events@example.com'
+        message['To'] = f'attendee{index}@example.com'
+        return message
+
+    def send_with_new_connections(self, count):
+        for index in range(count):
+            with smtplib.SMTP('127.0.0.1', self.port) as server:
+                server.send_message(self.build_message(index))
+
+    def send_with_pool(self, count):
+        with SMTPConnectionPool(size=POOL_SIZE, host='127.0.0.1', port=self.port, username='', use_tls=False) as pool:
+            with ThreadPoolExecutor(max_workers=POOL_SIZE) as executor:
+                list(executor.map(lambda index: pool.send_message(self.build_message(index)), range(count)))
+
+    def test_pooled_sender_throughput(self):
+        started = time.perf_counter()
+        self.send_with_new_connections(MESSAGES)
+        per_message = time.perf_counter() - started
+
+        started = time.perf_counter()
+        self.send_with_pool(MESSAGES)
+        pooled = time.perf_counter() - started
+
+        print(
+            f"\n{MESSAGES} messages: connection per message {MESSAGES / per_message:.0f} msg/s, "
+            f"pool of {POOL_SIZE} {MESSAGES / pooled:.0f} msg/s"
+        )
+        self.assertEqual(self.handler.received, 2 * MESSAGES)
@@ -0,0 +1,114 @@
+"""
+Load test for the waiting room of ticket drops.
+
+Not collected by the default test run. Run it explicitly with:
+
+    python manage.py test api.tests.benchmarks.bench_waiting_room
+
+BENCH_WAITING_ROOM_USERS users (10,000 by default) try to register in the same second
+the registration of an event with SEATS seats opens. The clock of the waiting room is
+simulated: every simulated second, the users at the head of the queue check their place,
+as their clients poll, and register once admitted, until the event is full.
+
+Records the latency of the register and queue requests per thousand users of the spike
+and per simulated second of the drain, and the registrations written per second, which
+the waiting room must keep at WAITING_ROOM_RATE however large the spike.
+"""
+import json
+import os
+import statistics
+import time
+from datetime import date
+from unittest.mock import patch
+
+from django.contrib.auth.hashers import make_password
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from api.models import AttendeeUser, Event, Organizer
+from api.views.strategy.ticket_strategy import TicketStrategy
+from api.waiting_room import get_waiting_room
+
+USERS = int(os.getenv('BENCH_WAITING_ROOM_USERS', 10000))
+SEATS = 500
+RATE = 50
+
+
+def percentiles(durations):
+    """Get the p50 and p99 of durations in milliseconds."""
+    durations = sorted(durations)
+    return (statistics.median(durations) * 1000, durations[int(len(durations) * 0.99) - 1] * 1000)
+
+
+@override_settings(WAITING_ROOM_RATE=RATE)
+class WaitingRoomLoadTest(TestCase):
+
+    def setUp(self):
+        get_waiting_room().clear()
+        password = make_password('bench')
+        owner = AttendeeUser.objects.create(username='owner', email='owner@example.com', password=password)
+        organizer = Organizer.objects.create(user=owner, organizer_name='Bench', email='owner@example.com')
+        now = timezone.now()
+        self.event = Event.objects.create(
+            event_name='Ticket drop', organizer=organizer, max_attendee=SEATS,
+            start_date_register=now - timezone.timedelta(seconds=1), end_date_register=now + timezone.timedelta(days=1),
+            start_date_event=now + timezone.timedelta(days=2), end_date_event=now + timezone.timedelta(days=3),
+        )
+        self.users = AttendeeUser.objects.bulk_create(
+            (AttendeeUser(username=f'fan{n}', email=f'fan{n}@example.com', birth_date=date(1990, 1, 1), password=password)
+             for n in range(USERS)),
+            batch_size=2000,
+        )
+        self.factory = RequestFactory()
+        self.clock = 1000.0
+
+    def call(self, strategy_name, user):
+        """Run a ticket strategy for a user, returning the response and its duration."""
+        request = self.factory.post('/')
+        request.user = user
+        started = time.perf_counter()
+        response = TicketStrategy.get_strategy(strategy_name).execute(request, self.event.id)
+        return response, time.perf_counter() - started
+
+    def test_ticket_drop_spike(self):
+        register_times, queue_times, written = [], [], []
+        with patch('api.utils.send_ticket_email.delay'), \
+                patch.object(get_waiting_room(), 'clock', lambda: self.clock):
+            # Everyone arrives in the first second
+            statuses = {}
+            for user in self.users:
+                response, duration = self.call('register_ticket', user)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                register_times.append(duration)
+            written.append(statuses.get(201, 0))
+
+            # The queue drains at the admission rate until the event is full
+            waiting = [user for user in self.users[statuses.get(201, 0):]]
+            while waiting and self.event.attendee_count < SEATS:
+                self.clock += 1
+                sold = 0
+                for user in waiting[:RATE * 2]:
+                    response, duration = self.call('waiting_room_status', user)
+                    queue_times.append(duration)
+                    if json.loads(response.content)['state'] == 'admitted':
+                        response, duration = self.call('register_ticket', user)
+                        register_times.append(duration)
+                        sold += response.status_code == 201
+                waiting = waiting[sold:]
+                written.append(sold)
+                self.event.refresh_from_db()
+
+        print(f"\n{USERS} users in the first second: {statuses}")
+        for start in range(0, USERS, USERS // 10):
+            p50, p99 = percentiles(register_times[start:start + USERS // 10])
+            print(f"  register requests {start}-{start + USERS // 10}: p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+        p50, p99 = percentiles(register_times[USERS:])
+        print(f"Drain over {len(written) - 1} simulated seconds: register p50 {p50:.2f} ms, p99 {p99:.2f} ms; "
+              f"queue checks p50 {percentiles(queue_times)[0]:.2f} ms, p99 {percentiles(queue_times)[1]:.2f} ms")
+        print(f"Registrations written per second: max {max(written)}, seats sold {self.event.attendee_count}")
+
+        self.assertEqual(self.event.attendee_count, SEATS)
+        self.assertLessEqual(max(written), RATE)
+        # The last thousand users of the spike wait no longer than the first thousand
+        first, last = percentiles(register_times[:USERS // 10]), percentiles(register_times[USERS - USERS // 10:USERS])
+        self.assertLess(last[0], first[0] * 2)
@@ -1,4 +1,4 @@
-from .utils.utils_bookmark import BookmarkModelsTest, Bookmarks
+from .utils.utils_bookmark import BookmarkModelsTest, Bookmarks, Event, fake, timezone, datetime
 
 
 class BookmarkTest(BookmarkModelsTest):
@@ -10,12 +10,37 @@ class BookmarkTest(BookmarkModelsTest):
         self.assertEqual(response.status_code, 200)
         
 
+    def test_show_bookmark_pagination(self):
+        other_event = Event.objects.create(
+            event_name=fake.company(),
+            organizer=self.organizer,
+            start_date_event=timezone.now(),
+            end_date_event=timezone.now() + datetime.timedelta(days=1),
+            start_date_register=timezone.now() - datetime.timedelta(days=2),
+            end_date_register=timezone.now() + datetime.timedelta(days=3),
+            description=fake.text(max_nb_chars=200)
+        )
+        Bookmarks.objects.create(event=self.event_test, attendee=self.test_user)
+        Bookmarks.objects.create(event=other_event, attendee=self.test_user)
+        token = self.get_token_for_user(self.test_user)
+
+        response = self.client.get(f"{self.show_bookmark_url}?limit=1", headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual([event['id'] for event in response.json()], [other_event.id])
+        self.assertTrue(response['X-Next-Cursor'])
+
+        response = self.client.get(f"{self.show_bookmark_url}?limit=1&cursor={response['X-Next-Cursor']}",
+                                   headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual([event['id'] for event in response.json()], [self.event_test.id])
+        self.assertFalse(response.has_header('X-Next-Cursor'))
+
     def test_toggle_bookmark_not_bookmarked(self):
         token = self.get_token_for_user(self.test_user)
         response = self.client.put(f'/api/bookmarks/{self.event_test.id}/toggle-bookmark',headers={"Authorization": f"Bearer {token}"})
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()['message'], 'Bookmark added successfully.')
         self.assertEqual(Bookmarks.objects.filter(event=self.event_test, attendee=self.test_user).count(), 1)
+        self.event_test.refresh_from_db()
+        self.assertEqual(self.event_test.bookmark_count, 1)
 
     def test_toggle_bookmark_already_bookmarked(self):
         Bookmarks.objects.create(event=self.event_test, attendee=self.test_user)
@@ -24,6 +49,8 @@ class BookmarkTest(BookmarkModelsTest):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()['message'], 'Bookmark removed successfully.')
         self.assertEqual(Bookmarks.objects.filter(event=self.event_test, attendee=self.test_user).count(), 0)
+        self.event_test.refresh_from_db()
+        self.assertEqual(self.event_test.bookmark_count, 0)
 
     def test_toggle_bookmark_event_does_not_exist(self):
         token = self.get_token_for_user(self.test_user)
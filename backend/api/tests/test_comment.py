@@ -1,4 +1,8 @@
-from .utils.utils_comment import CommentModelsTest, Event, Http404, Comment
+from .utils.utils_comment import CommentModelsTest, Event, Http404, Comment, CommentReaction
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import override_settings
+from api.live import COMMENT_CHANNEL, get_live_hub
+from .utils.utils_live import asgi_stream
 import json
 
 class CommentTest(CommentModelsTest):
@@ -124,4 +128,115 @@ class CommentTest(CommentModelsTest):
         
         # Assert the error message
         self.assertEqual(response.json()['error'], 'Unauthorized to edit this comment')
-        
\ No newline at end of file
+
+    def toggle_reaction(self, comment, token, reaction_type):
+        return self.client.put(
+            f'/api/comments/{comment.id}/toggle-reaction',
+            data=json.dumps({'reaction_type': reaction_type}),
+            headers={"Authorization": f"Bearer {token}"}
+        )
+
+    def test_toggle_reaction(self):
+        user = self.create_user("test", 'test', "test")
+        token = self.get_token_for_user(user)
+        comment = self.create_comment(self.test_user)
+        CommentReaction.objects.create(comment=comment, user=self.test_user, reaction_type='LIKE')
+
+        response = self.toggle_reaction(comment, token, 'LIKE')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['reacted'])
+        self.assertEqual(response.json()['reaction_counts'], {'LIKE': 2, 'LOVE': 0, 'LAUGH': 0})
+        self.assertEqual(response.json()['my_reactions'], ['LIKE'])
+
+        response = self.toggle_reaction(comment, token, 'LIKE')
+        self.assertFalse(response.json()['reacted'])
+        self.assertEqual(response.json()['reaction_counts']['LIKE'], 1)
+        self.assertEqual(response.json()['my_reactions'], [])
+        self.assertEqual(self.toggle_reaction(comment, token, 'ANGRY').status_code, 422)
+        self.assertEqual(self.toggle_reaction(Comment(id=0), token, 'LIKE').status_code, 404)
+
+    def test_comment_reaction_counts(self):
+        user = self.create_user("test", 'test', "test")
+        token = self.get_token_for_user(user)
+        root = self.create_comment(self.test_user, "root")
+        reply = Comment.objects.create(user=user, event=self.event_test, parent=root, content="reply")
+        for reaction_type in ('LIKE', 'LAUGH'):
+            CommentReaction.objects.create(comment=root, user=user, reaction_type=reaction_type)
+        CommentReaction.objects.create(comment=root, user=self.test_user, reaction_type='LIKE')
+        CommentReaction.objects.create(comment=reply, user=self.test_user, reaction_type='LOVE')
+        url = f'/api/events/{self.event_test.id}/comments'
+
+        thread = self.client.get(url, headers={"Authorization": f"Bearer {token}"}).json()[0]
+        self.assertEqual(thread['reaction_counts'], {'LIKE': 2, 'LOVE': 0, 'LAUGH': 1})
+        self.assertEqual(thread['my_reactions'], ['LIKE', 'LAUGH'])
+        self.assertEqual(thread['replies'][0]['reaction_counts'], {'LIKE': 0, 'LOVE': 1, 'LAUGH': 0})
+        self.assertEqual(thread['replies'][0]['my_reactions'], [])
+        self.assertEqual(self.client.get(url).json()[0]['my_reactions'], [])
+
+    @override_settings(LIVE_STREAM_SECONDS=2, LIVE_KEEPALIVE_SECONDS=1)
+    def test_comment_stream(self):
+        user = self.create_user("test", 'test', "test")
+        headers = {"Authorization": f"Bearer {self.get_token_for_user(user)}"}
+        channel = COMMENT_CHANNEL.format(id=self.event_test.id)
+        response = self.client.get(f'/api/events/{self.event_test.id}/comments/stream')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+
+        def write(method, url, data=None):
+            with self.captureOnCommitCallbacks(execute=True):
+                return getattr(self.client, method)(url, data=json.dumps(data), content_type="application/json", headers=headers).json()
+
+        async def next_event():
+            frame = (await anext(stream)).decode()
+            name, data = frame.strip().split('\n')
+            return name.removeprefix('event: '), json.loads(data.removeprefix('data: '))
+
+        async def follow():
+            self.assertEqual(await anext(stream), b'retry: 3000\n\n')
+            self.assertEqual(get_live_hub().subscriber_count(channel), 1)
+
+            created = await sync_to_async(write)('post', f"{self.write_comment_url}{self.event_test.id}", {"content": "hello"})
+            name, data = await next_event()
+            self.assertEqual((name, data['id'], data['content'], data['parent_id']), ('comment.created', created['id'], 'hello', None))
+
+            await sync_to_async(write)('put', f"/api/comments/{created['id']}/edit/", {"content": "edited"})
+            self.assertEqual(await next_event(), ('comment.edited', {**data, 'content': 'edited'}))
+
+            await sync_to_async(write)('delete', f"/api/comments/{created['id']}/delete/")
+            self.assertEqual(await next_event(), ('comment.deleted', {'id': created['id'], 'parent_id': None}))
+
+            # Idle streams send keepalives and end after LIVE_STREAM_SECONDS
+            rest = [frame async for frame in stream]
+            self.assertIn(b': keepalive\n\n', rest)
+            self.assertEqual(get_live_hub().subscriber_count(channel), 0)
+
+        async_to_sync(follow)()
+
+    @override_settings(LIVE_STREAM_SECONDS=5, LIVE_KEEPALIVE_SECONDS=5)
+    def test_comment_stream_sends_each_frame_as_it_happens(self):
+        user = self.create_user("test", 'test', "test")
+        headers = {"Authorization": f"Bearer {self.get_token_for_user(user)}"}
+
+        def write(content):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(f"{self.write_comment_url}{self.event_test.id}", data=json.dumps({"content": content}),
+                                 content_type="application/json", headers=headers)
+
+        async def follow():
+            async with asgi_stream(f'/api/events/{self.event_test.id}/comments/stream') as (start, next_body):
+                self.assertEqual(start['status'], 200)
+                self.assertEqual(await next_body(), {'type': 'http.response.body', 'body': b'retry: 3000\n\n', 'more_body': True})
+                for content in ('first', 'second'):
+                    await sync_to_async(write)(content)
+                    # Each comment reaches the client while the response is still open
+                    message = await next_body()
+                    self.assertTrue(message['more_body'])
+                    self.assertIn(b'event: comment.created', message['body'])
+                    self.assertIn(f'"content": "{content}"'.encode(), message['body'])
+
+        async_to_sync(follow)()
+
+    def test_comment_stream_event_not_found(self):
+        response = self.client.get('/api/events/0/comments/stream')
+        self.assertEqual(response.status_code, 404)
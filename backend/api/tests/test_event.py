@@ -1,8 +1,30 @@
 from .utils.utils_event import EventModelsTest, timezone,datetime, Event, Organizer, fake, patch, ALLOWED_IMAGE_TYPES, MagicMock, ClientError, SimpleUploadedFile,ValidationError, EventResponseSchema
+from api.models import Bookmarks, Like, Ticket
+from api.utils import refresh_event_statuses
+from django.core.management import call_command
+from io import StringIO
 
+from api.storage import get_s3_client, ImageUploadService
+from api.images import render_variants, schedule_image_variants
+from api.utils import generate_image_variants
+from botocore.response import StreamingBody
+from django.test import override_settings
+from PIL import Image
+import io
+from botocore.stub import Stubber, ANY
+from django.conf import settings
+from django.core.cache import cache
 from django.http import QueryDict
 import tempfile
+import csv
+from api.geo import encode_geohash
+from api.models import AttendeeUser, Comment, Tag
+from api.models.event import parse_email_domains
 import json
+from api.views.pagination import KeysetPaginator
+from asgiref.sync import async_to_sync
+from .utils.utils_live import asgi_stream
+from api.exports import csv_lines
 class EventTest(EventModelsTest):
 
     def test_organizer_create_event(self):
@@ -225,6 +247,26 @@ class EventTest(EventModelsTest):
         
         
 
+    @patch('api.utils.generate_image_variants.delay')
+    @patch('boto3.client')
+    def test_create_event_with_image_saves_the_event_once(self, mock_boto3_client, mock_delay):
+        user = self.create_user("become_organizer", "become_organizer")
+        token = self.get_token_for_user(user)
+        self.become_organizer(user, "become_organizer")
+        event_data = self.get_valid_data()
+        event_data['image'] = self.create_test_image()
+
+        with patch.object(Event, 'save', autospec=True, side_effect=Event.save) as mock_save:
+            response = self.client.post(
+                path = '/api/events/create-event',
+                data=event_data,
+                headers={'Authorization': f'Bearer {token}'}
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_save.call_count, 1)
+        self.assertTrue(Event.objects.get(event_name=event_data['event_name']).event_image)
+
     # ## Test get_my_events function
     def test_invalid_organizer_get_my_events(self):
         normal_user  = self.create_user("test","test")
@@ -270,6 +312,132 @@ class EventTest(EventModelsTest):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.json()), 3)
 
+    def test_list_all_event_pagination(self):
+        response = self.client.get('/api/events/events?limit=2')
+        self.assertEqual(response.status_code, 200)
+        first_page = [event['id'] for event in response.json()]
+        self.assertEqual(len(first_page), 2)
+        cursor = response['X-Next-Cursor']
+
+        response = self.client.get(f'/api/events/events?limit=2&cursor={cursor}')
+        second_page = [event['id'] for event in response.json()]
+        self.assertEqual(len(second_page), 1)
+        self.assertFalse(response.has_header('X-Next-Cursor'))
+        all_ids = list(Event.objects.order_by('-event_create_date', '-id').values_list('id', flat=True))
+        self.assertEqual(first_page + second_page, all_ids)
+
+    def test_list_all_event_without_pagination_returns_the_default_page(self):
+        organizer = Event.objects.first().organizer
+        now = timezone.now()
+        Event.objects.bulk_create(
+            Event(event_name=f'Event {n}', organizer=organizer, start_date_event=now, end_date_event=now,
+                  start_date_register=now, end_date_register=now)
+            for n in range(KeysetPaginator.DEFAULT_LIMIT + 5)
+        )
+        response = self.client.get('/api/events/events')
+        self.assertEqual(len(response.json()), KeysetPaginator.DEFAULT_LIMIT)
+        self.assertTrue(response.has_header('X-Next-Cursor'))
+
+    def test_list_all_event_invalid_cursor(self):
+        response = self.client.get('/api/events/events?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+
+    def test_list_all_event_engagement(self):
+        attendee = self.create_user("engaged", "engaged")
+        Like.objects.create(event=self.event_test, user=attendee, status='like')
+        Bookmarks.objects.create(event=self.event_test, attendee=attendee)
+        Ticket.objects.create(event=self.event_test, attendee=attendee)
+        token = self.get_token_for_user(attendee)
+        response = self.client.get('/api/events/events', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200)
+        events = {event['id']: event for event in response.json()}
+        engaged = events[self.event_test.id]
+        self.assertEqual(engaged['engagement'], {'total_likes': 1, 'total_bookmarks': 1})
+        self.assertEqual(engaged['current_attendees'], 1)
+        self.assertEqual(engaged['user_engaged'], {'is_liked': True, 'is_bookmarked': True, 'is_applied': True})
+        self.assertEqual(events[self.public_event.id]['user_engaged'], {'is_liked': False, 'is_bookmarked': False, 'is_applied': False})
+
+    def test_engagement_counters_follow_source_rows(self):
+        attendee = self.create_user("engaged", "engaged")
+        Like.objects.create(event=self.event_test, user=attendee, status='unlike')
+        bookmark = Bookmarks.objects.create(event=self.event_test, attendee=attendee)
+        Ticket.objects.create(event=self.event_test, attendee=attendee)
+        event = Event.objects.get(id=self.event_test.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(event.like_count, 0)
+            self.assertEqual(event.bookmark_count, 1)
+            self.assertEqual(event.current_number_attendee, 1)
+        bookmark.delete()
+        event.refresh_from_db()
+        self.assertEqual(event.bookmark_count, 0)
+
+    def test_engagement_counters_ignore_rows_already_deleted(self):
+        attendee = self.create_user("engaged", "engaged")
+        rows = [
+            Like.objects.create(event=self.event_test, user=attendee, status='like'),
+            Bookmarks.objects.create(event=self.event_test, attendee=attendee),
+            Ticket.objects.create(event=self.event_test, attendee=attendee),
+        ]
+        Ticket.objects.create(event=self.event_test, attendee=self.test_user1)
+        Like.objects.create(event=self.event_test, user=self.test_user1, status='like')
+        Bookmarks.objects.create(event=self.event_test, attendee=self.test_user1)
+        for row in rows:
+            # A second copy of the row, as held by a concurrent request deleting it too
+            stale = type(row).objects.get(pk=row.pk)
+            row.delete()
+            stale.delete()
+        event = Event.objects.get(id=self.event_test.id)
+        self.assertEqual((event.attendee_count, event.like_count, event.bookmark_count), (1, 1, 1))
+
+    def test_reconcile_counters(self):
+        attendee = self.create_user("engaged", "engaged")
+        Ticket.objects.create(event=self.event_test, attendee=attendee)
+        Event.objects.filter(id=self.event_test.id).update(attendee_count=7, like_count=3)
+        self.assertEqual(list(Event.objects.with_counter_drift().values_list('id', flat=True)), [self.event_test.id])
+        call_command('reconcile_event_counters', stdout=StringIO())
+        event = Event.objects.get(id=self.event_test.id)
+        self.assertEqual((event.attendee_count, event.like_count, event.bookmark_count), (1, 0, 0))
+        self.assertFalse(Event.objects.with_counter_drift().exists())
+
+    def test_list_all_event_does_not_write(self):
+        Event.objects.filter(id=self.event_test.id).update(status_registeration='CLOSED')
+        # One read for the page and one for its events, then served from the cache
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/events/events')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/events/events').json(), response.json())
+        self.assertEqual(response.status_code, 200)
+        events = {event['id']: event for event in response.json()}
+        self.assertEqual(events[self.event_test.id]['status_registeration'], 'OPEN')
+        self.assertEqual(Event.objects.get(id=self.event_test.id).status_registeration, 'CLOSED')
+
+    def test_compute_registeration_status(self):
+        self.assertEqual(self.event_test.compute_registeration_status(), 'OPEN')
+        self.event_test.max_attendee = 1
+        Ticket.objects.create(event=self.event_test, attendee=self.test_user1)
+        self.event_test.refresh_from_db(fields=['attendee_count'])
+        self.assertEqual(self.event_test.compute_registeration_status(), 'FULL')
+        self.event_test.end_date_register = timezone.now() - datetime.timedelta(days=1)
+        self.assertEqual(self.event_test.compute_registeration_status(), 'CLOSED')
+
+    def test_refresh_event_statuses(self):
+        full_event = self.create_event(
+            timezone.now() - datetime.timedelta(days=1), timezone.now() + datetime.timedelta(days=1),
+            timezone.now() + datetime.timedelta(days=2), timezone.now() + datetime.timedelta(days=3)
+        )
+        full_event.max_attendee = 1
+        full_event.save()
+        Ticket.objects.create(event=full_event, attendee=self.test_user1)
+        Event.objects.filter(id=self.event_test.id).update(status_registeration='CLOSED')
+
+        refresh_event_statuses()
+
+        self.assertEqual(Event.objects.get(id=full_event.id).status_registeration, 'FULL')
+        self.assertEqual(Event.objects.get(id=full_event.id).status, 'UPCOMING')
+        self.assertEqual(Event.objects.get(id=self.event_test.id).status_registeration, 'OPEN')
+        self.assertEqual(Event.objects.get(id=self.event_test.id).status, 'ONGOING')
+        self.assertEqual(Event.objects.get(id=self.public_event.id).status_registeration, 'CLOSED')
+        self.assertEqual(Event.objects.get(id=self.public_event.id).status, 'COMPLETED')
         
         
     def test_get_detail(self):
@@ -641,37 +809,497 @@ class EventTest(EventModelsTest):
         
         # Check if the error message is "End date must be after start date."
         self.assertIn("End date must be after start date.", str(cm.exception))
-    
-        
-        
-        
 
-   
-        
-        
-        
-        
-        
-        
-        
-        
+    def test_s3_client_is_shared(self):
+        client = get_s3_client()
+        self.assertIs(get_s3_client(), client)
+        self.assertEqual(client.meta.config.max_pool_connections, settings.AWS_S3_MAX_POOL_CONNECTIONS)
 
-        
-        
+    def test_image_upload_service(self):
+        image = SimpleUploadedFile(name='poster.png', content=b'some content', content_type='image/png')
+        uploads = ImageUploadService('event_images')
+        with Stubber(get_s3_client()) as stubber:
+            stubber.add_response('put_object', {}, {
+                'Bucket': settings.AWS_STORAGE_BUCKET_NAME, 'Key': ANY, 'Body': ANY, 'ContentType': 'image/png',
+            })
+            stubber.add_response('delete_object', {}, {'Bucket': settings.AWS_STORAGE_BUCKET_NAME, 'Key': 'event_images/old.png'})
+            key = uploads.upload(image)
+            uploads.delete('event_images/old.png')
+            stubber.assert_no_pending_responses()
+        self.assertTrue(key.startswith('event_images/'))
+        self.assertTrue(key.endswith('.png'))
+        self.assertEqual(uploads.file_url(key), f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/{key}")
 
-        
-        
+    def sample_image(self, size=(1000, 500), mode='RGBA', fmt='PNG'):
+        buffer = io.BytesIO()
+        Image.new(mode, size, (200, 30, 30, 128) if mode == 'RGBA' else (200, 30, 30)).save(buffer, fmt)
+        return buffer.getvalue()
 
-        
+    def test_render_image_variants(self):
+        variants = render_variants(self.sample_image())
+        self.assertEqual(list(variants), [320, 640])
+        for width, formats in variants.items():
+            self.assertEqual(set(formats), {'webp', 'jpeg'})
+            for fmt, body in formats.items():
+                with Image.open(io.BytesIO(body)) as image:
+                    self.assertEqual(image.format, fmt.upper())
+                    self.assertEqual(image.size, (width, width // 2))
 
-        
-        
-        
+    def test_render_image_variants_never_enlarges(self):
+        variants = render_variants(self.sample_image(size=(200, 100), mode='RGB', fmt='JPEG'))
+        self.assertEqual(list(variants), [200])
 
-        
-        
-        
+    @override_settings(IMAGE_VARIANT_WORKERS=1)
+    def test_generate_image_variants(self):
+        key = 'event_images/poster.png'
+        Event.objects.filter(id=self.event_test.id).update(event_image=key)
+        data = self.sample_image()
+        with Stubber(get_s3_client()) as stubber:
+            stubber.add_response('get_object', {'Body': StreamingBody(io.BytesIO(data), len(data))},
+                                 {'Bucket': settings.AWS_STORAGE_BUCKET_NAME, 'Key': key})
+            for _ in range(4):
+                stubber.add_response('put_object', {}, {
+                    'Bucket': ANY, 'Key': ANY, 'Body': ANY, 'ContentType': ANY, 'CacheControl': ANY,
+                })
+            result = generate_image_variants('event', self.event_test.id, 'event_image')
+            stubber.assert_no_pending_responses()
+        self.assertEqual(result, {'variants': 4})
+        event = Event.objects.get(id=self.event_test.id)
+        self.assertEqual(event.image_variants, {
+            '320': {'webp': 'event_images/poster_320w.webp', 'jpeg': 'event_images/poster_320w.jpeg'},
+            '640': {'webp': 'event_images/poster_640w.webp', 'jpeg': 'event_images/poster_640w.jpeg'},
+        })
+        response = self.client.get(f'/api/events/{self.event_test.id}')
+        self.assertEqual(
+            response.json()['image_variant_urls']['640']['webp'],
+            f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/event_images/poster_640w.webp"
+        )
 
-    
+    def test_schedule_image_variants_discards_old_variants(self):
+        self.event_test.event_image = 'event_images/new.png'
+        self.event_test.image_variants = {'320': {'webp': 'event_images/old_320w.webp'}}
+        self.event_test.save()
+        with Stubber(get_s3_client()) as stubber, patch('api.utils.generate_image_variants.delay') as delay:
+            stubber.add_response('delete_object', {}, {'Bucket': ANY, 'Key': 'event_images/old_320w.webp'})
+            with self.captureOnCommitCallbacks(execute=True):
+                schedule_image_variants(self.event_test, 'event_image')
+            stubber.assert_no_pending_responses()
+        delay.assert_called_once_with('event', self.event_test.id, 'event_image')
+        self.assertEqual(Event.objects.get(id=self.event_test.id).image_variants, {})
+
+    def test_generate_image_variants_command(self):
+        Event.objects.filter(id=self.event_test.id).update(event_image='event_images/poster.png')
+        out = StringIO()
+        with patch('api.utils.generate_image_variants.delay') as delay:
+            call_command('generate_image_variants', stdout=out)
+        delay.assert_any_call('event', self.event_test.id, 'event_image')
+        self.assertIn("1 event image(s) without variants.", out.getvalue())
+
+    def test_event_detail_is_cached(self):
+        url = f'/api/events/{self.event_test.id}'
+        response = self.client.get(url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).json(), response.json())
 
+    def test_event_detail_cache_invalidated_by_writes(self):
+        url = f'/api/events/{self.event_test.id}'
+        self.client.get(url)
+        attendee = self.create_user("liker", "liker")
+        Like.objects.create(event=self.event_test, user=attendee, status='like')
+        Bookmarks.objects.create(event=self.event_test, attendee=attendee)
+        Ticket.objects.create(event=self.event_test, attendee=attendee)
+        data = self.client.get(url).json()
+        self.assertEqual(data['engagement'], {'total_likes': 1, 'total_bookmarks': 1})
+        self.assertEqual(data['current_attendees'], 1)
 
+        self.event_test.event_name = 'Renamed event'
+        self.event_test.save()
+        self.assertEqual(self.client.get(url).json()['event_name'], 'Renamed event')
+
+    def test_cached_event_has_per_user_engagement(self):
+        url = f'/api/events/{self.event_test.id}'
+        attendee = self.create_user("liker", "liker")
+        Like.objects.create(event=self.event_test, user=attendee, status='like')
+        anonymous = self.client.get(url).json()
+        engaged = self.client.get(url, headers={'Authorization': f'Bearer {self.get_token_for_user(attendee)}'}).json()
+        self.assertFalse(anonymous['user_engaged']['is_liked'])
+        self.assertTrue(engaged['user_engaged']['is_liked'])
+        self.assertEqual(self.client.get(url).json(), anonymous)
+
+    def test_event_list_cache_invalidated_by_new_event(self):
+        first = self.client.get('/api/events/events').json()
+        event = Event.objects.create(
+            event_name='Brand new event',
+            organizer=self.organizer,
+            event_create_date=timezone.now() - datetime.timedelta(minutes=1),
+            start_date_event=timezone.now() + datetime.timedelta(days=2),
+            end_date_event=timezone.now() + datetime.timedelta(days=3),
+            start_date_register=timezone.now() - datetime.timedelta(days=1),
+            end_date_register=timezone.now() + datetime.timedelta(days=1),
+            description='new',
+        )
+        ids = [item['id'] for item in self.client.get('/api/events/events').json()]
+        self.assertIn(event.id, ids)
+        self.assertEqual(len(ids), len(first) + 1)
+
+        event.delete()
+        ids = [item['id'] for item in self.client.get('/api/events/events').json()]
+        self.assertNotIn(event.id, ids)
+
+    def test_event_reads_fall_back_to_database_when_cache_is_down(self):
+        attendee = self.create_user("liker", "liker")
+        down = ConnectionError("Cache is unreachable")
+        with patch.object(cache, 'get_many', side_effect=down), patch.object(cache, 'get', side_effect=down), \
+                patch.object(cache, 'set', side_effect=down), patch.object(cache, 'add', side_effect=down), \
+                patch.object(cache, 'incr', side_effect=down), patch.object(cache, 'delete', side_effect=down):
+            Like.objects.create(event=self.event_test, user=attendee, status='like')
+            self.assertEqual(self.client.get('/api/events/events').status_code, 200)
+            detail = self.client.get(f'/api/events/{self.event_test.id}')
+            self.assertEqual(self.client.get('/api/events/facets').status_code, 200)
+            self.assertEqual(self.client.get(f'/api/events/{self.event_test.id}/availability').status_code, 200)
+        self.assertEqual(detail.status_code, 200)
+        self.assertEqual(detail.json()['engagement']['total_likes'], 1)
+
+    def test_user_engagement_is_cached(self):
+        attendee = self.create_user("engaged", "engaged")
+        headers = {'Authorization': f'Bearer {self.get_token_for_user(attendee)}'}
+        Like.objects.create(event=self.event_test, user=attendee, status='like')
+        self.client.get('/api/events/events', headers=headers)
+        # The token, the page, its events and the user's engagement all come from caches
+        with self.assertNumQueries(0):
+            events = {event['id']: event for event in self.client.get('/api/events/events', headers=headers).json()}
+        self.assertEqual(events[self.event_test.id]['user_engaged'],
+                         {'is_liked': True, 'is_bookmarked': False, 'is_applied': False})
+
+        Bookmarks.objects.create(event=self.event_test, attendee=attendee)
+        Ticket.objects.create(event=self.event_test, attendee=attendee)
+        Like.objects.get(event=self.event_test, user=attendee).delete()
+        events = {event['id']: event for event in self.client.get('/api/events/events', headers=headers).json()}
+        self.assertEqual(events[self.event_test.id]['user_engaged'],
+                         {'is_liked': False, 'is_bookmarked': True, 'is_applied': True})
+
+    def create_search_event(self, **fields):
+        defaults = dict(
+            event_name='Quarterly meetup',
+            organizer=self.organizer1,
+            event_create_date=timezone.now() - datetime.timedelta(minutes=1),
+            start_date_event=timezone.now() + datetime.timedelta(days=2),
+            end_date_event=timezone.now() + datetime.timedelta(days=3),
+            start_date_register=timezone.now() - datetime.timedelta(days=1),
+            end_date_register=timezone.now() + datetime.timedelta(days=1),
+            description='',
+        )
+        defaults.update(fields)
+        return Event.objects.create(**defaults)
+
+    def search(self, query, **params):
+        return self.client.get('/api/events/search', {'q': query, **params})
+
+    def test_search_events_by_every_field(self):
+        by_name = self.create_search_event(event_name='Xylophone workshop')
+        by_tags = self.create_search_event(tags='music,xylophone')
+        by_description = self.create_search_event(description='Bring your own xylophone.')
+        by_details = self.create_search_event(detailed_description='Xylophones are provided.')
+        response = self.search('xylophone')
+        self.assertEqual(response.status_code, 200)
+        ids = [event['id'] for event in response.json()]
+        self.assertEqual(set(ids), {by_name.id, by_tags.id, by_description.id, by_details.id})
+        # A match in the name ranks above one in the description
+        self.assertEqual(ids[0], by_name.id)
+        self.assertLess(ids.index(by_tags.id), ids.index(by_details.id))
+
+    def test_search_events_by_organizer_and_prefix(self):
+        self.organizer1.organizer_name = 'Zanzibar Collective'
+        self.organizer1.save()
+        ids = {event['id'] for event in self.search('zanzi').json()}
+        self.assertEqual(ids, {self.public_event.id, self.private_event.id})
+        self.assertEqual(self.search('zanzibar public').json()[0]['id'], self.public_event.id)
+
+    def test_search_index_follows_edits(self):
+        event = self.create_search_event(event_name='Origami evening')
+        self.assertEqual([item['id'] for item in self.search('origami').json()], [event.id])
+        event.event_name = 'Calligraphy evening'
+        event.save()
+        self.assertEqual(self.search('origami').json(), [])
+        self.assertEqual([item['id'] for item in self.search('calligraphy').json()], [event.id])
+        event.delete()
+        self.assertEqual(self.search('calligraphy').json(), [])
+
+    def test_search_skips_unpublished_events(self):
+        self.create_search_event(event_name='Marimbas', event_create_date=timezone.now() + datetime.timedelta(days=1))
+        self.assertEqual(self.search('marimbas').json(), [])
+
+    def test_search_pagination(self):
+        events = [self.create_search_event(event_name=f'Kayak trip {n}') for n in range(3)]
+        first = self.search('kayak', limit=2)
+        self.assertEqual(len(first.json()), 2)
+        second = self.search('kayak', limit=2, cursor=first['X-Next-Cursor'])
+        self.assertNotIn('X-Next-Cursor', second)
+        ids = [item['id'] for item in first.json() + second.json()]
+        self.assertEqual(sorted(ids), sorted(event.id for event in events))
+        self.assertEqual(self.search('kayak', cursor='not-a-cursor').status_code, 400)
+
+    def test_search_rejects_empty_query(self):
+        response = self.search(' "*" ')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.json())
+
+    def nearby(self, **params):
+        return self.client.get('/api/events/nearby', params)
+
+    def test_nearby_events_sorted_by_distance(self):
+        # Around Bangkok: Siam, Chatuchak, Ayutthaya and Chiang Mai
+        siam = self.create_search_event(latitude=13.7466, longitude=100.5393, end_date_event=timezone.now() + datetime.timedelta(days=3))
+        chatuchak = self.create_search_event(latitude=13.7999, longitude=100.5500)
+        ayutthaya = self.create_search_event(latitude=14.3532, longitude=100.5689)
+        self.create_search_event(latitude=18.7883, longitude=98.9853)
+        response = self.nearby(latitude=13.7563, longitude=100.5018, radius_km=10)
+        self.assertEqual(response.status_code, 200)
+        events = response.json()
+        self.assertEqual([event['id'] for event in events], [siam.id, chatuchak.id])
+        self.assertAlmostEqual(events[0]['distance_km'], 4.2, delta=0.2)
+        ids = [event['id'] for event in self.nearby(latitude=13.7563, longitude=100.5018, radius_km=50).json()]
+        self.assertEqual(ids, [siam.id, chatuchak.id])
+        self.assertNotIn(ayutthaya.id, ids)
+
+    def test_nearby_events_skip_ended_and_unlocated_events(self):
+        self.create_search_event(latitude=13.7466, longitude=100.5393, end_date_event=timezone.now() - datetime.timedelta(hours=1),
+                                 start_date_event=timezone.now() - datetime.timedelta(days=1))
+        self.create_search_event(latitude=0, longitude=0)
+        self.assertEqual(self.nearby(latitude=13.7563, longitude=100.5018).json(), [])
+        self.assertEqual(self.nearby(latitude=0, longitude=0).json(), [])
+
+    def test_nearby_events_follow_location_edits(self):
+        event = self.create_search_event()
+        self.assertIsNone(event.geohash)
+        event.latitude, event.longitude = 13.7466, 100.5393
+        event.save(update_fields=['latitude', 'longitude'])
+        self.assertEqual(Event.objects.get(pk=event.pk).geohash, encode_geohash(13.7466, 100.5393))
+        self.assertEqual([item['id'] for item in self.nearby(latitude=13.7563, longitude=100.5018).json()], [event.id])
+
+    def test_nearby_events_default_to_user_location(self):
+        event = self.create_search_event(latitude=13.7466, longitude=100.5393)
+        attendee = self.create_user("nearby", "nearby")
+        headers = {'Authorization': f'Bearer {self.get_token_for_user(attendee)}'}
+        self.assertEqual(self.client.get('/api/events/nearby', headers=headers).status_code, 400)
+        attendee.latitude, attendee.longitude = 13.7563, 100.5018
+        attendee.save()
+        response = self.client.get('/api/events/nearby', headers=headers)
+        self.assertEqual([item['id'] for item in response.json()], [event.id])
+        self.assertEqual(self.nearby().status_code, 400)
+
+    def test_nearby_events_pagination_and_validation(self):
+        events = [self.create_search_event(latitude=13.75 + n / 100, longitude=100.5) for n in range(3)]
+        first = self.nearby(latitude=13.75, longitude=100.5, limit=2)
+        second = self.nearby(latitude=13.75, longitude=100.5, limit=2, cursor=first['X-Next-Cursor'])
+        self.assertEqual([item['id'] for item in first.json() + second.json()], [event.id for event in events])
+        self.assertEqual(self.nearby(latitude=13.75, longitude=100.5, radius_km=500).status_code, 400)
+        self.assertEqual(self.nearby(latitude=91, longitude=100.5).status_code, 400)
+
+    def test_list_events_with_filters(self):
+        conference = self.create_search_event(category='CONFERENCE', is_free=False, ticket_price=100)
+        online = self.create_search_event(category='CONFERENCE', is_online=True,
+                                          start_date_event=timezone.now() + datetime.timedelta(days=20),
+                                          end_date_event=timezone.now() + datetime.timedelta(days=21))
+        ids = lambda **params: {item['id'] for item in self.client.get('/api/events/events', params).json()}
+        self.assertEqual(ids(category='CONFERENCE'), {conference.id, online.id})
+        self.assertEqual(ids(category='CONFERENCE', is_free='false'), {conference.id})
+        self.assertEqual(ids(is_online='true'), {online.id})
+        self.assertEqual(ids(category='CONFERENCE', start_after=(timezone.now() + datetime.timedelta(days=10)).isoformat()),
+                         {online.id})
+        self.assertEqual(ids(category='CONFERENCE', start_before=(timezone.now() + datetime.timedelta(days=10)).isoformat()),
+                         {conference.id})
+        self.assertEqual(self.client.get('/api/events/events', {'category': 'PICNIC'}).status_code, 422)
+
+    def test_filtered_list_cache_follows_edits(self):
+        event = self.create_search_event(category='CONFERENCE')
+        url = '/api/events/events?category=WORKSHOP'
+        self.assertEqual(self.client.get(url).json(), [])
+        event.category = 'WORKSHOP'
+        event.save()
+        self.assertEqual([item['id'] for item in self.client.get(url).json()], [event.id])
+
+    def test_event_facets(self):
+        self.create_search_event(category='CONFERENCE', is_free=False, ticket_price=100)
+        self.create_search_event(category='CONFERENCE', is_online=True)
+        with self.assertNumQueries(1):
+            facets = self.client.get('/api/events/facets').json()
+        total = Event.objects.filter(event_create_date__lte=timezone.now()).count()
+        self.assertEqual(facets['total'], total)
+        self.assertEqual(facets['category']['CONFERENCE'], 2)
+        self.assertEqual(facets['category']['WORKSHOP'], 0)
+        self.assertEqual(facets['price'], {'free': total - 1, 'paid': 1})
+        self.assertEqual(facets['attendance'], {'online': 1, 'in_person': total - 1})
+        with self.assertNumQueries(0):
+            self.client.get('/api/events/facets')
+        filtered = self.client.get('/api/events/facets', {'category': 'CONFERENCE'}).json()
+        self.assertEqual(filtered['total'], 2)
+        self.assertEqual(filtered['price'], {'free': 1, 'paid': 1})
+
+    def test_event_tags_are_normalized(self):
+        event = self.create_search_event(tags='Music, Jazz Night ,music,, live  MUSIC')
+        self.assertEqual(sorted(event.tag_set.values_list('name', flat=True)), ['jazz night', 'live music', 'music'])
+        event.tags = 'jazz night'
+        event.save()
+        self.assertEqual(list(event.tag_set.values_list('name', flat=True)), ['jazz night'])
+        self.assertTrue(Tag.objects.filter(name='music').exists())
+
+    def test_tagged_events(self):
+        jazz = self.create_search_event(tags='music,jazz')
+        rock = self.create_search_event(tags='music,rock')
+        self.create_search_event(tags='jazz', event_create_date=timezone.now() + datetime.timedelta(days=1))
+        ids = lambda url: [item['id'] for item in self.client.get(url).json()]
+        self.assertEqual(ids('/api/events/tagged/Music'), [rock.id, jazz.id])
+        self.assertEqual(ids('/api/events/tagged/jazz'), [jazz.id])
+        self.assertEqual(ids('/api/events/events?tag=rock'), [rock.id])
+
+        jazz.tags = 'music'
+        jazz.save()
+        self.assertEqual(ids('/api/events/tagged/jazz'), [])
+
+    def test_popular_tags(self):
+        self.create_search_event(tags='music,jazz')
+        self.create_search_event(tags='music,rock')
+        with self.assertNumQueries(1):
+            tags = self.client.get('/api/events/tags').json()
+        self.assertEqual(tags, [{'name': 'music', 'event_count': 2},
+                                {'name': 'jazz', 'event_count': 1},
+                                {'name': 'rock', 'event_count': 1}])
+        self.assertEqual(len(self.client.get('/api/events/tags', {'limit': 1}).json()), 1)
+
+    def test_email_domains_are_parsed_once(self):
+        parse_email_domains.cache_clear()
+        self.assertTrue(self.private_event.is_email_allowed('someone@KU.th'))
+        self.assertFalse(self.private_event.is_email_allowed('someone@gmail.com'))
+        self.assertEqual(parse_email_domains.cache_info().misses, 1)
+
+    def export_attendees(self, user, **params):
+        return self.client.get(f'/api/events/{self.event_test.id}/attendees/export', params,
+                               headers={'Authorization': f'Bearer {self.get_token_for_user(user)}'})
+
+    def read_export(self, response):
+        async def read():
+            return b''.join([chunk async for chunk in response.streaming_content]).decode()
+        return async_to_sync(read)()
+
+    def test_export_attendees_csv(self):
+        for n in range(3):
+            attendee = AttendeeUser.objects.create(username=f'exported{n}', first_name=f'Exported{n}', last_name='Doe',
+                                                   email=f'exported{n}@example.com')
+            Ticket.objects.create(event=self.event_test, attendee=attendee)
+        response = self.export_attendees(self.test_user)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn(f'event-{self.event_test.id}-attendees.csv', response['Content-Disposition'])
+        # The rows come from one joined query, however many attendees there are
+        with self.assertNumQueries(1):
+            content = self.read_export(response)
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual([row['first_name'] for row in rows], ['Exported0', 'Exported1', 'Exported2'])
+        self.assertEqual(rows[1]['email'], 'exported1@example.com')
+        self.assertEqual(rows[0]['ticket_status'], 'ACTIVE')
+
+    def test_export_attendees_ndjson(self):
+        attendee = self.create_user("exported", "Exported")
+        ticket = Ticket.objects.create(event=self.event_test, attendee=attendee)
+        response = self.export_attendees(self.test_user, format='ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = self.read_export(response).splitlines()
+        self.assertEqual(len(lines), 1)
+        row = json.loads(lines[0])
+        self.assertEqual(row['ticket_number'], ticket.ticket_number)
+        self.assertEqual(row['attendee_id'], attendee.id)
+
+    @patch('api.exports.EXPORT_CHUNK_SIZE', 2)
+    def test_export_attendees_sends_each_chunk_as_it_is_read(self):
+        for n in range(5):
+            attendee = AttendeeUser.objects.create(username=f'exported{n}', email=f'exported{n}@example.com')
+            Ticket.objects.create(event=self.event_test, attendee=attendee)
+        headers = {'Authorization': f'Bearer {self.get_token_for_user(self.test_user)}'}
+        read = []
+
+        def counted_csv_lines(columns, rows):
+            return csv_lines(columns, (read.append(row) or row for row in rows))
+
+        async def follow():
+            async with asgi_stream(f'/api/events/{self.event_test.id}/attendees/export', headers=headers) as (start, next_body):
+                self.assertEqual(start['status'], 200)
+                # The header and the first row go out before the other rows are read
+                first = await next_body()
+                self.assertTrue(first['more_body'])
+                self.assertEqual(len(first['body'].decode().splitlines()), 2)
+                self.assertEqual(len(read), 1)
+                chunks = [first]
+                while chunks[-1].get('more_body'):
+                    chunks.append(await next_body())
+                return b''.join(chunk.get('body', b'') for chunk in chunks).decode()
+
+        with patch('api.exports.csv_lines', side_effect=counted_csv_lines):
+            rows = list(csv.DictReader(io.StringIO(async_to_sync(follow)())))
+        self.assertEqual([row['username'] for row in rows], [f'exported{n}' for n in range(5)])
+
+    def test_streaming_routes_are_served_asynchronously(self):
+        # The ASGI handler collects a synchronous streaming body whole before sending it
+        urls = [f'/api/events/{self.event_test.id}/attendees/export',
+                f'/api/events/{self.event_test.id}/availability/stream',
+                f'/api/events/{self.event_test.id}/comments/stream']
+        headers = {'Authorization': f'Bearer {self.get_token_for_user(self.test_user)}'}
+        for url in urls:
+            response = self.client.get(url, headers=headers)
+            self.assertTrue(response.streaming, url)
+            self.assertTrue(response.is_async, url)
+            response.close()
+
+    def test_export_attendees_only_for_organizer(self):
+        self.assertEqual(self.export_attendees(self.test_user1).status_code, 403)
+        self.assertEqual(self.export_attendees(self.test_user, format='xlsx').status_code, 422)
+
+    def comment(self, content, parent=None, event=None):
+        return Comment.objects.create(event=event or self.event_test, user=self.test_user1, parent=parent, content=content)
+
+    def test_comment_threads_are_nested(self):
+        first = self.comment('first')
+        reply = self.comment('reply', first)
+        self.comment('nested reply', reply)
+        self.comment('second reply', first)
+        second = self.comment('second')
+        data = self.client.get(f"/api/events/{self.event_test.id}/comments").json()
+        self.assertEqual([thread['id'] for thread in data], [second.id, first.id])
+        thread = data[1]
+        self.assertEqual(thread['reply_count'], 3)
+        self.assertEqual([item['content'] for item in thread['replies']], ['second reply', 'reply'])
+        self.assertEqual(thread['replies'][1]['reply_count'], 1)
+        self.assertEqual(thread['replies'][1]['replies'][0]['content'], 'nested reply')
+        self.assertEqual(thread['user']['username'], self.test_user1.username)
+
+    def test_comment_threads_load_in_constant_queries(self):
+        url = f"/api/events/{self.event_test.id}/comments"
+        root = self.comment('root')
+        parent = root
+        for n in range(30):
+            parent = self.comment(f'deep {n}', parent)
+        for n in range(100):
+            self.comment(f'wide {n}', root)
+        self.comment('other event', event=self.public_event)
+        # The event, the page of top-level comments, every reply below them and their reaction counts
+        with self.assertNumQueries(4):
+            data = self.client.get(url).json()
+        self.assertEqual(data[0]['reply_count'], 130)
+        self.assertEqual(len(data[0]['replies']), 101)
+
+    def test_comment_threads_pagination(self):
+        threads = [self.comment(f'thread {n}') for n in range(3)]
+        self.comment('reply', threads[0])
+        url = f"/api/events/{self.event_test.id}/comments"
+        first = self.client.get(url, {'limit': 2})
+        second = self.client.get(url, {'limit': 2, 'cursor': first['X-Next-Cursor']})
+        self.assertEqual([item['id'] for item in first.json() + second.json()], [thread.id for thread in reversed(threads)])
+        self.assertEqual(second.json()[0]['reply_count'], 1)
+
+    def test_comment_threads_without_pagination_return_the_default_page(self):
+        threads = [self.comment(f'thread {n}') for n in range(KeysetPaginator.DEFAULT_LIMIT + 5)]
+        response = self.client.get(f"/api/events/{self.event_test.id}/comments")
+        self.assertEqual([item['id'] for item in response.json()],
+                         [thread.id for thread in reversed(threads)][:KeysetPaginator.DEFAULT_LIMIT])
+        self.assertTrue(response.has_header('X-Next-Cursor'))
@@ -21,6 +21,11 @@ class LikeTestAPI(LikeModelsTest):
         response = self.client.put(f'/api/likes/{999}/toggle-like', headers={'Authorization': f'Bearer {token}'})
         self.assertEqual(response.status_code, 404)
 
-        
-        
-        
\ No newline at end of file
+    def test_toggle_like_updates_like_count(self):
+        token = self.get_token_for_user(self.test_user)
+        self.client.put(f'/api/likes/{self.event_test.id}/toggle-like', headers={'Authorization': f'Bearer {token}'})
+        self.event_test.refresh_from_db()
+        self.assertEqual(self.event_test.like_count, 1)
+        self.client.put(f'/api/likes/{self.event_test.id}/toggle-like', headers={'Authorization': f'Bearer {token}'})
+        self.event_test.refresh_from_db()
+        self.assertEqual(self.event_test.like_count, 0)
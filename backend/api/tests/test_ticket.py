@@ -1,4 +1,20 @@
 from .utils.utils_ticket import TicketModelsTest, Organizer, Event, Ticket, fake, timezone,datetime,AttendeeUser,patch, ValidationError
+from api.utils import send_ticket_email, EmailDeliveryError, EMAIL_CLAIM_TIMEOUT, SMTPConnectionPool, send_reminder_emails, send_reminder_chunk, summarize_reminders
+from api.utils import TicketNotificationManager
+from api.email_templates import EmailTemplate
+from api.waiting_room import get_waiting_room, RedisWaitingRoom
+from .utils.utils_live import asgi_stream
+from api.live import AVAILABILITY_CHANNEL, RedisLiveHub
+from email.mime.text import MIMEText
+from unittest.mock import MagicMock
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.test import override_settings
+import asyncio
+import json
+import redis
+import smtplib
+import time
 import logging
 logging.disable(logging.CRITICAL)
 
@@ -73,6 +89,17 @@ class TicketTestAPI(TicketModelsTest):
         self.assertEqual(response.status_code, 400)
         self.assertIn('This event has reached the maximum number of attendees', response.json().get("error", ""))
 
+    def test_ticket_save_does_not_oversell(self):
+        self.event_test.max_attendee = 1
+        self.event_test.save()
+        Ticket.objects.create(attendee=self.create_user("first", "first"), event=self.event_test)
+        second_user = AttendeeUser.objects.create_user(username="second", password="password123", email="second@example.com")
+        with self.assertRaises(ValidationError):
+            Ticket.objects.create(attendee=second_user, event=self.event_test)
+        self.event_test.refresh_from_db()
+        self.assertEqual(self.event_test.attendee_count, 1)
+        self.assertEqual(Ticket.objects.filter(event=self.event_test).count(), 1)
+
         
         
     def test_user_not_falls_in_register_dates(self):
@@ -149,18 +176,40 @@ class TicketTestAPI(TicketModelsTest):
         event_test = Event.objects.create(
             event_name=fake.company(),
             organizer= self.become_organizer(self.test_user, "test_user"),
-            start_date_register=timezone.now(),  # Example for registration start
-            end_date_register=timezone.now() + datetime.timedelta(days = 1),  # Registration ends when the event starts
+            start_date_register=timezone.now() - datetime.timedelta(days = 2),  # Example for registration start
+            end_date_register=timezone.now() - datetime.timedelta(days = 1),  # The registration period is over
             start_date_event=timezone.now()+ datetime.timedelta(days = 2),
             end_date_event= timezone.now() + datetime.timedelta(days = 3),  # Ensure it ends after it starts
             max_attendee=100,
             description=fake.text(max_nb_chars=200),
-            status_registeration = "CLOSED",
+            status_registeration = "OPEN",
         )
         token = self.get_token_for_user(self.test_user)
         response = self.client.post(self.user_reserve_event_url + str(event_test.id) + '/register',  headers={'Authorization': f'Bearer {token}'})
         self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.json()['error'], f'Registration for this event is {event_test.status_registeration.lower()} now.')
+        self.assertEqual(response.json()['error'], 'Registration for this event is closed now.')
+
+    @patch("api.utils.send_ticket_email.delay")
+    def test_register_right_after_a_cancellation_frees_a_seat(self, mock_delay):
+        event_test = Event.objects.create(
+            event_name=fake.company(),
+            organizer= self.become_organizer(self.test_user, "test_user"),
+            start_date_register=timezone.now() - datetime.timedelta(days = 2),
+            end_date_register=timezone.now() + datetime.timedelta(days = 1),
+            start_date_event=timezone.now()+ datetime.timedelta(days = 2),
+            end_date_event= timezone.now() + datetime.timedelta(days = 3),
+            max_attendee=1,
+            description=fake.text(max_nb_chars=200),
+        )
+        first_user = self.create_user("first", "first")
+        second_user = AttendeeUser.objects.create_user(username="second", password="password123", email="second@example.com", birth_date='1995-06-15')
+        ticket = Ticket.objects.create(event=event_test, attendee=first_user)
+        # The stored status stays FULL until the periodic refresh
+        Event.objects.filter(id=event_test.id).update(status_registeration="FULL")
+        response = self.client.delete(f"/api/tickets/{ticket.id}/cancel", headers={'Authorization': f'Bearer {self.get_token_for_user(first_user)}'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(self.user_reserve_event_url + str(event_test.id) + '/register', headers={'Authorization': f'Bearer {self.get_token_for_user(second_user)}'})
+        self.assertEqual(response.status_code, 201)
         
 
     def test_invalid_register_private_event(self):
@@ -199,10 +248,14 @@ class TicketTestAPI(TicketModelsTest):
             description=fake.text(max_nb_chars=200),
         )
         ticket = Ticket.objects.create(event = event_test, attendee = user)
+        event_test.refresh_from_db()
+        self.assertEqual(event_test.attendee_count, 1)
         response = self.client.delete(f"/api/tickets/{ticket.id}/cancel" , headers={'Authorization': f'Bearer {token}'})
         self.assertEqual(response.status_code , 200)
         self.assertEqual(response.json()['success'], f"Ticket with ID {ticket.id} has been canceled.")
         self.assertFalse(Ticket.objects.filter(event = event_test, attendee = user).exists())
+        event_test.refresh_from_db()
+        self.assertEqual(event_test.attendee_count, 0)
         
         
     def test_invalid_cancel_ticket(self):
@@ -306,6 +359,153 @@ class TicketTestAPI(TicketModelsTest):
         
         
         
+    @patch("api.utils.send_ticket_email.delay")
+    def test_register_queues_confirmation_email_on_commit(self, mock_delay):
+        user = self.create_user("test", "test")
+        token = self.get_token_for_user(user)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post(self.user_reserve_event_url + str(self.event_test.id) + '/register', headers={'Authorization': f'Bearer {token}'})
+            mock_delay.assert_not_called()
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(callbacks)
+        mock_delay.assert_called_once()
+        self.assertEqual(mock_delay.call_args.kwargs['to_email'], user.email)
+        self.assertEqual(mock_delay.call_args.kwargs['ticket_id'], response.json()['id'])
+
+    @patch("api.utils.TicketEmailService.send_email", return_value=True)
+    def test_send_ticket_email_is_idempotent(self, mock_send_email):
+        ticket = Ticket.objects.create(event=self.event_test, attendee=self.test_user)
+        kwargs = {
+            'to_email': self.test_user.email,
+            'subject': 'Registration Confirmed',
+            'html_content': '<p>Confirmed</p>',
+            'idempotency_key': f'ticket-email:registration:{ticket.id}:{ticket.ticket_number}',
+            'ticket_id': ticket.id,
+        }
+        self.assertTrue(send_ticket_email.apply(kwargs=kwargs).get())
+        self.assertFalse(send_ticket_email.apply(kwargs=kwargs).get())
+        mock_send_email.assert_called_once()
+        ticket.refresh_from_db()
+        self.assertTrue(ticket.email_sent)
+
+    @patch("api.utils.TicketEmailService.send_email", return_value=True)
+    def test_send_ticket_email_claim_of_a_dead_worker_lapses(self, mock_send_email):
+        kwargs = {
+            'to_email': self.test_user.email,
+            'subject': 'Registration Confirmed',
+            'html_content': '<p>Confirmed</p>',
+            'idempotency_key': 'ticket-email:registration:crash-test',
+        }
+        # A worker claimed the email and died before sending it
+        cache.add(kwargs['idempotency_key'], 'sending', timeout=EMAIL_CLAIM_TIMEOUT)
+        self.assertEqual(send_ticket_email.apply(kwargs=kwargs).state, 'FAILURE')
+        mock_send_email.assert_not_called()
+
+        with patch('time.time', return_value=time.time() + EMAIL_CLAIM_TIMEOUT + 1):
+            self.assertTrue(send_ticket_email.apply(kwargs=kwargs).get())
+            self.assertFalse(send_ticket_email.apply(kwargs=kwargs).get())
+        mock_send_email.assert_called_once()
+
+    @patch("api.utils.TicketEmailService.send_email", return_value=False)
+    def test_send_ticket_email_retries_on_failure(self, mock_send_email):
+        result = send_ticket_email.apply(kwargs={
+            'to_email': self.test_user.email,
+            'subject': 'Ticket Cancelled',
+            'html_content': '<p>Cancelled</p>',
+            'idempotency_key': 'ticket-email:cancellation:retry-test',
+        })
+        self.assertEqual(result.state, 'FAILURE')
+        self.assertIsInstance(result.result, EmailDeliveryError)
+        self.assertEqual(mock_send_email.call_count, send_ticket_email.max_retries + 1)
+
+    @patch("api.utils.smtplib.SMTP")
+    def test_smtp_pool_reuses_connection(self, mock_smtp):
+        with SMTPConnectionPool(size=2, host='smtp.test', port=587, username='user', password='secret', use_tls=True) as pool:
+            for _ in range(3):
+                pool.send_message(MIMEText('Reminder'))
+        mock_smtp.assert_called_once_with('smtp.test', 587, timeout=pool.timeout)
+        server = mock_smtp.return_value
+        server.starttls.assert_called_once()
+        server.login.assert_called_once_with('user', 'secret')
+        self.assertEqual(server.send_message.call_count, 3)
+        server.quit.assert_called_once()
+
+    @patch("api.utils.smtplib.SMTP")
+    def test_smtp_pool_reconnects_after_disconnect(self, mock_smtp):
+        broken, fresh = MagicMock(), MagicMock()
+        broken.send_message.side_effect = smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        mock_smtp.side_effect = [broken, fresh]
+        pool = SMTPConnectionPool(size=1, host='smtp.test', port=25, username='', use_tls=False)
+        pool.send_message(MIMEText('Reminder'))
+        broken.close.assert_called_once()
+        fresh.send_message.assert_called_once()
+        fresh.login.assert_not_called()
+
+    @patch("api.utils.smtplib.SMTP")
+    def test_smtp_pool_discards_connection_closed_with_421(self, mock_smtp):
+        closing, fresh = MagicMock(), MagicMock()
+        closing.send_message.side_effect = smtplib.SMTPSenderRefused(421, b'Service not available', 'from@example.com')
+        mock_smtp.side_effect = [closing, fresh]
+        pool = SMTPConnectionPool(size=1, host='smtp.test', port=25, username='', use_tls=False)
+        pool.send_message(MIMEText('Reminder'))
+        pool.send_message(MIMEText('Reminder'))
+        closing.close.assert_called_once()
+        self.assertEqual(closing.send_message.call_count, 1)
+        self.assertEqual(fresh.send_message.call_count, 2)
+
+    @patch("api.utils.smtplib.SMTP")
+    def test_smtp_pool_drops_connection_returned_after_close(self, mock_smtp):
+        pool = SMTPConnectionPool(size=1, host='smtp.test', port=25, username='', use_tls=False)
+        with pool.connection() as server:
+            pool.close()
+        self.assertTrue(pool._idle.empty())
+        server.quit.assert_called_once()
+
+    @patch("api.utils.smtplib.SMTP")
+    def test_smtp_pool_does_not_retry_refused_recipient(self, mock_smtp):
+        server = mock_smtp.return_value
+        server.send_message.side_effect = smtplib.SMTPRecipientsRefused({'bad@example.com': (550, b'No such user')})
+        pool = SMTPConnectionPool(size=1, host='smtp.test', port=25, username='', use_tls=False)
+        with self.assertRaises(smtplib.SMTPRecipientsRefused):
+            pool.send_message(MIMEText('Reminder'))
+        self.assertEqual(server.send_message.call_count, 1)
+        server.close.assert_not_called()
+
+    def test_ticket_emails_render_event_and_attendee_fields(self):
+        user = AttendeeUser.objects.create_user(username="render", password="password123", email="render@example.com",
+                                                first_name="Ann", last_name="<Lee>")
+        ticket = Ticket.objects.create(event=self.event_test, attendee=user)
+        manager = TicketNotificationManager(ticket)
+        for html in (manager._generate_registration_html(), manager._generate_reminder_html(), manager._generate_cancellation_html()):
+            self.assertIn(f"Dear Ann &lt;Lee&gt;,", html)
+            self.assertIn(self.event_test.event_name, html)
+            self.assertNotIn("${", html)
+        self.assertIn(ticket.ticket_number, manager._generate_registration_html())
+        self.assertIn(self.event_test.start_date_event.strftime('%B %d, %Y %I:%M %p'), manager._generate_reminder_html())
+
+    def test_ticket_emails_keep_dollar_signs_of_event_fields(self):
+        self.event_test.event_name = "Entry costs $20"
+        self.event_test.description = "Bring $5 for ${full_name} and $"
+        self.event_test.save()
+        ticket = Ticket.objects.create(event=self.event_test, attendee=self.test_user)
+        manager = TicketNotificationManager(ticket)
+        for html in (manager._generate_registration_html(), manager._generate_reminder_html(), manager._generate_cancellation_html()):
+            self.assertIn("Entry costs $20", html)
+        self.assertIn("Bring $5 for ${full_name} and $", manager._generate_registration_html())
+
+    @patch("api.email_templates.EmailTemplate.bind", autospec=True, side_effect=EmailTemplate.bind)
+    def test_ticket_email_binds_event_once(self, mock_bind):
+        tickets = self.create_reminder_tickets(3)
+        for ticket in tickets:
+            TicketNotificationManager(ticket)._generate_reminder_html()
+        self.assertEqual(mock_bind.call_count, 1)
+        event = tickets[0].event
+        event.event_name = "Renamed event"
+        event.save()
+        html = TicketNotificationManager(Ticket.objects.get(id=tickets[0].id))._generate_reminder_html()
+        self.assertEqual(mock_bind.call_count, 2)
+        self.assertIn("Renamed event", html)
+
     def test_ticket_number_generation_on_save(self):
         # Create a ticket without a ticket number and save it
         ticket = Ticket(event=self.event_test, attendee=self.test_user)
@@ -329,6 +529,58 @@ class TicketTestAPI(TicketModelsTest):
         response = self.client.post(f'/api/tickets/{ticket.id}/send-reminder',  headers={'Authorization': f'Bearer {self.get_token_for_user(self.test_user)}'})
         self.assertEqual(response.status_code, 200)
         
+    def create_reminder_tickets(self, count):
+        event = Event.objects.create(
+            event_name=fake.company(),
+            organizer=self.organizer,
+            start_date_register=timezone.now() - datetime.timedelta(days=2),
+            end_date_register=timezone.now() + datetime.timedelta(hours=1),
+            start_date_event=timezone.now() + datetime.timedelta(days=1),
+            end_date_event=timezone.now() + datetime.timedelta(days=2),
+            max_attendee=100,
+            description=fake.text(max_nb_chars=200),
+        )
+        return [
+            Ticket.objects.create(
+                event=event, email_sent=True,
+                attendee=AttendeeUser.objects.create_user(username=f"reminder{index}", password="password123", email=f"reminder{index}@example.com"),
+            )
+            for index in range(count)
+        ]
+
+    @patch("api.utils.chord")
+    def test_send_reminder_emails_dispatches_chunks(self, mock_chord):
+        tickets = self.create_reminder_tickets(3)
+        result = send_reminder_emails(chunk_size=2)
+        self.assertEqual(result, {'tickets': 3, 'chunks': 2})
+        chunks = [signature.args[0] for signature in mock_chord.call_args.args[0]]
+        self.assertEqual(chunks, [[tickets[0].id, tickets[1].id], [tickets[2].id]])
+        mock_chord.return_value.assert_called_once()
+
+    @patch("api.utils.TicketEmailService.send_email", return_value=True)
+    def test_send_reminder_chunk_sends_and_clears_flag(self, mock_send_email):
+        tickets = self.create_reminder_tickets(3)
+        result = send_reminder_chunk.apply(args=[[ticket.id for ticket in tickets]]).get()
+        self.assertEqual(result, {'sent': 3, 'failed': 0})
+        self.assertEqual(mock_send_email.call_count, 3)
+        self.assertFalse(Ticket.objects.filter(id__in=[ticket.id for ticket in tickets], email_sent=True).exists())
+        self.assertEqual(summarize_reminders([result, {'sent': 1, 'failed': 2}]), {'sent': 4, 'failed': 2})
+
+    @patch("api.utils.TicketEmailService.send_email", return_value=False)
+    def test_send_reminder_chunk_retries_failed_reminders(self, mock_send_email):
+        tickets = self.create_reminder_tickets(1)
+        result = send_reminder_chunk.apply(args=[[tickets[0].id]]).get()
+        self.assertEqual(result, {'sent': 0, 'failed': 1})
+        self.assertEqual(mock_send_email.call_count, send_reminder_chunk.max_retries + 1)
+
+    def test_send_reminder_chunk_counts_reminders_sent_before_a_retry(self):
+        tickets = self.create_reminder_tickets(3)
+        # The last reminder fails on the first attempt only
+        with patch("api.utils.TicketEmailService.send_email", side_effect=[True, True, False, True]) as mock_send_email:
+            result = send_reminder_chunk.apply(args=[[ticket.id for ticket in tickets]]).get()
+        self.assertEqual(result, {'sent': 3, 'failed': 0})
+        self.assertEqual(mock_send_email.call_count, 4)
+
     @patch("api.models.Ticket.objects.get")
     def test_cancel_ticket_general_exception(self, mock_get):
 
@@ -353,24 +605,182 @@ class TicketTestAPI(TicketModelsTest):
         
         # Check that the correct error message is in the exception
         self.assertIn("Ticket is already cancelled.", str(e.exception))
-        
-    
-   
 
-        
-        
-        
-        
-        
-    
+    def test_event_availability(self):
+        user = self.create_user("test", "test")
+        token = self.get_token_for_user(user)
+        url = f"/api/events/{self.event_test.id}/availability"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['attendee_count'], 0)
+        self.assertEqual(response.json()['available_spot'], self.event_test.max_attendee)
+        self.assertEqual(response.json()['status_registeration'], 'OPEN')
+        self.assertIn('max-age=', response['Cache-Control'])
 
-        
-        
-        
-        
-        
-        
-        
-        
-    
-        
\ No newline at end of file
+        # Watchers are served from the cache, and a current copy is not sent again
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        self.client.post(self.user_reserve_event_url + str(self.event_test.id) + '/register', headers={'Authorization': f'Bearer {token}'})
+        updated = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(updated.status_code, 200)
+        self.assertEqual(updated.json()['attendee_count'], 1)
+        self.assertEqual(updated.json()['available_spot'], self.event_test.max_attendee - 1)
+        self.assertEqual(self.client.get('/api/events/0/availability').status_code, 404)
+
+    @override_settings(LIVE_STREAM_SECONDS=2, LIVE_KEEPALIVE_SECONDS=1)
+    @patch("api.utils.send_ticket_email.delay")
+    def test_event_availability_stream(self, mock_delay):
+        user = self.create_user("test", "test")
+        headers = {'Authorization': f'Bearer {self.get_token_for_user(user)}'}
+        response = self.client.get(f"/api/events/{self.event_test.id}/availability/stream")
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+
+        def write(method, url):
+            with self.captureOnCommitCallbacks(execute=True):
+                return getattr(self.client, method)(url, headers=headers).json()
+
+        async def next_availability():
+            name, data = (await anext(stream)).decode().strip().split('\n')
+            self.assertEqual(name, 'event: availability')
+            return json.loads(data.removeprefix('data: '))
+
+        async def follow():
+            await anext(stream)
+            self.assertEqual((await next_availability())['attendee_count'], 0)
+            ticket = await sync_to_async(write)('post', self.user_reserve_event_url + str(self.event_test.id) + '/register')
+            availability = await next_availability()
+            self.assertEqual((availability['attendee_count'], availability['available_spot']), (1, self.event_test.max_attendee - 1))
+            await sync_to_async(write)('delete', f"/api/tickets/{ticket['id']}/cancel")
+            self.assertEqual((await next_availability())['attendee_count'], 0)
+            self.assertEqual({frame async for frame in stream}, {b': keepalive\n\n'})
+
+        async_to_sync(follow)()
+
+    @override_settings(LIVE_STREAM_SECONDS=5, LIVE_KEEPALIVE_SECONDS=5)
+    @patch("api.utils.send_ticket_email.delay")
+    def test_event_availability_stream_sends_each_frame_as_it_happens(self, mock_delay):
+        user = self.create_user("test", "test")
+        headers = {'Authorization': f'Bearer {self.get_token_for_user(user)}'}
+
+        def register():
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(self.user_reserve_event_url + str(self.event_test.id) + '/register', headers=headers)
+
+        async def follow():
+            async with asgi_stream(f"/api/events/{self.event_test.id}/availability/stream") as (start, next_body):
+                self.assertEqual(start['status'], 200)
+                self.assertEqual((await next_body())['body'], b'retry: 3000\n\n')
+                self.assertIn(b'"attendee_count": 0', (await next_body())['body'])
+                await sync_to_async(register)()
+                # The change reaches the client while the response is still open
+                message = await next_body()
+                self.assertTrue(message['more_body'])
+                self.assertIn(b'event: availability', message['body'])
+                self.assertIn(b'"attendee_count": 1', message['body'])
+
+        async_to_sync(follow)()
+
+    @override_settings(LIVE_STREAM_SECONDS=5, LIVE_KEEPALIVE_SECONDS=5)
+    def test_event_availability_stream_ends_when_redis_connection_is_lost(self):
+        lost = asyncio.Event()
+
+        class PubSub:
+            async def subscribe(self, channel):
+                pass
+
+            async def unsubscribe(self, channel):
+                pass
+
+            async def listen(self):
+                await lost.wait()
+                raise redis.ConnectionError("Connection closed by server.")
+                yield
+
+            async def aclose(self):
+                pass
+
+        client = MagicMock()
+        client.pubsub.return_value = PubSub()
+        client.aclose = MagicMock(side_effect=lambda: asyncio.sleep(0))
+        hub = RedisLiveHub('redis://localhost:1/0')
+        channel = AVAILABILITY_CHANNEL.format(id=self.event_test.id)
+
+        async def follow():
+            async with asgi_stream(f"/api/events/{self.event_test.id}/availability/stream") as (start, next_body):
+                await next_body()
+                await next_body()
+                self.assertEqual(hub.subscriber_count(channel), 1)
+                lost.set()
+                # The response ends, so the EventSource of the client reconnects
+                self.assertFalse((await next_body()).get('more_body'))
+                self.assertEqual(hub.subscriber_count(channel), 0)
+                self.assertIsNone(hub._pubsub)
+
+        with patch("api.live._hub", hub), patch("api.live.aioredis.Redis.from_url", return_value=client):
+            async_to_sync(follow)()
+
+    @override_settings(WAITING_ROOM_RATE=2)
+    @patch("api.utils.send_ticket_email.delay")
+    def test_waiting_room_admits_at_rate(self, mock_delay):
+        event_test = Event.objects.create(
+            event_name=fake.company(),
+            organizer=self.organizer,
+            start_date_register=timezone.now() - datetime.timedelta(minutes=1),
+            end_date_register=timezone.now() + datetime.timedelta(days=1),
+            start_date_event=timezone.now() + datetime.timedelta(days=2),
+            end_date_event=timezone.now() + datetime.timedelta(days=3),
+            max_attendee=100,
+        )
+        users = [AttendeeUser.objects.create(username=f"user{n}", email=f"user{n}@example.com", birth_date='1995-06-15')
+                 for n in range(4)]
+        tokens = [self.get_token_for_user(user) for user in users]
+        register_url = self.user_reserve_event_url + str(event_test.id) + '/register'
+        queue_url = self.user_reserve_event_url + str(event_test.id) + '/queue'
+        clock = [1000.0]
+
+        with patch.object(get_waiting_room(), 'clock', lambda: clock[0]):
+            responses = [self.client.post(register_url, headers={'Authorization': f'Bearer {token}'}) for token in tokens]
+            self.assertEqual([response.status_code for response in responses], [201, 201, 429, 429])
+            self.assertEqual(responses[3].json()['state'], 'waiting')
+            self.assertEqual(responses[3].json()['position'], 2)
+            self.assertEqual(responses[3].json()['estimated_wait_seconds'], 1)
+            self.assertEqual(responses[3]['Retry-After'], '1')
+
+            status = self.client.get(queue_url, headers={'Authorization': f'Bearer {tokens[2]}'}).json()
+            self.assertEqual((status['state'], status['position'], status['queue_length']), ('waiting', 1, 2))
+
+            # A second later the bucket lets the next two users in
+            clock[0] += 1
+            status = self.client.get(queue_url, headers={'Authorization': f'Bearer {tokens[2]}'}).json()
+            self.assertEqual((status['state'], status['queue_length']), ('admitted', 0))
+            self.assertEqual(self.client.post(register_url, headers={'Authorization': f'Bearer {tokens[3]}'}).status_code, 201)
+        event_test.refresh_from_db()
+        self.assertEqual(event_test.attendee_count, 3)
+
+    @patch("api.utils.send_ticket_email.delay")
+    def test_waiting_room_lets_registrations_through_when_redis_is_down(self, mock_delay):
+        event_test = Event.objects.create(
+            event_name=fake.company(),
+            organizer=self.organizer,
+            start_date_register=timezone.now() - datetime.timedelta(minutes=1),
+            end_date_register=timezone.now() + datetime.timedelta(days=1),
+            start_date_event=timezone.now() + datetime.timedelta(days=2),
+            end_date_event=timezone.now() + datetime.timedelta(days=3),
+            max_attendee=100,
+        )
+        headers = {'Authorization': f'Bearer {self.get_token_for_user(self.create_user("test", "test"))}'}
+        # Nothing listens on this port
+        with patch("api.waiting_room._room", RedisWaitingRoom('redis://localhost:1/0')):
+            response = self.client.post(self.user_reserve_event_url + str(event_test.id) + '/register', headers=headers)
+            self.assertEqual(response.status_code, 201)
+            status = self.client.get(self.user_reserve_event_url + str(event_test.id) + '/queue', headers=headers).json()
+            self.assertEqual(status['state'], 'open')
+
+    def test_waiting_room_only_while_registration_opens(self):
+        token = self.get_token_for_user(self.create_user("test", "test"))
+        queue_url = self.user_reserve_event_url + str(self.event_test.id) + '/queue'
+        response = self.client.post(queue_url, headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['state'], 'open')
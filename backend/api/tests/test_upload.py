@@ -0,0 +1,74 @@
+from .utils.utils_upload import UploadModelsTest, Event, Organizer, AttendeeUser, Stubber, ANY, get_s3_client, settings
+
+
+class UploadTestAPI(UploadModelsTest):
+
+    def test_presign_event_image(self):
+        response = self.presign(self.test_user, 'event_image', self.event_test.id)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data['key'].startswith('event_images/'))
+        self.assertEqual(data['fields']['key'], data['key'])
+        self.assertEqual(data['fields']['Content-Type'], 'image/png')
+        self.assertIn('policy', data['fields'])
+        self.assertIn(settings.AWS_STORAGE_BUCKET_NAME, data['url'])
+
+    def test_presign_rejects_invalid_file(self):
+        response = self.presign(self.test_user, 'profile_picture', content_type='image/gif')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'Invalid file type. Only JPEG and PNG are allowed.')
+        response = self.presign(self.test_user, 'profile_picture', size=11 * 1024 * 1024)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'File size exceeds the limit of 10.0 MB.')
+
+    def test_presign_for_someone_elses_event(self):
+        response = self.presign(self.other_user, 'event_image', self.event_test.id)
+        self.assertEqual(response.status_code, 403)
+        response = self.presign(self.other_user, 'logo', self.organizer.id)
+        self.assertEqual(response.status_code, 403)
+
+    def test_complete_upload_sets_logo(self):
+        data = self.presign(self.test_user, 'logo', self.organizer.id).json()
+        with Stubber(get_s3_client()) as stubber:
+            stubber.add_response('head_object', {'ContentLength': 1024, 'ContentType': 'image/png'},
+                                 {'Bucket': settings.AWS_STORAGE_BUCKET_NAME, 'Key': data['key']})
+            stubber.add_response('delete_object', {}, {'Bucket': settings.AWS_STORAGE_BUCKET_NAME, 'Key': 'logos/old.png'})
+            response = self.complete(self.test_user, data['upload_token'])
+            stubber.assert_no_pending_responses()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['message'], 'Upload successful')
+        self.assertEqual(Organizer.objects.get(id=self.organizer.id).logo.name, data['key'])
+
+    def test_complete_upload_sets_profile_picture(self):
+        data = self.presign(self.test_user, 'profile_picture').json()
+        with Stubber(get_s3_client()) as stubber:
+            stubber.add_response('head_object', {'ContentLength': 1024, 'ContentType': 'image/jpeg'}, {'Bucket': ANY, 'Key': data['key']})
+            response = self.complete(self.test_user, data['upload_token'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(AttendeeUser.objects.get(id=self.test_user.id).profile_picture.name, data['key'])
+
+    def test_complete_upload_rejects_invalid_object(self):
+        data = self.presign(self.test_user, 'event_image', self.event_test.id).json()
+        with Stubber(get_s3_client()) as stubber:
+            stubber.add_response('head_object', {'ContentLength': 1024, 'ContentType': 'text/html'}, {'Bucket': ANY, 'Key': data['key']})
+            stubber.add_response('delete_object', {}, {'Bucket': ANY, 'Key': data['key']})
+            response = self.complete(self.test_user, data['upload_token'])
+            stubber.assert_no_pending_responses()
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Event.objects.get(id=self.event_test.id).event_image)
+
+    def test_complete_upload_missing_object(self):
+        data = self.presign(self.test_user, 'event_image', self.event_test.id).json()
+        with Stubber(get_s3_client()) as stubber:
+            stubber.add_client_error('head_object', service_error_code='404', http_status_code=404)
+            response = self.complete(self.test_user, data['upload_token'])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'Uploaded file not found.')
+
+    def test_complete_upload_invalid_token(self):
+        data = self.presign(self.test_user, 'profile_picture').json()
+        response = self.complete(self.test_user, data['upload_token'] + 'x')
+        self.assertEqual(response.status_code, 400)
+        response = self.complete(self.other_user, data['upload_token'])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'Invalid or expired upload token.')
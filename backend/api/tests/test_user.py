@@ -11,6 +11,8 @@ from unittest.mock import Mock, patch, MagicMock
 from google.oauth2 import id_token
 from django.utils import timezone
 from requests import Request
+from api.auth import VerifiedTokenCache
+import time
 
 User = get_user_model() 
 
@@ -271,3 +273,34 @@ class UserAPITests(UserModelsTest):
         mock_send_verification_email.assert_called_once()
 
         
+
+    def test_verified_token_is_cached(self):
+        token = self.get_token_for_user(self.test_user)
+        headers = {"Authorization": f"Bearer {token}"}
+        self.client.get('/api/users/profile', headers=headers)
+        with patch('ninja_jwt.authentication.JWTBaseAuthentication.get_validated_token') as validate:
+            response = self.client.get('/api/users/profile', headers=headers)
+        validate.assert_not_called()
+        self.assertEqual(response.json()['username'], self.test_user.username)
+
+    def test_deactivated_user_token_is_forgotten(self):
+        user = self.create_user("test", "test", "test")
+        headers = {"Authorization": f"Bearer {self.get_token_for_user(user)}"}
+        self.assertEqual(self.client.get('/api/users/profile', headers=headers).status_code, 200)
+        user.is_active = False
+        user.save()
+        self.assertEqual(self.client.get('/api/users/profile', headers=headers).status_code, 401)
+
+    def test_verified_token_cache_eviction_and_expiry(self):
+        tokens = VerifiedTokenCache(maxsize=2, ttl=60)
+        tokens.set('a', self.test_user)
+        tokens.set('b', self.test_user)
+        self.assertIsNotNone(tokens.get('a'))
+        tokens.set('c', self.test_user)
+        self.assertIsNone(tokens.get('b'))
+        self.assertEqual(tokens.get('a').pk, self.test_user.pk)
+        self.assertIsNot(tokens.get('a'), tokens.get('a'))
+        tokens.set('expired', self.test_user, token_expires_at=time.time() - 1)
+        self.assertIsNone(tokens.get('expired'))
+        tokens.forget_user(self.test_user.pk)
+        self.assertIsNone(tokens.get('a'))
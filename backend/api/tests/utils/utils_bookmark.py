@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.utils import timezone
 from api.models import AttendeeUser, Organizer, Event, Ticket, Bookmarks
@@ -18,6 +19,7 @@ class BookmarkModelsTest(TestCase):
         """
         Set up initial test data for models.
         """
+        cache.clear()
         self.show_bookmark_url = "/api/bookmarks/my-favorite/"
         self.test_user = AttendeeUser.objects.create_user(
             username='attendeeuser3',
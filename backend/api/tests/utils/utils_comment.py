@@ -1,7 +1,8 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.utils import timezone
 from django.http import Http404
-from api.models import AttendeeUser, Organizer, Event, Ticket, Bookmarks, Comment
+from api.models import AttendeeUser, Organizer, Event, Ticket, Bookmarks, Comment, CommentReaction
 from unittest.mock import patch
 from datetime import datetime
 from ninja.testing import TestClient
@@ -20,6 +21,7 @@ class CommentModelsTest(TestCase):
         """
         Set up initial test data for models.
         """
+        cache.clear()
         self.write_comment_url = '/api/comments/write-comment/'
         self.test_user = AttendeeUser.objects.create_user(
             username='attendeeuser3',
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.utils import timezone
 from api.models import AttendeeUser, Organizer, Event, Ticket
@@ -13,6 +14,7 @@ from botocore.exceptions import ClientError
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.exceptions import ValidationError
 from api.urls import api
+from api.storage import reset_s3_client
 ALLOWED_IMAGE_TYPES = ['image/jpeg', 'image/png', 'image/jpg']
 
 fake = Faker()
@@ -24,6 +26,10 @@ class EventModelsTest(TestCase):
         """
         Set up initial test data for models.
         """ 
+        cache.clear()
+        # Tests patch boto3.client, so each one must build its own shared S3 client
+        reset_s3_client()
+        self.addCleanup(reset_s3_client)
         self.event_create_url = '/create-event'
         self.organizer_get_events = '/my-events'
         self.list_event_url = '/events'
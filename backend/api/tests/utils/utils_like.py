@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.utils import timezone
 from api.models import AttendeeUser, Organizer, Event, Ticket, Bookmarks, Like
@@ -19,6 +20,7 @@ class LikeModelsTest(TestCase):
         """
         Set up initial test data for models.
         """
+        cache.clear()
         
         self.test_user = AttendeeUser.objects.create_user(
             username='attendeeuser3',
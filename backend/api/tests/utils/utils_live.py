@@ -0,0 +1,56 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
+
+
+@asynccontextmanager
+async def asgi_stream(path: str, query_string: str = '', headers: Optional[Dict[str, str]] = None):
+    """
+    Open a GET request through the ASGI application, the way the ASGI server serves it.
+
+    Like the test client, the request keeps the database connection of the test open,
+    so it sees the rows of the test transaction.
+
+    Args:
+        path (str): The path of the request.
+        query_string (str): The encoded query string.
+        headers (Optional[Dict[str, str]]): Extra request headers.
+
+    Yields:
+        Tuple[dict, Callable]: The `http.response.start` message, and a coroutine function
+        returning the next `http.response.body` message sent to the client, which fails if
+        none is sent within `timeout` seconds.
+    """
+    messages = asyncio.Queue()
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # The client stays connected
+        await asyncio.Future()
+
+    async def next_body(timeout: float = 1):
+        return await asyncio.wait_for(messages.get(), timeout)
+
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query_string.encode(), 'root_path': '',
+        'headers': [(b'host', b'testserver'), *((name.lower().encode(), value.encode()) for name, value in (headers or {}).items())], 'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+    }
+    request_started.disconnect(close_old_connections)
+    request_finished.disconnect(close_old_connections)
+    handler = asyncio.ensure_future(ASGIHandler()(scope, receive, messages.put))
+    try:
+        yield await next_body(), next_body
+    finally:
+        handler.cancel()
+        await asyncio.gather(handler, return_exceptions=True)
+        request_started.connect(close_old_connections)
+        request_finished.connect(close_old_connections)
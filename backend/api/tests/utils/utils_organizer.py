@@ -1,9 +1,11 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.utils import timezone
 from api.models import AttendeeUser, Organizer, Event, Ticket
 from datetime import datetime
 from ninja.testing import TestClient
 from api.urls import api
+from api.storage import reset_s3_client
 from ninja_jwt.tokens import RefreshToken
 from faker import Faker
 from unittest.mock import patch, Mock, MagicMock
@@ -23,6 +25,10 @@ class OrganizerModelsTest(TestCase):
         """
         Set up initial test data for models.
         """
+        cache.clear()
+        # Tests patch boto3.client, so each one must build its own shared S3 client
+        reset_s3_client()
+        self.addCleanup(reset_s3_client)
         
         self.apply_organizer_url = '/api/organizers/apply-organizer'
         self.delete_event_url = f"/api/organizers/delete-event/"
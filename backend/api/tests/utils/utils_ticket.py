@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.utils import timezone
 from api.models import AttendeeUser, Organizer, Event, Ticket
@@ -5,6 +6,7 @@ from unittest.mock import patch
 from datetime import datetime
 from ninja.testing import TestClient
 from api.urls import api
+from api.waiting_room import get_waiting_room
 from ninja_jwt.tokens import RefreshToken
 from django.core.exceptions import ValidationError
 from faker import Faker
@@ -20,6 +22,8 @@ class TicketModelsTest(TestCase):
         """
         Set up initial test data for models.
         """
+        cache.clear()
+        get_waiting_room().clear()
         self.user_list_event_url = "/api/tickets/user/"
         self.user_reserve_event_url = '/api/tickets/event/'
         self.user_cancel_event_url = '/api/tickets/'
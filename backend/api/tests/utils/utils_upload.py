@@ -0,0 +1,81 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from django.conf import settings
+from api.models import AttendeeUser, Organizer, Event
+from ninja.testing import TestClient
+from ninja_jwt.tokens import RefreshToken
+from botocore.stub import Stubber, ANY
+from faker import Faker
+from api.urls import api
+from api.storage import get_s3_client, reset_s3_client
+import datetime
+import json
+
+fake = Faker()
+
+class UploadModelsTest(TestCase):
+    client = TestClient(api)
+
+    def setUp(self):
+        """
+        Set up initial test data for models.
+        """
+        cache.clear()
+        reset_s3_client()
+        self.addCleanup(reset_s3_client)
+        self.presign_url = '/api/uploads/presign'
+        self.complete_url = '/api/uploads/complete'
+        self.test_user = AttendeeUser.objects.create_user(
+            username='uploader',
+            password='password123',
+            first_name='Jane',
+            last_name='Doe',
+            birth_date='1995-06-15',
+            email='uploader@example.com'
+        )
+        self.other_user = AttendeeUser.objects.create_user(
+            username='other',
+            password='password123',
+            email='other@example.com'
+        )
+        self.organizer = Organizer.objects.create(user=self.test_user, organizer_name='uploader',
+                                                  email='uploader@example.com', logo='logos/old.png')
+        self.event_test = Event.objects.create(
+            event_name=fake.company(),
+            organizer=self.organizer,
+            start_date_event=timezone.now(),
+            end_date_event=timezone.now() + datetime.timedelta(days=1),
+            start_date_register=timezone.now() - datetime.timedelta(days=2),
+            end_date_register=timezone.now() + datetime.timedelta(days=3),
+            max_attendee=100,
+            description=fake.text(max_nb_chars=200),
+        )
+
+    def get_token_for_user(self, user):
+        """Helper method to generate a JWT token for the test user"""
+        refresh = RefreshToken.for_user(user)
+        return str(refresh.access_token)
+
+    def presign(self, user, target, target_id=None, content_type='image/png', size=1024):
+        data = {
+            'target': target,
+            'target_id': target_id,
+            'filename': 'picture.png',
+            'content_type': content_type,
+            'size': size,
+        }
+        return self.client.post(
+            self.presign_url,
+            data=json.dumps(data),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {self.get_token_for_user(user)}'
+        )
+
+    def complete(self, user, upload_token):
+        return self.client.post(
+            self.complete_url,
+            data=json.dumps({'upload_token': upload_token}),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {self.get_token_for_user(user)}'
+        )
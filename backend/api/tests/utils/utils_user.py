@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.utils import timezone
 from api.models import AttendeeUser, Organizer, Event, Ticket
@@ -7,6 +8,7 @@ from ninja_jwt.tokens import RefreshToken
 from faker import Faker
 from django.conf import settings
 from api.urls import api
+from api.storage import reset_s3_client
 from google.oauth2 import id_token
 from google.auth.transport import requests
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -24,6 +26,10 @@ class UserModelsTest(TestCase):
         """
         Set up initial test data for models.
         """
+        cache.clear()
+        # Tests patch boto3.client, so each one must build its own shared S3 client
+        reset_s3_client()
+        self.addCleanup(reset_s3_client)
         self.user_create_url = '/register'
         self.user_login_url = '/login'
         self.user_profile_url = '/profile'
@@ -8,6 +8,7 @@ from api.views.bookmarks import BookmarkAPI
 from api.views.like import LikeAPI
 from api.views.comment import CommentAPI
 from api.views.organizer import OrganizerAPI
+from api.views.upload import UploadAPI
 from django.conf import settings
 from django.conf.urls.static import static
 
@@ -20,6 +21,7 @@ api.register_controllers(TicketAPI)
 api.register_controllers(LikeAPI)
 api.register_controllers(CommentAPI)
 api.register_controllers(BookmarkAPI)
+api.register_controllers(UploadAPI)
 
 urlpatterns = [
     path("", api.urls),  # Prefix all API routes with /api/
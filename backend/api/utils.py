@@ -1,5 +1,10 @@
 from django.conf import settings
-from celery import shared_task
+from django.core.cache import cache
+from django.db import transaction
+from celery import chord, shared_task
+from botocore.exceptions import ClientError
+from django.apps import apps
+from PIL import UnidentifiedImageError
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from django.contrib.auth.tokens import default_token_generator
@@ -10,12 +15,32 @@ from datetime import timedelta
 from celery import shared_task
 from django.utils import timezone
 from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List
 import logging
+import queue
 import smtplib
+import threading
+
+from api.email_templates import render_ticket_email
+from api.images import IMAGE_VARIANT_FIELDS, IMAGE_VARIANT_FORMATS, invalidate_image_owner, render_variants, variant_key, variant_keys
+from api.storage import ImageUploadService
 
 
 logger = logging.getLogger(__name__)
 
+# How long a delivered email is remembered, so a redelivered task does not send it twice
+EMAIL_IDEMPOTENCY_TIMEOUT = 60 * 60 * 24 * 7
+# How long an email being sent stays claimed, so a worker that died mid-send only delays the retries
+EMAIL_CLAIM_TIMEOUT = 60 * 2
+# How many reminders a chunk sends between progress updates
+REMINDER_PROGRESS_INTERVAL = 50
+
+
+class EmailDeliveryError(Exception):
+    """Raised when an email could not be delivered and the sending task should retry."""
+
 
 class EmailVerification:
     @staticmethod
@@ -74,11 +99,159 @@ class EmailVerification:
             logger.info("Email sent successfully to %s", user.email)
             
 
+class SMTPConnectionPool:
+    """
+    A small, thread-safe pool of long-lived authenticated SMTP connections.
+
+    Connections are opened lazily (up to `size`) and reused for every message, so the
+    TCP connect, STARTTLS handshake and login happen once per connection instead of once
+    per email. A connection that fails while sending is dropped and replaced, and the
+    message is retried once on the new connection.
+    """
+    def __init__(self, size: int = None, host: str = None, port: int = None,
+                 username: str = None, password: str = None, use_tls: bool = None, timeout: int = None):
+        self.size = size or settings.EMAIL_POOL_SIZE
+        self.host = host or settings.EMAIL_HOST
+        self.port = port or settings.EMAIL_PORT
+        self.username = settings.EMAIL_HOST_USER if username is None else username
+        self.password = settings.EMAIL_HOST_PASSWORD if password is None else password
+        self.use_tls = settings.EMAIL_USE_TLS if use_tls is None else use_tls
+        self.timeout = timeout or settings.EMAIL_TIMEOUT
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._connections = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _connect(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP connection."""
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            server.starttls()
+        if self.username:
+            server.login(self.username, self.password)
+        with self._lock:
+            self._connections.add(server)
+        return server
+
+    @staticmethod
+    def _is_connection_error(error: Exception) -> bool:
+        """
+        Check whether an error means the connection is unusable, as opposed to the server
+        rejecting this particular message (SMTP exceptions are OSErrors too). A 421 reply
+        means the server is closing the connection, whatever command it answered.
+        """
+        if isinstance(error, smtplib.SMTPServerDisconnected):
+            return True
+        if isinstance(error, smtplib.SMTPResponseException):
+            return error.smtp_code == 421
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return any(code == 421 for code, _ in error.recipients.values())
+        return isinstance(error, OSError)
+
+    def _discard(self, server: smtplib.SMTP) -> None:
+        """Close a connection and forget it."""
+        with self._lock:
+            self._connections.discard(server)
+        try:
+            server.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection from the pool, opening one if none is idle.
+
+        Yields:
+            smtplib.SMTP: An authenticated connection, returned to the pool afterwards.
+        """
+        self._slots.acquire()
+        server = None
+        try:
+            try:
+                with self._lock:
+                    server = self._idle.get_nowait()
+            except queue.Empty:
+                server = self._connect()
+            yield server
+        except Exception as error:
+            if server is not None and self._is_connection_error(error):
+                self._discard(server)
+                server = None
+            raise
+        finally:
+            if server is not None:
+                with self._lock:
+                    # The pool may have been closed while the connection was borrowed
+                    if server in self._connections:
+                        self._idle.put(server)
+            self._slots.release()
+
+    def send_message(self, message) -> None:
+        """
+        Send a message over a pooled connection, reconnecting once if the connection broke.
+
+        Args:
+            message (email.message.Message): The message to send.
+        """
+        try:
+            with self.connection() as server:
+                server.send_message(message)
+        except Exception as error:
+            if not self._is_connection_error(error):
+                raise
+            logger.warning("SMTP connection failed (%s), reconnecting", error)
+            with self.connection() as server:
+                server.send_message(message)
+
+    def close(self) -> None:
+        """Close every connection of the pool."""
+        with self._lock:
+            connections, self._connections = self._connections, set()
+            self._idle = queue.LifoQueue()
+        for server in connections:
+            try:
+                server.quit()
+            except Exception:
+                server.close()
+
+
+_smtp_pool = None
+_smtp_pool_lock = threading.Lock()
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """
+    Get the SMTP connection pool shared by the current process, creating it on first use.
+
+    Returns:
+        SMTPConnectionPool: The shared pool.
+    """
+    global _smtp_pool
+    with _smtp_pool_lock:
+        if _smtp_pool is None:
+            _smtp_pool = SMTPConnectionPool()
+        return _smtp_pool
+
+
 class TicketEmailService:
     """
     Handles email notifications for ticket-related actions
     """
-        
+    def __init__(self, pool: SMTPConnectionPool = None):
+        """
+        Args:
+            pool (SMTPConnectionPool, optional): The connection pool to send through,
+                defaults to the pool shared by the process.
+        """
+        self.pool = pool
+
     def send_email(self, to_email: str, subject: str, html_content: str) -> bool:
         """Send an email to a given recipient with the given subject and HTML content
 
@@ -101,11 +274,8 @@ class TicketEmailService:
             html_part = MIMEText(html_content, 'html')
             message.attach(html_part)
             
-            # Send email
-            with smtplib.SMTP(settings.EMAIL_HOST, settings.EMAIL_PORT) as server:
-                server.starttls()
-                server.login(settings.EMAIL_HOST_USER, settings.EMAIL_HOST_PASSWORD)
-                server.send_message(message)
+            # Send email over a reused connection
+            (self.pool or get_smtp_pool()).send_message(message)
             
             logger.info(f"Successfully sent email to {to_email}")
             return True
@@ -118,49 +288,63 @@ class TicketNotificationManager:
     """
     Manages ticket notifications for different events
     """
-    def __init__(self, ticket):
+    def __init__(self, ticket, email_service: TicketEmailService = None):
         self.ticket = ticket
         self.event = ticket.event
         self.attendee = ticket.attendee
-        self.email_service = TicketEmailService()
+        self.email_service = email_service or TicketEmailService()
 
-    def send_registration_confirmation(self) -> bool:
+    def send_registration_confirmation(self) -> None:
         """
-        Sends a registration confirmation email to the attendee after a ticket has been registered.
-        
-        Returns:
-            bool: True if the email was sent successfully, False otherwise
+        Queues a registration confirmation email to the attendee after a ticket has been registered.
+
+        The email is sent by a Celery task once the current transaction commits, and the
+        ticket's `email_sent` flag is set when it has been delivered.
         """
-        html_content = self._generate_registration_html()
-        subject = f"Registration Confirmed - {self.event.event_name}"
-        
-        success = self.email_service.send_email(
-            to_email=self.attendee.email,
-            subject=subject,
-            html_content=html_content
+        self._enqueue_email(
+            kind='registration',
+            subject=f"Registration Confirmed - {self.event.event_name}",
+            html_content=self._generate_registration_html(),
+            mark_sent=True,
         )
-        
-        if success:
-            self.ticket.email_sent = True
-            self.ticket.save(update_fields=['email_sent'])
-        
-        return success
 
-    def send_cancellation_notification(self) -> bool:
+    def send_cancellation_notification(self) -> None:
         """
-        Sends a cancellation notification email to the attendee after a ticket has been cancelled.
-        
-        Returns:
-            bool: True if the email was sent successfully, False otherwise
+        Queues a cancellation notification email to the attendee after a ticket has been cancelled.
+
+        The content is rendered now, so the email can still be sent after the ticket is deleted.
         """
-        html_content = self._generate_cancellation_html()
-        subject = f"Ticket Cancelled - {self.event.event_name}"
-        
-        return self.email_service.send_email(
-            to_email=self.attendee.email,
-            subject=subject,
-            html_content=html_content
+        self._enqueue_email(
+            kind='cancellation',
+            subject=f"Ticket Cancelled - {self.event.event_name}",
+            html_content=self._generate_cancellation_html(),
         )
+
+    def _enqueue_email(self, kind: str, subject: str, html_content: str, mark_sent: bool = False) -> None:
+        """
+        Queue an email about the ticket for delivery after the current transaction commits.
+
+        Args:
+            kind (str): The type of email, part of the idempotency key.
+            subject (str): The email subject
+            html_content (str): The HTML content of the email
+            mark_sent (bool): Whether to set the ticket's `email_sent` flag once delivered
+        """
+        payload = {
+            'to_email': self.attendee.email,
+            'subject': subject,
+            'html_content': html_content,
+            'idempotency_key': f"ticket-email:{kind}:{self.ticket.id}:{self.ticket.ticket_number}",
+            'ticket_id': self.ticket.id if mark_sent else None,
+        }
+
+        def dispatch():
+            try:
+                send_ticket_email.delay(**payload)
+            except Exception as e:
+                logger.error(f"Failed to queue {kind} email to {payload['to_email']}: {str(e)}")
+
+        transaction.on_commit(dispatch)
     
     def send_reminder_notification(self) -> bool:
         """
@@ -190,26 +374,7 @@ class TicketNotificationManager:
         Returns:
             str: The rendered HTML content
         """
-        return f"""
-        <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <h2 style="color: #333;">Event Reminder</h2>
-            <p>Dear {self.attendee.full_name},</p>
-            <p>This is a reminder that <strong>{self.event.event_name}</strong> will take place tomorrow.</p>
-            
-            <div style="background-color: #f8f9fa; padding: 20px; margin: 20px 0; border-radius: 5px;">
-                <h3 style="margin-top: 0;">Event Details</h3>
-                <p><strong>Event:</strong> {self.event.event_name}</p>
-                <p><strong>Date:</strong> {self.event.start_date_event.strftime('%B %d, %Y %I:%M %p')}</p>
-                <p><strong>Location:</strong> {self.event.address}</p>
-            </div>
-            
-            <p>We look forward to seeing you there!</p>
-            
-            <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #eee;">
-                <small style="color: #666;">This is an automated message, please do not reply directly to this email.</small>
-            </div>
-        </div>
-        """
+        return render_ticket_email('reminder', self.ticket)
 
     def _generate_registration_html(self) -> str:
         """
@@ -218,32 +383,7 @@ class TicketNotificationManager:
         Returns:
             str: The rendered HTML content
         """
-        return f"""
-        <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <h2 style="color: #333;">Registration Confirmed</h2>
-            <p>Dear {self.attendee.full_name},</p>
-            <p>Your registration for <strong>{self.event.event_name}</strong> has been confirmed!</p>
-            
-            <div style="background-color: #f8f9fa; padding: 20px; margin: 20px 0; border-radius: 5px;">
-                <h3 style="margin-top: 0;">Event Details</h3>
-                <p><strong>Event:</strong> {self.event.event_name}</p>
-                <p><strong>Date:</strong> {self.event.start_date_event.strftime('%B %d, %Y %I:%M %p')}</p>
-                <p><strong>Location:</strong> {self.event.address}</p>
-                <p><strong>Ticket Number:</strong> {self.ticket.ticket_number}</p>
-            </div>
-            
-            <div style="background-color: #e9ecef; padding: 20px; margin: 20px 0; border-radius: 5px;">
-                <h3 style="margin-top: 0;">Important Information</h3>
-                <p>{self.event.description}</p>
-            </div>
-            
-            <p>Please keep your ticket number for reference: <strong>{self.ticket.ticket_number}</strong></p>
-            
-            <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #eee;">
-                <small style="color: #666;">This is an automated message, please do not reply directly to this email.</small>
-            </div>
-        </div>
-        """
+        return render_ticket_email('registration', self.ticket)
 
     def _generate_cancellation_html(self) -> str:
         """
@@ -252,47 +392,242 @@ class TicketNotificationManager:
         Returns:
             str: The rendered HTML content
         """
-        return f"""
-        <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <h2 style="color: #333;">Ticket Cancellation Confirmation</h2>
-            <p>Dear {self.attendee.full_name},</p>
-            <p>Your ticket for <strong>{self.event.event_name}</strong> has been cancelled.</p>
-            
-            <div style="background-color: #f8f9fa; padding: 20px; margin: 20px 0; border-radius: 5px;">
-                <h3 style="margin-top: 0;">Cancellation Details</h3>
-                <p><strong>Event:</strong> {self.event.event_name}</p>
-                <p><strong>Ticket Number:</strong> {self.ticket.ticket_number}</p>
-                <p><strong>Cancellation Date:</strong> {timezone.now().strftime('%B %d, %Y')}</p>
-            </div>
-            
-            <p>If you have any questions about this cancellation, please contact our support team.</p>
-            
-            <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #eee;">
-                <small style="color: #666;">This is an automated message, please do not reply directly to this email.</small>
-            </div>
-        </div>
-        """
+        return render_ticket_email(
+            'cancellation', self.ticket,
+            cancellation_date=timezone.now().strftime('%B %d, %Y'),
+        )
+
+@shared_task(
+    bind=True,
+    autoretry_for=(EmailDeliveryError,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=5,
+)
+def send_ticket_email(self, to_email: str, subject: str, html_content: str, idempotency_key: str,
+                      ticket_id: int = None) -> bool:
+    """
+    Deliver a ticket email, retrying with exponential backoff when sending fails.
+
+    The idempotency key is claimed in the cache for `EMAIL_CLAIM_TIMEOUT` before sending
+    and only kept for `EMAIL_IDEMPOTENCY_TIMEOUT` once the email was delivered, so a task
+    that is delivered twice by the broker sends the email only once, while a worker that
+    dies mid-send holds the claim only briefly. A task that finds the email still claimed
+    checks again once the claim has lapsed.
+
+    Args:
+        to_email (str): The recipient's email address
+        subject (str): The email subject
+        html_content (str): The HTML content of the email
+        idempotency_key (str): A key unique to this email
+        ticket_id (int, optional): The ticket whose `email_sent` flag is set after delivery
+
+    Returns:
+        bool: True if the email was sent, False if it had already been sent
+    """
+    if not cache.add(idempotency_key, 'sending', timeout=EMAIL_CLAIM_TIMEOUT):
+        if cache.get(idempotency_key) != 'sent':
+            raise self.retry(countdown=EMAIL_CLAIM_TIMEOUT)
+        logger.info("Skipping email %s, it was already sent", idempotency_key)
+        return False
+
+    if not TicketEmailService().send_email(to_email=to_email, subject=subject, html_content=html_content):
+        cache.delete(idempotency_key)
+        raise EmailDeliveryError(f"Failed to send email to {to_email}")
+
+    cache.set(idempotency_key, 'sent', timeout=EMAIL_IDEMPOTENCY_TIMEOUT)
+    if ticket_id is not None:
+        from api.models.ticket import Ticket
+        Ticket.objects.filter(id=ticket_id).update(email_sent=True)
+    return True
+
 
 @shared_task
-def send_reminder_emails():
+def send_reminder_emails(chunk_size: int = None) -> Dict:
     """
     Sends reminder emails to attendees with tickets for events occurring tomorrow.
 
     This task queries for tickets associated with events starting the next day
-    and sends reminder emails to those attendees whose `email_sent` flag is set to True.
+    whose `email_sent` flag is set to True, splits their IDs into chunks and fans
+    them out as a chord of `send_reminder_chunk` subtasks, so the reminders are
+    sent in parallel across workers. `summarize_reminders` logs the totals once
+    every chunk has finished.
 
-    The task iterates over each ticket meeting the criteria, creates a 
-    TicketNotificationManager instance, and invokes the send_reminder_notification 
-    method to dispatch the reminder email.
+    Args:
+        chunk_size (int, optional): The number of tickets per subtask,
+            defaults to `REMINDER_CHUNK_SIZE`.
+
+    Returns:
+        Dict: The number of tickets and chunks dispatched.
     """
     from api.models.ticket import Ticket
-    tomorrow = timezone.now() + timedelta(days=1)
-    tickets = Ticket.objects.filter(
-        event__start_date_event__date=tomorrow.date(),
+    chunk_size = chunk_size or settings.REMINDER_CHUNK_SIZE
+    # `__date` compares in the current time zone, so tomorrow must be a local date too
+    tomorrow = timezone.localdate() + timedelta(days=1)
+    ticket_ids = list(Ticket.objects.filter(
+        event__start_date_event__date=tomorrow,
         email_sent=True
-    )
+    ).order_by('id').values_list('id', flat=True))
+
+    chunks = [ticket_ids[start:start + chunk_size] for start in range(0, len(ticket_ids), chunk_size)]
+    if chunks:
+        chord(send_reminder_chunk.s(chunk) for chunk in chunks)(summarize_reminders.s())
+    logger.info("Dispatched %d reminders in %d chunks", len(ticket_ids), len(chunks))
+    return {'tickets': len(ticket_ids), 'chunks': len(chunks)}
+
+
+@shared_task(bind=True, max_retries=3)
+def send_reminder_chunk(self, ticket_ids: List[int], previously_sent: int = 0) -> Dict:
+    """
+    Sends the reminder emails of one chunk of tickets.
+
+    Tickets are loaded with their event and attendee in a single query and the emails
+    go out over the process' pooled SMTP connections. Progress is reported through
+    the task state. A sent reminder clears the ticket's `email_sent` flag, so when
+    some emails fail the chunk is retried with backoff and only the failed ones are
+    sent again; the reminders sent by the earlier attempts are carried into the retry.
+
+    Args:
+        ticket_ids (List[int]): The IDs of the tickets in the chunk.
+        previously_sent (int): The reminders sent by the earlier attempts of the chunk.
+
+    Returns:
+        Dict: The number of reminders sent and failed over all attempts.
+    """
+    from api.models.ticket import Ticket
+    tickets = Ticket.objects.filter(id__in=ticket_ids, email_sent=True).select_related('event', 'attendee')
+    email_service = TicketEmailService(pool=get_smtp_pool())
+    report_progress = not (self.request.called_directly or self.request.is_eager)
+    sent, failed = previously_sent, 0
 
     for ticket in tickets:
-        notification_manager = TicketNotificationManager(ticket)
-        notification_manager.send_reminder_notification()
-        
\ No newline at end of file
+        if TicketNotificationManager(ticket, email_service).send_reminder_notification():
+            sent += 1
+        else:
+            failed += 1
+        if report_progress and (sent + failed) % REMINDER_PROGRESS_INTERVAL == 0:
+            self.update_state(state='PROGRESS', meta={'sent': sent, 'failed': failed, 'total': len(ticket_ids)})
+
+    if failed and self.request.retries < self.max_retries:
+        raise self.retry(
+            args=[ticket_ids], kwargs={'previously_sent': sent},
+            exc=EmailDeliveryError(f"{failed} reminders failed"),
+            countdown=60 * 2 ** self.request.retries,
+        )
+    return {'sent': sent, 'failed': failed}
+
+
+@shared_task
+def summarize_reminders(results: List[Dict]) -> Dict:
+    """
+    Adds up the results of the reminder chunks once they have all finished.
+
+    Args:
+        results (List[Dict]): The results of the `send_reminder_chunk` subtasks.
+
+    Returns:
+        Dict: The total number of reminders sent and failed.
+    """
+    summary = {
+        'sent': sum(result['sent'] for result in results),
+        'failed': sum(result['failed'] for result in results),
+    }
+    logger.info("Reminder emails finished: %d sent, %d failed", summary['sent'], summary['failed'])
+    return summary
+
+
+@shared_task(bind=True, max_retries=3)
+def generate_image_variants(self, model_name: str, pk: int, field: str) -> Dict:
+    """
+    Generate the resized WebP and JPEG copies of an uploaded event image or organizer logo.
+
+    The original is downloaded once, every width is rendered and uploaded on a thread pool
+    of `IMAGE_VARIANT_WORKERS` threads, and the variant keys are stored next to the image.
+    They are only stored if the image has not been replaced in the meantime; otherwise the
+    variants are deleted again. S3 errors are retried with backoff.
+
+    Args:
+        model_name (str): The model of the instance, `event` or `organizer`.
+        pk (int): The ID of the instance.
+        field (str): The image field, one of `IMAGE_VARIANT_FIELDS`.
+
+    Returns:
+        Dict: The number of variants stored.
+    """
+    model = apps.get_model('api', model_name)
+    key = model.objects.filter(pk=pk).values_list(field, flat=True).first()
+    if not key:
+        return {'variants': 0}
+
+    uploads = ImageUploadService(key.rsplit('/', 1)[0])
+    variants = {}
+    try:
+        with ThreadPoolExecutor(max_workers=settings.IMAGE_VARIANT_WORKERS) as executor:
+            rendered = render_variants(uploads.download(key), executor=executor)
+            jobs = []
+            for width, formats in rendered.items():
+                for fmt, body in formats.items():
+                    variants.setdefault(str(width), {})[fmt] = variant_key(key, width, fmt)
+                    jobs.append((variant_key(key, width, fmt), body, IMAGE_VARIANT_FORMATS[fmt][1]))
+            list(executor.map(lambda job: uploads.upload_bytes(*job), jobs))
+    except ClientError as e:
+        raise self.retry(exc=e, countdown=30 * 2 ** self.request.retries)
+    except UnidentifiedImageError:
+        logger.error("Could not read the image of %s %s: %s", model_name, pk, key)
+        return {'variants': 0}
+
+    stored = model.objects.filter(pk=pk, **{field: key}).update(**{IMAGE_VARIANT_FIELDS[field]: variants})
+    if not stored:
+        logger.info("Image of %s %s changed while generating variants, discarding them", model_name, pk)
+        for variant in variant_keys(variants):
+            uploads.delete(variant)
+        return {'variants': 0}
+    invalidate_image_owner(model_name, pk)
+    logger.info("Generated %d image variants for %s %s", len(variant_keys(variants)), model_name, pk)
+    return {'variants': len(variant_keys(variants))}
+
+
+@shared_task
+def refresh_event_statuses():
+    """
+    Store the current registration and lifecycle status of every event in bulk.
+
+    Read endpoints compute these statuses on the fly without saving them, so this
+    periodic task keeps the stored `status_registeration` and `status` columns in
+    sync with a fixed number of UPDATE statements instead of one per event read.
+    """
+    from django.db.models import F
+    from api.models.event import Event
+    now = timezone.now()
+    registering = Event.objects.filter(end_date_register__gte=now)
+    full_events = registering.filter(
+        max_attendee__gt=0, attendee_count__gte=F('max_attendee')
+    ).values('id')
+
+    updated = Event.objects.filter(end_date_register__lt=now).exclude(
+        status_registeration='CLOSED'
+    ).update(status_registeration='CLOSED')
+    updated += Event.objects.filter(id__in=full_events).exclude(
+        status_registeration='FULL'
+    ).update(status_registeration='FULL')
+    updated += registering.exclude(id__in=full_events).exclude(
+        status_registeration='OPEN'
+    ).update(status_registeration='OPEN')
+
+    updated += Event.objects.filter(start_date_event__gt=now).exclude(
+        status='UPCOMING'
+    ).update(status='UPCOMING')
+    updated += Event.objects.filter(start_date_event__lte=now, end_date_event__gt=now).exclude(
+        status='ONGOING'
+    ).update(status='ONGOING')
+    updated += Event.objects.filter(start_date_event__lte=now, end_date_event__lte=now).exclude(
+        status='COMPLETED'
+    ).update(status='COMPLETED')
+
+    if updated:
+        # Lists filtered by registration status now hold different events
+        from api.cache import invalidate_events
+        invalidate_events([], listing=True)
+    logger.info("Refreshed stored statuses, %d event rows updated", updated)
+    return updated
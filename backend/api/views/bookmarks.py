@@ -8,21 +8,23 @@ class BookmarkAPI:
     """
     API endpoints for managing bookmarks.
     """
-    @route.get('/my-favorite/', response=List[EventResponseSchema], auth=JWTAuth())
-    def show_bookmark(self, request: HttpRequest):
+    @route.get('/my-favorite/', response=List[EventResponseSchema], auth=CachedJWTAuth())
+    def show_bookmark(self, request: HttpRequest, cursor: Optional[str] = None, limit: Optional[int] = None):
         """
-        Retrieves a list of events that are bookmarked by the authenticated user.
+        Retrieves one page of events that are bookmarked by the authenticated user.
 
         Args:
             request (HttpRequest): The HTTP request object.
+            cursor (Optional[str]): The `X-Next-Cursor` value returned with the previous page.
+            limit (Optional[int]): The maximum number of events in the page.
 
         Returns:
             List[EventResponseSchema]: A list of event data in the form of EventResponseSchema.
         """
         strategy : BookmarkStrategy = BookmarkStrategy.get_strategy('bookmark_show', request)
-        return strategy.execute()
+        return strategy.execute(cursor, limit)
     
-    @route.put('/{event_id}/toggle-bookmark', auth=JWTAuth())
+    @route.put('/{event_id}/toggle-bookmark', auth=CachedJWTAuth())
     def toggle_bookmark(self, request, event_id: int):
         """
         Toggles the bookmark status for a given event and user.
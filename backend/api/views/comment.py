@@ -9,7 +9,7 @@ class CommentAPI:
     """
     API for managing comments on events.
     """
-    @route.post('/write-comment/{event_id}', response={201: dict}, auth=JWTAuth())
+    @route.post('/write-comment/{event_id}', response={201: dict}, auth=CachedJWTAuth())
     def create_comment(self, request: HttpRequest, event_id: int, data: CommentSchema):
         """
         Create a new comment for a specific event.
@@ -25,7 +25,7 @@ class CommentAPI:
         strategy : CommentStrategy = CommentStrategy.get_strategy('create_comment')
         return strategy.execute(request, event_id, data)
         
-    @route.delete('/{comment_id}/delete/', response={200: dict, 404: ErrorResponseSchema}, auth=JWTAuth())
+    @route.delete('/{comment_id}/delete/', response={200: dict, 404: ErrorResponseSchema}, auth=CachedJWTAuth())
     def delete_comment(self, request: HttpRequest, comment_id: int):
         """
         Delete a comment by ID if user is authorized.
@@ -40,7 +40,7 @@ class CommentAPI:
         strategy : CommentStrategy = CommentStrategy.get_strategy('delete_comment')
         return strategy.execute(request, comment_id)
             
-    @route.put('/{comment_id}/edit/', response={200: dict, 404: ErrorResponseSchema}, auth=JWTAuth())
+    @route.put('/{comment_id}/edit/', response={200: dict, 404: ErrorResponseSchema}, auth=CachedJWTAuth())
     def edit_comment(self, request: HttpRequest, comment_id: int, data: CommentSchema):
         """
         Edit a comment's content if user is authorized.
@@ -55,3 +55,19 @@ class CommentAPI:
         """
         strategy : CommentStrategy = CommentStrategy.get_strategy('update_comment')
         return strategy.execute(request, comment_id, data)
+
+    @route.put('/{comment_id}/toggle-reaction', response={200: CommentReactionSummarySchema, 404: ErrorResponseSchema}, auth=CachedJWTAuth())
+    def toggle_reaction(self, request: HttpRequest, comment_id: int, data: CommentReactionSchema):
+        """
+        Add or remove a reaction of the user on a comment.
+
+        Args:
+            request (HttpRequest): HTTP request with authenticated user.
+            comment_id (int): ID of the comment to react to.
+            data (CommentReactionSchema): The reaction type.
+
+        Returns:
+            Response: The comment's reaction counts and the user's reactions, or an error if not found.
+        """
+        strategy : CommentStrategy = CommentStrategy.get_strategy('react_comment')
+        return strategy.execute(request, comment_id, data)
@@ -5,7 +5,7 @@ from api.views.schemas.comment_schema import CommentResponseSchema
 from api.views.schemas.event_schema import *
 from api.views.schemas.ticket_schema import TicketResponseSchema
 from api.views.schemas.user_schema import UserResponseSchema
-from api.views.schemas.other_schema import ErrorResponseSchema, FileUploadResponseSchema
+from api.views.schemas.other_schema import ErrorResponseSchema, ExportFormat, FileUploadResponseSchema
 from .strategy.event_strategy import EventStrategy,EventEngagement
 
 
@@ -15,7 +15,7 @@ class EventAPI(ControllerBase):
     """
     API endpoints for event management.
     """
-    @route.post('/create-event', response =EventResponseSchema, auth=JWTAuth())
+    @route.post('/create-event', response =EventResponseSchema, auth=CachedJWTAuth())
     def create_event(self,request, data: EventInputSchema = Form(...), image: UploadedFile = File(None)):
         """
         Create a new event with optional image upload.
@@ -31,36 +31,127 @@ class EventAPI(ControllerBase):
         strategy : EventStrategy= EventStrategy.get_strategy('create_event', request)
         return strategy.execute(data, image)
 
-    @route.get('/my-events', response=List[EventResponseSchema], auth=JWTAuth())
-    def get_my_events(self,request):
+    @route.get('/my-events', response=List[EventResponseSchema], auth=CachedJWTAuth())
+    def get_my_events(self,request, cursor: Optional[str] = None, limit: Optional[int] = None):
         """
         Retrieve events created by the logged-in organizer.
 
         Args:
             request (HttpRequest): The HTTP request object.
+            cursor (Optional[str]): The `X-Next-Cursor` value returned with the previous page.
+            limit (Optional[int]): The maximum number of events in the page.
 
         Returns:
-            List[EventResponseSchema]: List of events created by the organizer.
+            List[EventResponseSchema]: One page of events created by the organizer.
         """
         strategy : EventStrategy = EventStrategy.get_strategy('organizer_get_events', request)
-        return strategy.execute()
+        return strategy.execute(cursor, limit)
 
     @route.get('/events', response=List[EventResponseSchema])
-    def list_all_events(self,request: HttpRequest):
+    def list_all_events(self,request: HttpRequest, filters: EventFilterSchema = Query(...),
+                        cursor: Optional[str] = None, limit: Optional[int] = None):
         """
         Retrieve all public events for the homepage.
 
         Args:
             request (HttpRequest): The HTTP request object.
+            filters (EventFilterSchema): Category, price, attendance, dress code, registration
+                status and start date filters; every filter given must match.
+            cursor (Optional[str]): The `X-Next-Cursor` value returned with the previous page.
+            limit (Optional[int]): The maximum number of events in the page.
 
         Returns:
-            List[EventResponseSchema]: List of all events.
+            List[EventResponseSchema]: One page of events.
         """
         
         strategy : EventStrategy = EventStrategy.get_strategy('list_event', request)
-        return strategy.execute()
+        return strategy.execute(cursor, limit, filters)
+
+    @route.get('/facets', response=EventFacetsSchema)
+    def event_facets(self, request: HttpRequest, filters: EventFilterSchema = Query(...)):
+        """
+        Count the public events per category, free and paid, and online and in person.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            filters (EventFilterSchema): Only count the events matching these filters.
+
+        Returns:
+            EventFacetsSchema: The total and the counts per filter value.
+        """
+        strategy : EventStrategy = EventStrategy.get_strategy('event_facets', request)
+        return strategy.execute(filters)
     
-    @route.patch('/{event_id}/edit', response={200: EventUpdateSchema, 401: ErrorResponseSchema, 404: ErrorResponseSchema}, auth=JWTAuth())
+    @route.get('/tags', response=List[TagResponseSchema])
+    def popular_tags(self, request: HttpRequest, limit: Optional[int] = None):
+        """
+        List the tags used by the most published events.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            limit (Optional[int]): The maximum number of tags, 20 by default and at most 100.
+
+        Returns:
+            List[TagResponseSchema]: The tags with their event counts.
+        """
+        strategy : EventStrategy = EventStrategy.get_strategy('popular_tags', request)
+        return strategy.execute(limit)
+
+    @route.get('/tagged/{tag}', response=List[EventResponseSchema])
+    def tagged_events(self, request: HttpRequest, tag: str, cursor: Optional[str] = None, limit: Optional[int] = None):
+        """
+        Retrieve the public events with a tag, newest first.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            tag (str): The tag, matched case-insensitively.
+            cursor (Optional[str]): The `X-Next-Cursor` value returned with the previous page.
+            limit (Optional[int]): The maximum number of events in the page.
+
+        Returns:
+            List[EventResponseSchema]: One page of events.
+        """
+        strategy : EventStrategy = EventStrategy.get_strategy('list_event', request)
+        return strategy.execute(cursor, limit, EventFilterSchema(tag=tag))
+
+    @route.get('/search', response={200: List[EventResponseSchema], 400: ErrorResponseSchema})
+    def search_events(self, request: HttpRequest, q: str, cursor: Optional[str] = None, limit: Optional[int] = None):
+        """
+        Search published events by name, tags, description and organizer name, best match first.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            q (str): The search text.
+            cursor (Optional[str]): The `X-Next-Cursor` value returned with the previous page.
+            limit (Optional[int]): The maximum number of events in the page.
+
+        Returns:
+            List[EventResponseSchema]: One page of matching events.
+        """
+        strategy : EventStrategy = EventStrategy.get_strategy('search_events', request)
+        return strategy.execute(q, cursor, limit)
+
+    @route.get('/nearby', response={200: List[NearbyEventResponseSchema], 400: ErrorResponseSchema})
+    def nearby_events(self, request: HttpRequest, latitude: Optional[float] = None, longitude: Optional[float] = None,
+                      radius_km: Optional[float] = None, cursor: Optional[str] = None, limit: Optional[int] = None):
+        """
+        List the upcoming events around a location, closest first.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            latitude (Optional[float]): The latitude of the location, the user's stored one if not given.
+            longitude (Optional[float]): The longitude of the location, the user's stored one if not given.
+            radius_km (Optional[float]): The search radius in kilometres, 10 by default and at most 50.
+            cursor (Optional[str]): The `X-Next-Cursor` value returned with the previous page.
+            limit (Optional[int]): The maximum number of events in the page.
+
+        Returns:
+            List[NearbyEventResponseSchema]: One page of events with their distance.
+        """
+        strategy : EventStrategy = EventStrategy.get_strategy('nearby_events', request)
+        return strategy.execute(latitude, longitude, radius_km, cursor, limit)
+
+    @route.patch('/{event_id}/edit', response={200: EventUpdateSchema, 401: ErrorResponseSchema, 404: ErrorResponseSchema}, auth=CachedJWTAuth())
     def edit_event(self,request: HttpRequest, event_id: int, data: EventUpdateSchema):
         """
         Edit an existing event by ID if the user is the organizer.
@@ -92,7 +183,37 @@ class EventAPI(ControllerBase):
         return strategy.execute(event_id)
         
     
-    @route.post('/{event_id}/upload/event-image/', response={200: FileUploadResponseSchema, 400: ErrorResponseSchema}, auth=JWTAuth())
+    @route.get('/{event_id}/availability', response={200: EventAvailabilitySchema, 404: ErrorResponseSchema})
+    def event_availability(self, request: HttpRequest, event_id: int):
+        """
+        Retrieve the seat availability of an event.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            event_id (int): The ID of the event.
+
+        Returns:
+            EventAvailabilitySchema: The attendee count, spots left and registration status of the event.
+        """
+        strategy : EventStrategy = EventStrategy.get_strategy('event_availability', request)
+        return strategy.execute(event_id)
+
+    @route.get('/{event_id}/availability/stream', response={404: ErrorResponseSchema})
+    def stream_event_availability(self, request: HttpRequest, event_id: int):
+        """
+        Stream the seat availability of an event as server-sent events.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            event_id (int): The ID of the event.
+
+        Returns:
+            StreamingHttpResponse: The `text/event-stream` response.
+        """
+        strategy : EventStrategy = EventStrategy.get_strategy('event_availability_stream', request)
+        return strategy.execute(event_id)
+
+    @route.post('/{event_id}/upload/event-image/', response={200: FileUploadResponseSchema, 400: ErrorResponseSchema}, auth=CachedJWTAuth())
     def upload_event_image(self,request: HttpRequest, event_id: int, file: UploadedFile = File(...)):
         """
         Upload an image for a specific event.
@@ -110,21 +231,38 @@ class EventAPI(ControllerBase):
         
     
     @route.get('/{event_id}/comments', response=List[CommentResponseSchema])
-    def get_events_comments(self, request: HttpRequest, event_id: int):
+    def get_events_comments(self, request: HttpRequest, event_id: int, cursor: Optional[str] = None, limit: Optional[int] = None):
         """
-        Retrieve all comments for a specific event, including nested replies.
+        Retrieve one page of top-level comments for a specific event, including nested replies.
         
         Args:
             request (HttpRequest): The HTTP request object, containing user and request metadata.
             event_id (int): The ID of the event for which comments are requested.
+            cursor (Optional[str]): The `X-Next-Cursor` value returned with the previous page.
+            limit (Optional[int]): The maximum number of top-level comments in the page.
 
         Returns:
             Response (dict): A dictionary containing comments for the event.
         """
         strategy: EventEngagement = EventEngagement.get_engagement_strategy('event_comment', request, event_id)
-        return strategy.execute()
+        return strategy.execute(cursor, limit)
     
-    @route.get('/{event_id}/attendee-list', response=List[UserResponseSchema], auth=JWTAuth())
+    @route.get('/{event_id}/comments/stream', response={404: ErrorResponseSchema})
+    def stream_events_comments(self, request: HttpRequest, event_id: int):
+        """
+        Stream the comments created, edited or deleted on an event as server-sent events.
+
+        Args:
+            request (HttpRequest): The HTTP request object, containing user and request metadata.
+            event_id (int): The ID of the event whose comments are followed.
+
+        Returns:
+            StreamingHttpResponse: The `text/event-stream` response.
+        """
+        strategy: EventEngagement = EventEngagement.get_engagement_strategy('event_comment_stream', request, event_id)
+        return strategy.execute()
+
+    @route.get('/{event_id}/attendee-list', response=List[UserResponseSchema], auth=CachedJWTAuth())
     def get_attendee_list(self, request: HttpRequest, event_id: int):
         """
         Retrieve the list of attendees for a specific event.
@@ -139,7 +277,23 @@ class EventAPI(ControllerBase):
         strategy : EventEngagement = EventEngagement.get_engagement_strategy('event_attendee', request, event_id)
         return strategy.execute()
         
-    @route.get('/{event_id}/ticket-list', response=List[TicketResponseSchema], auth=JWTAuth())
+    @route.get('/{event_id}/attendees/export', response={403: ErrorResponseSchema}, auth=CachedJWTAuth())
+    def export_attendees(self, request: HttpRequest, event_id: int, format: ExportFormat = ExportFormat.CSV):
+        """
+        Download the attendees of an event as a CSV or NDJSON file, streamed row by row.
+
+        Args:
+            request (HttpRequest): The HTTP request object, containing user and request metadata.
+            event_id (int): The ID of the event.
+            format (ExportFormat): `csv` or `ndjson`.
+
+        Returns:
+            StreamingHttpResponse: The attendee file.
+        """
+        strategy : EventEngagement = EventEngagement.get_engagement_strategy('event_attendee_export', request, event_id)
+        return strategy.execute(format.value)
+
+    @route.get('/{event_id}/ticket-list', response=List[TicketResponseSchema], auth=CachedJWTAuth())
     def get_ticket_list(self, request: HttpRequest, event_id: int):
         """
         Retrieve the list of tickets for a specific event.
@@ -9,7 +9,7 @@ class LikeAPI:
     API endpoints for event likes.
     """
     
-    @route.put('/{event_id}/toggle-like', response={200: dict}, auth=JWTAuth())
+    @route.put('/{event_id}/toggle-like', response={200: dict}, auth=CachedJWTAuth())
     def toggle_like(self, request: HttpRequest, event_id: int) -> dict:
         """Toggle the like status for a given event and user.
 
@@ -7,7 +7,7 @@ from abc import ABC, abstractmethod
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 
 # Third-Party Packages
 import boto3
@@ -19,7 +19,7 @@ from django.contrib.auth.models import User
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.http import Http404, HttpRequest
 from django.shortcuts import get_object_or_404
 from django.utils.crypto import get_random_string
@@ -28,7 +28,7 @@ from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from django.views import View
 from google.auth.transport import requests
 from google.oauth2 import id_token
-from ninja import File, Form, ModelSchema, Schema
+from ninja import File, FilterSchema, Form, ModelSchema, Query, Schema
 from ninja.errors import HttpError
 from ninja.files import UploadedFile
 from ninja.responses import Response
@@ -55,9 +55,11 @@ from api.models.comment import *
 from api.models.event import *
 from api.models.like import *
 from api.models.organizer import *
+from api.models.tag import Tag
 from api.models.ticket import *
 from api.models.user import *
 from api.utils import *
+from api.auth import CachedJWTAuth, authenticate_request
 
 logger = logging.getLogger(__name__)
 
@@ -9,7 +9,7 @@ class OrganizerAPI:
     """
     Organizer API endpoints.
     """
-    @route.post('/apply-organizer',response={201: OrganizerResponseSchema, 400: ErrorResponseSchema}, auth=JWTAuth())    
+    @route.post('/apply-organizer',response={201: OrganizerResponseSchema, 400: ErrorResponseSchema}, auth=CachedJWTAuth())    
     def apply_organizer(self, request: HttpRequest, form: OrganizerSchema = Form(...)):
         """
         Apply to be an organizer
@@ -24,7 +24,7 @@ class OrganizerAPI:
         strategy : OrganizerStrategy = OrganizerStrategy.get_strategy('apply_organizer')
         return strategy.execute(request, form)
 
-    @route.delete('/delete-event/{event_id}', response={204: dict, 403: ErrorResponseSchema, 404: ErrorResponseSchema}, auth=JWTAuth())
+    @route.delete('/delete-event/{event_id}', response={204: dict, 403: ErrorResponseSchema, 404: ErrorResponseSchema}, auth=CachedJWTAuth())
     def delete_event(self, request: HttpRequest, event_id: int):
         """
         Delete an event by ID if the user is the organizer.
@@ -41,7 +41,7 @@ class OrganizerAPI:
         strategy : OrganizerStrategy = OrganizerStrategy.get_strategy('delete_event')
         return strategy.execute(request, event_id)
 
-    @route.patch('/update-organizer', response={200: OrganizerResponseSchema, 401: ErrorResponseSchema, 404: ErrorResponseSchema}, auth=JWTAuth())
+    @route.patch('/update-organizer', response={200: OrganizerResponseSchema, 401: ErrorResponseSchema, 404: ErrorResponseSchema}, auth=CachedJWTAuth())
     def update_organizer(self, request: HttpRequest, data: OrganizerUpdateSchema):
         """
         Update the profile information of the authenticated organizer.
@@ -55,7 +55,7 @@ class OrganizerAPI:
         strategy : OrganizerStrategy = OrganizerStrategy.get_strategy('update_organizer')
         return strategy.execute(request, data)
             
-    @route.delete('/revoke-organizer', response={200: None, 403: ErrorResponseSchema, 404: ErrorResponseSchema}, auth=JWTAuth())
+    @route.delete('/revoke-organizer', response={200: None, 403: ErrorResponseSchema, 404: ErrorResponseSchema}, auth=CachedJWTAuth())
     def revoke_organizer(self, request: HttpRequest):
         """
         Revoke the organizer role of the authenticated user.
@@ -71,7 +71,7 @@ class OrganizerAPI:
         strategy : OrganizerStrategy = OrganizerStrategy.get_strategy('revoke_organizer')
         return strategy.execute(request)
         
-    @route.get('/view-organizer', response={200: OrganizerResponseSchema, 401: ErrorResponseSchema, 404: ErrorResponseSchema}, auth=JWTAuth())
+    @route.get('/view-organizer', response={200: OrganizerResponseSchema, 401: ErrorResponseSchema, 404: ErrorResponseSchema}, auth=CachedJWTAuth())
     def view_organizer(self, request: HttpRequest):
         """
         Retrieve the profile information of the authenticated organizer.
@@ -87,7 +87,7 @@ class OrganizerAPI:
         strategy : OrganizerStrategy = OrganizerStrategy.get_strategy('view_organizer')
         return strategy.execute(request)
         
-    @route.post('/{organizer_id}/upload/logo/', response={200: FileUploadResponseSchema, 400: ErrorResponseSchema}, auth=JWTAuth())
+    @route.post('/{organizer_id}/upload/logo/', response={200: FileUploadResponseSchema, 400: ErrorResponseSchema}, auth=CachedJWTAuth())
     def upload_profile_picture(self, request: HttpRequest, organizer_id: int, logo: UploadedFile = File(...)):
         """
         Upload a logo for an organizer.
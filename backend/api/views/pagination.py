@@ -0,0 +1,181 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+from ninja.errors import HttpError
+from ninja.responses import Response
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+
+class KeysetPaginator:
+    """
+    Keyset (cursor) pagination over a datetime field and the primary key, newest first.
+
+    Each page is fetched with a `WHERE (field, id) < (cursor)` condition instead of an
+    OFFSET, so the cost of a page depends on the page size only, not on how deep the
+    client has paged or how large the table is.
+    """
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 100
+
+    def __init__(self, field: str, cursor: Optional[str] = None, limit: Optional[int] = None):
+        """
+        Args:
+            field (str): The datetime field to order by, in descending order.
+            cursor (Optional[str]): The opaque cursor returned with the previous page.
+            limit (Optional[int]): The page size, capped at MAX_LIMIT.
+        """
+        self.field = field
+        self.cursor = cursor
+        self.limit = min(max(limit or self.DEFAULT_LIMIT, 1), self.MAX_LIMIT)
+
+    @staticmethod
+    def encode_cursor(value: datetime, pk: int) -> str:
+        """
+        Encode the position of the last item of a page into an opaque cursor.
+
+        Args:
+            value (datetime): The ordering field value of the last item.
+            pk (int): The primary key of the last item.
+
+        Returns:
+            str: A URL-safe cursor string.
+        """
+        raw = json.dumps([value.isoformat(), pk]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """
+        Decode a cursor produced by `encode_cursor`.
+
+        Args:
+            cursor (str): The cursor string.
+
+        Returns:
+            Tuple[datetime, int]: The ordering field value and primary key of the last item.
+
+        Raises:
+            HttpError: If the cursor is malformed.
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return datetime.fromisoformat(value), int(pk)
+        except (binascii.Error, ValueError, TypeError):
+            raise HttpError(status_code=400, message="Invalid cursor.")
+
+    def paginate(self, queryset: QuerySet) -> Tuple[list, Optional[str]]:
+        """
+        Fetch one page of the queryset.
+
+        Args:
+            queryset (QuerySet): The unordered, unsliced queryset to paginate.
+
+        Returns:
+            Tuple[list, Optional[str]]: The items of the page and the cursor of the next page,
+            or None if this is the last page.
+        """
+        queryset = queryset.order_by(f'-{self.field}', '-id')
+        if self.cursor:
+            value, pk = self.decode_cursor(self.cursor)
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__lt': value}) | Q(**{self.field: value, 'id__lt': pk})
+            )
+        items = list(queryset[:self.limit + 1])
+        if len(items) <= self.limit:
+            return items, None
+        items = items[:self.limit]
+        last = items[-1]
+        return items, self.encode_cursor(getattr(last, self.field), last.pk)
+
+
+
+class RankedPaginator:
+    """
+    Offset pagination for results ordered by a computed rank, such as search relevance.
+
+    Ranks are not stable keys to page on, so the opaque cursor carries the offset of the
+    next page instead. Clients use it exactly like the keyset cursor.
+    """
+    def __init__(self, cursor: Optional[str] = None, limit: Optional[int] = None):
+        """
+        Args:
+            cursor (Optional[str]): The opaque cursor returned with the previous page.
+            limit (Optional[int]): The page size, capped at KeysetPaginator.MAX_LIMIT.
+        """
+        self.offset = self.decode_cursor(cursor) if cursor else 0
+        self.limit = min(max(limit or KeysetPaginator.DEFAULT_LIMIT, 1), KeysetPaginator.MAX_LIMIT)
+
+    @staticmethod
+    def encode_cursor(offset: int) -> str:
+        """
+        Encode the offset of the next page into an opaque cursor.
+
+        Args:
+            offset (int): The number of results before the next page.
+
+        Returns:
+            str: A URL-safe cursor string.
+        """
+        return base64.urlsafe_b64encode(json.dumps({'offset': offset}).encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> int:
+        """
+        Decode a cursor produced by `encode_cursor`.
+
+        Args:
+            cursor (str): The cursor string.
+
+        Returns:
+            int: The offset of the page.
+
+        Raises:
+            HttpError: If the cursor is malformed.
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            offset = int(json.loads(base64.urlsafe_b64decode(padded.encode()))['offset'])
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise HttpError(status_code=400, message="Invalid cursor.")
+        if offset < 0:
+            raise HttpError(status_code=400, message="Invalid cursor.")
+        return offset
+
+    def paginate(self, fetch: Callable[[int, int], List]) -> Tuple[List, Optional[str]]:
+        """
+        Fetch one page of ranked results.
+
+        Args:
+            fetch (Callable[[int, int], List]): Returns up to `limit` results from `offset`,
+                called as `fetch(limit, offset)`.
+
+        Returns:
+            Tuple[List, Optional[str]]: The results of the page and the cursor of the next page,
+            or None if this is the last page.
+        """
+        items = fetch(self.limit + 1, self.offset)
+        if len(items) <= self.limit:
+            return items, None
+        return items[:self.limit], self.encode_cursor(self.offset + self.limit)
+
+def paginated_response(items: list, next_cursor: Optional[str]) -> Response:
+    """
+    Build a response for one page of items, passing the next cursor in a header.
+
+    Args:
+        items (list): The serialized items of the page.
+        next_cursor (Optional[str]): The cursor of the next page, if there is one.
+
+    Returns:
+        Response: The list of items, with the `X-Next-Cursor` header when more pages exist.
+    """
+    response = Response(items, status=200)
+    if next_cursor:
+        response[NEXT_CURSOR_HEADER] = next_cursor
+    return response
@@ -17,29 +17,90 @@ class CommentResponseSchema(Schema):
     content: str
     created_at: datetime
     status: str
+    reply_count: int = 0
+    reaction_counts: Dict[str, int] = {}
+    my_reactions: List[str] = []
     replies: List['CommentResponseSchema'] = [] 
 
     @classmethod
-    def from_comment(cls, comment: Comment) -> Dict:
-        """Serialize a Comment instance, including nested fields."""
+    def node(cls, comment: Comment) -> Dict:
+        """Serialize a Comment instance without its replies."""
         return {
             "id": comment.id,
-            "user": UserProfileSchema(
-                id=comment.user.id,
-                username=comment.user.username,
-                profile_picture=comment.user.profile_picture,
-            ).dict(),
+            "user": {
+                "id": comment.user.id,
+                "username": comment.user.username,
+                "profile_picture": comment.user.profile_picture_url,
+            },
             "content": comment.content,
             "created_at": comment.created_at,
             "status": comment.status,
-            "replies": [cls.from_comment(reply) for reply in comment.replies.all()],
+            "reply_count": 0,
+            "reaction_counts": {},
+            "my_reactions": [],
+            "replies": [],
         }
 
+    @classmethod
+    def live_payload(cls, comment: Comment) -> Dict:
+        """Serialize a new or edited Comment instance for the live comment stream of its event."""
+        return {**cls.node(comment), "parent_id": comment.parent_id}
+
+    @classmethod
+    def from_comment(cls, comment: Comment, user: Optional[AttendeeUser] = None) -> Dict:
+        """Serialize a Comment instance, including nested fields."""
+        replies = Comment.objects.descendants_of([comment.id]).select_related('user')
+        return cls.build_forest([comment], replies, user)[0]
+
+    @classmethod
+    def build_forest(cls, roots: List[Comment], replies: List[Comment],
+                     user: Optional[AttendeeUser] = None) -> List[Dict]:
+        """
+        Assemble loaded comments into nested threads in linear time.
+
+        Replies keep the order they are given in under their parent, and every comment
+        gets the number of replies below it at any depth and its reaction counts, which
+        one grouped query loads for all the comments. The threads are walked with an
+        explicit stack, so deep threads do not hit the recursion limit.
+
+        Args:
+            roots (List[Comment]): The top-level comments, in response order.
+            replies (List[Comment]): Every reply below the roots, with their users loaded.
+            user (Optional[AttendeeUser]): The user whose own reactions to include, if any.
 
-class CommentReaction(Schema):
+        Returns:
+            List[Dict]: The serialized threads, one per root.
+        """
+        nodes = {comment.id: cls.node(comment) for comment in roots}
+        replies = list(replies)
+        nodes.update((reply.id, cls.node(reply)) for reply in replies)
+        for reply in replies:
+            nodes[reply.parent_id]["replies"].append(nodes[reply.id])
+        for comment_id, summary in CommentReaction.objects.summarize(nodes, user).items():
+            nodes[comment_id].update(summary)
+
+        forest = [nodes[comment.id] for comment in roots]
+        preorder, stack = [], list(forest)
+        while stack:
+            node = stack.pop()
+            preorder.append(node)
+            stack.extend(node["replies"])
+        for node in reversed(preorder):
+            node["reply_count"] = sum(1 + reply["reply_count"] for reply in node["replies"])
+        return forest
+
+
+class CommentReactionSchema(Schema):
+    reaction_type: CommentType
+
+
+class CommentReactionSummarySchema(Schema):
     comment_id: int
-    reaction_type: str
-    
+    reacted: bool
+    reaction_counts: Dict[str, int]
+    my_reactions: List[str]
+
+
 class CommentReactionResponseSchema(Schema):
     id: int
     comment: CommentResponseSchema
@@ -1,4 +1,6 @@
 from api.views.modules import *
+from api.cache import cache_user_engagement, get_user_engagement
+from api.models.tag import normalize_tag
 from .organizer_schema import OrganizerResponseSchema
 from .user_schema import UserEngagementSchema
 
@@ -49,7 +51,56 @@ class EventInputSchema(ModelSchema):
     
     class Meta:
         model = Event
-        exclude = ('organizer', 'id', 'status_registeration','tags','status', 'event_image','updated_at')     
+        exclude = ('organizer', 'id', 'status_registeration','tags','status', 'event_image','updated_at',
+                   'attendee_count', 'like_count', 'bookmark_count', 'image_variants', 'geohash')     
+
+class RegistrationStatus(str, Enum):
+    OPEN = 'OPEN'
+    CLOSED = 'CLOSED'
+    FULL = 'FULL'
+
+class EventFilterSchema(FilterSchema):
+    category: Optional[EventCategory] = None
+    is_free: Optional[bool] = None
+    is_online: Optional[bool] = None
+    dress_code: Optional[DressCode] = None
+    status_registeration: Optional[RegistrationStatus] = None
+    start_after: Optional[datetime] = Field(None, json_schema_extra={'q': 'start_date_event__gte'})
+    start_before: Optional[datetime] = Field(None, json_schema_extra={'q': 'start_date_event__lte'})
+    tag: Optional[str] = Field(None, json_schema_extra={'q': 'tag_set__name'})
+
+    @field_validator('tag')
+    def normalize_tag(cls, value):
+        return normalize_tag(value) if value is not None else None
+
+    def cache_key(self) -> str:
+        """
+        Build a canonical string of the filters that are set, for cache keys.
+
+        Returns:
+            str: The filters as a sorted query string, empty if no filter is set.
+        """
+        values = self.model_dump(exclude_none=True, mode='json')
+        return '&'.join(f'{name}={value}' for name, value in sorted(values.items()))
+
+class TagResponseSchema(Schema):
+    name: str
+    event_count: int
+
+class EventFacetsSchema(Schema):
+    total: int
+    category: Dict[str, int]
+    price: Dict[str, int]
+    attendance: Dict[str, int]
+
+class EventAvailabilitySchema(Schema):
+    event_id: int
+    max_attendee: Optional[int] = None
+    attendee_count: int
+    available_spot: Optional[int] = None
+    status_registeration: str
+    start_date_register: datetime
+    end_date_register: datetime
 
 class EventResponseSchema(ModelSchema):
     category : EventCategory
@@ -60,6 +111,7 @@ class EventResponseSchema(ModelSchema):
     user_engaged: Optional[Dict] = None
     current_attendees: Optional[int] = 0
     status_registeration: Optional[str] = None
+    image_variant_urls: Dict[str, Dict[str, str]] = {}
     
     @classmethod
     def resolve_engagement(cls, event: Event) -> Dict:
@@ -90,19 +142,77 @@ class EventResponseSchema(ModelSchema):
         Returns:
             Dict: User engagement data including the user's like status and bookmark status.
         """
-        if user is None or not user.is_authenticated:
-            return UserEngagementSchema(
-                is_liked=False,
-                is_bookmarked=False,
-                is_applied=False
+        return cls.resolve_user_engagement_by_ids([event.id], user)[event.id]
+
+    @classmethod
+    def resolve_user_engagement_bulk(cls, events: List[Event], user: Optional[AttendeeUser] = None) -> Dict[int, Dict]:
+        """
+        Resolve user engagement information for many events at once.
+
+        Runs one query per engagement type for the whole list instead of three
+        queries per event.
+
+        Args:
+            events (List[Event]): The events for which user engagement data is being retrieved.
+            user (Optional[AttendeeUser]): The user for whom the engagement data is resolved.
+
+        Returns:
+            Dict[int, Dict]: User engagement data keyed by event ID.
+        """
+        return cls.resolve_user_engagement_by_ids([event.id for event in events], user)
+
+    @classmethod
+    def resolve_user_engagement_by_ids(cls, event_ids: List[int], user: Optional[AttendeeUser] = None) -> Dict[int, Dict]:
+        """
+        Resolve user engagement information for many events, given only their IDs.
+
+        The IDs of every event the user liked, bookmarked or registered for are loaded
+        once and cached until the user's next like, bookmark or ticket change, so a
+        page of events costs a single cache lookup however long it is.
+
+        Args:
+            event_ids (List[int]): The IDs of the events.
+            user (Optional[AttendeeUser]): The user for whom the engagement data is resolved.
+
+        Returns:
+            Dict[int, Dict]: User engagement data keyed by event ID.
+        """
+        if user is None or not user.is_authenticated or not event_ids:
+            engagement = {'liked': set(), 'bookmarked': set(), 'applied': set()}
+        else:
+            engagement = cls.load_user_engagement(user)
+
+        return {
+            event_id: UserEngagementSchema(
+                is_liked=event_id in engagement['liked'],
+                is_bookmarked=event_id in engagement['bookmarked'],
+                is_applied=event_id in engagement['applied'],
             ).dict()
-        
-        return UserEngagementSchema(
-            is_liked=event.likes.has_user_liked(user, event),
-            is_bookmarked=Bookmarks.objects.filter(event=event, attendee=user).exists(),
-            is_applied=Ticket.objects.filter(event=event, attendee=user).exists(),
-        ).dict()
-        
+            for event_id in event_ids
+        }
+
+    @staticmethod
+    def load_user_engagement(user: AttendeeUser) -> Dict[str, Set[int]]:
+        """
+        Get the IDs of the events a user liked, bookmarked and registered for.
+
+        Args:
+            user (AttendeeUser): The authenticated user.
+
+        Returns:
+            Dict[str, Set[int]]: The `liked`, `bookmarked` and `applied` event ID sets,
+            from the cache when possible.
+        """
+        engagement = get_user_engagement(user.id)
+        if engagement is None:
+            engagement = {
+                'liked': set(Like.objects.filter(user=user, status='like').values_list('event_id', flat=True)),
+                'bookmarked': set(Bookmarks.objects.filter(attendee=user).values_list('event_id', flat=True)),
+                'applied': set(Ticket.objects.filter(attendee=user).values_list('event_id', flat=True)),
+            }
+            cache_user_engagement(user.id, engagement)
+        return engagement
+
     @classmethod
     def set_status_event(cls, event: Event):
         event.set_registeration_status()
@@ -113,6 +223,9 @@ class EventResponseSchema(ModelSchema):
         model = Event
         fields = '__all__'
 
+class NearbyEventResponseSchema(EventResponseSchema):
+    distance_km: float
+
 class EventUpdateSchema(Schema):
     event_name: Optional[str] = None
     event_create_date: Optional[datetime] = None
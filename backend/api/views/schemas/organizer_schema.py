@@ -19,6 +19,7 @@ class OrganizerResponseSchema(Schema):
     email: EmailStr
     organization_type: OrganizerType
     logo: Optional[str]
+    logo_variant_urls: Dict[str, Dict[str, str]] = {}
     is_verified: bool
     
 class OrganizerUpdateSchema(Schema):
@@ -18,4 +18,32 @@ class FileUploadResponseSchema(Schema):
     file_url: str
     message: str = "Upload successful"
     file_name: str
-    uploaded_at: datetime
\ No newline at end of file
+    uploaded_at: datetime
+
+# File formats of data exports
+class ExportFormat(str, Enum):
+    CSV = 'csv'
+    NDJSON = 'ndjson'
+
+# Schemas for direct-to-S3 uploads
+class UploadTarget(str, Enum):
+    EVENT_IMAGE = 'event_image'
+    LOGO = 'logo'
+    PROFILE_PICTURE = 'profile_picture'
+
+class PresignedUploadRequestSchema(Schema):
+    target: UploadTarget
+    target_id: Optional[int] = None
+    filename: str
+    content_type: str
+    size: int
+
+class PresignedUploadResponseSchema(Schema):
+    url: str
+    fields: Dict[str, str]
+    key: str
+    upload_token: str
+    expires_in: int
+
+class UploadCompleteSchema(Schema):
+    upload_token: str
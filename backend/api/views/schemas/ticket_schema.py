@@ -17,4 +17,12 @@ class TicketResponseSchema(Schema):
     register_date: datetime
     status: Optional[str] = None
     created_at: datetime
-    updated_at: datetime
\ No newline at end of file
+    updated_at: datetime
+
+
+class WaitingRoomStatusSchema(Schema):
+    state: str
+    position: Optional[int] = None
+    queue_length: int
+    estimated_wait_seconds: Optional[int] = None
+    admitted_until: Optional[datetime] = None
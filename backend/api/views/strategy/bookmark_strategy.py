@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from api.views.modules import *
 from api.views.schemas.event_schema import *
+from api.views.pagination import KeysetPaginator, paginated_response
 
 class BookmarkStrategy(ABC):
     """
@@ -48,41 +49,51 @@ class BookmarkStrategy(ABC):
     
 class BookmarkShowStrategy(BookmarkStrategy):
     """Strategy for showing bookmarks."""
-    def execute(self):
+    def execute(self, cursor: Optional[str] = None, limit: Optional[int] = None):
         """
-        Retrieve and return a list of events bookmarked by the user.
+        Retrieve and return one page of events bookmarked by the user, most recently bookmarked first.
 
-        This method filters the bookmarks for the current user and collects the associated events.
+        This method paginates the bookmarks of the current user and collects the associated events.
         Engagement data and user engagement status are added to each event before returning the list.
 
+        Args:
+            cursor (Optional[str]): The cursor returned with the previous page.
+            limit (Optional[int]): The maximum number of events in the page.
+
         Returns:
-            List[Dict]: A list containing event data with engagement and user engagement details.
+            Response: A list containing event data with engagement and user engagement details,
+            with the cursor of the next page in the `X-Next-Cursor` header.
         """
-        bookmarks = Bookmarks.objects.filter(attendee=self.user)
-        
-        events = [bookmark.event for bookmark in bookmarks]
+        paginator = KeysetPaginator('bookmark_at', cursor=cursor, limit=limit)
+        bookmarks, next_cursor = paginator.paginate(Bookmarks.objects.filter(attendee=self.user))
+        event_ids = [bookmark.event_id for bookmark in bookmarks]
 
         # Add engagement and user_engaged properties
         event_data = []
-        self.add_engagement(events, event_data)
+        self.add_engagement(Event.objects.filter(id__in=event_ids), event_data)
+        position = {event_id: index for index, event_id in enumerate(event_ids)}
+        event_data.sort(key=lambda event: position[event['id']])
 
-        return event_data
+        return paginated_response(event_data, next_cursor)
 
     def add_engagement(self, events, event_data : list):
         """
         Add engagement and user engagement data to the given event data list.
 
+        The user's engagement is loaded for all events at once.
+
         Args:
-            events (List[Event]): The events to add engagement data for.
+            events (QuerySet): The events to add engagement data for.
             event_data (List[Dict]): The list of event data to add the engagement data to.
         """
+        events = list(events.select_related('organizer'))
+        user_engagement = EventResponseSchema.resolve_user_engagement_bulk(events, self.user)
         for event in events:
             engagement = EventResponseSchema.resolve_engagement(event)
-            user_engaged = EventResponseSchema.resolve_user_engagement(event, self.user)
             EventResponseSchema.set_status_event(event)
             event_schema = EventResponseSchema.from_orm(event)
             event_schema.engagement = engagement
-            event_schema.user_engaged = user_engaged
+            event_schema.user_engaged = user_engagement[event.id]
             event_data.append(event_schema.dict())
             
             
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from api.views.modules import *
-from api.views.schemas.comment_schema import CommentResponseSchema, CommentSchema
+from api.live import publish_comment
+from api.views.schemas.comment_schema import CommentReactionSchema, CommentResponseSchema, CommentSchema
 
 
 class CommentStrategy(ABC):
@@ -14,6 +15,7 @@ class CommentStrategy(ABC):
             'create_comment': CommentCreateStrategy(),
             'update_comment': CommentUpdateStrategy(),
             'delete_comment': CommentDeleteStrategy(),
+            'react_comment': CommentReactStrategy(),
         }
         return strategies.get(strategy_name)
     
@@ -47,6 +49,7 @@ class CommentCreateStrategy(CommentStrategy):
                 content=comment.content, status=Comment.Status.APPROVED
             )
             logger.info(f"Comment created for event {event_id} by {user.username}.")
+            publish_comment(event.id, 'created', CommentResponseSchema.live_payload(comment))
             return Response(CommentResponseSchema.from_orm(comment), status=200)
         
         except Http404:
@@ -79,6 +82,7 @@ class CommentUpdateStrategy(CommentStrategy):
 
             comment.content = data.content
             comment.save(update_fields=['content'])
+            publish_comment(comment.event_id, 'edited', CommentResponseSchema.live_payload(comment))
 
             logger.info(f"Comment {comment_id} edited by user {request.user.username}")
             return Response(CommentResponseSchema.from_orm(comment), status=200)
@@ -114,10 +118,53 @@ class CommentDeleteStrategy(CommentStrategy):
                 }, status=403)
                 
             comment.delete()
+            publish_comment(comment.event_id, 'deleted', {"id": comment_id, "parent_id": comment.parent_id})
             logger.info(f"Comment {comment_id} deleted by user {request.user.username}")
             return Response({'message': 'Delete comment successfully.'}, status=200)
         
         except Http404:
             logger.error(f"Comment {comment_id} not found for delete.")
             return Response({'error': 'Comment not found'}, status=404)
-        
\ No newline at end of file
+
+
+class CommentReactStrategy(CommentStrategy):
+    """Toggle a reaction of the user on a comment."""
+    def execute(self, request: HttpRequest, comment_id: int, data: CommentReactionSchema):
+        """Add the reaction if the user has not reacted with it yet, or else remove it.
+
+        The toggle runs in a transaction, and a concurrent request adding the same reaction
+        is caught by the unique constraint, so the counts never include a reaction twice.
+
+        Args:
+            request (HttpRequest): HTTP request with authenticated user.
+            comment_id (int): ID of the comment to react to.
+            data (CommentReactionSchema): The reaction type.
+
+        Returns:
+            Response: Whether the user now has the reaction, and the comment's reaction
+            counts, or an error message.
+        """
+        user = request.user
+        reaction_type = data.reaction_type.value
+        try:
+            comment = get_object_or_404(Comment, id=comment_id)
+        except Http404:
+            logger.error(f"Comment {comment_id} not found for reaction.")
+            return Response({'error': 'Comment not found'}, status=404)
+
+        with transaction.atomic():
+            removed, _ = CommentReaction.objects.filter(
+                comment=comment, user=user, reaction_type=reaction_type
+            ).delete()
+            reacted = not removed
+            if reacted:
+                try:
+                    with transaction.atomic():
+                        CommentReaction.objects.create(comment=comment, user=user, reaction_type=reaction_type)
+                except IntegrityError:
+                    # A concurrent request added the same reaction first
+                    pass
+
+        summary = CommentReaction.objects.summarize([comment.id], user)[comment.id]
+        logger.info(f"User {user.username} {'added' if reacted else 'removed'} {reaction_type} on comment {comment_id}.")
+        return Response({"comment_id": comment.id, "reacted": reacted, **summary}, status=200)
@@ -5,12 +5,26 @@ from api.views.schemas.other_schema import *
 from api.views.schemas.comment_schema import CommentResponseSchema
 from api.views.schemas.user_schema import UserResponseSchema
 from api.views.schemas.ticket_schema import TicketResponseSchema
+from api.views.pagination import KeysetPaginator, RankedPaginator, paginated_response
+from api.search import get_search_backend
+from django.db.models import Count, FloatField
+from django.db.models.functions import Cast
+from api.geo import bounding_box, covering_prefixes, has_location, haversine_km, prefix_range
+from api.storage import ImageUploadService
+from api.images import schedule_image_variants
+from api.exports import EXPORT_CHUNK_SIZE, streaming_export
+from api.live import AVAILABILITY_CHANNEL, COMMENT_CHANNEL, sse_frame, sse_response
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from api.cache import (cache_event_page, cache_events, cache_facets, get_cached_event_page, get_cached_events,
+                       get_cached_facets)
 
 
 class EventStrategy(ABC):
     """
     Base class for event strategies.
     """
+    image_uploads = ImageUploadService('event_images')
 
     def __init__(self, request: HttpRequest):
         self.user = request.user
@@ -33,7 +47,13 @@ class EventStrategy(ABC):
             'create_event': EventCreateStrategy(request),
             'organizer_get_events': EventOrganizerStrategy(request),
             'list_event': EventListStrategy(request),
+            'event_facets': EventFacetsStrategy(request),
+            'popular_tags': EventTagsStrategy(request),
+            'search_events': EventSearchStrategy(request),
+            'nearby_events': EventNearbyStrategy(request),
             'event_detail': EventDetailStrategy(request),
+            'event_availability': EventAvailabilityStrategy(request),
+            'event_availability_stream': EventAvailabilityStream(request),
             'edit_event': EventEditStrategy(request),
             'upload_event_image': EventUploadImageStrategy(request),
         }
@@ -72,58 +92,105 @@ class EventStrategy(ABC):
         if image.content_type not in ALLOWED_IMAGE_TYPES:
                 return Response({'error': 'Invalid file type. Only JPEG and PNG are allowed.'}, status=400)
             
-            # (Image upload process, similar to your upload_event_image logic)
-        filename = f'event_images/{uuid.uuid4()}{os.path.splitext(image.name)[1]}'
         try:
-            self.upload_s3(image, filename)
-            event.event_image = filename
-            event.save()
-            file_url = f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/{filename}"
-            logger.info(f"Uploaded event image for event ID {event.id}: {file_url}")
+            filename = self.image_uploads.upload(image)
         except ClientError as e:
             return Response({'error': f"S3 upload failed"}, status=400)
+        event.event_image = filename
         event.save()
+        schedule_image_variants(event, 'event_image')
+        file_url = self.image_uploads.file_url(filename)
+        logger.info(f"Uploaded event image for event ID {event.id}: {file_url}")
         return EventResponseSchema.from_orm(event)
 
-    def upload_s3(self, image, filename):
+    
+    def paginate_events(self, events, cursor: Optional[str] = None, limit: Optional[int] = None):
         """
-        Upload an image file to an S3 bucket.
+        Load one page of events, newest first, together with their organizer.
 
         Args:
-            image (InMemoryUploadedFile): The image file to be uploaded.
-            filename (str): The target filename for the uploaded image in the S3 bucket.
+            events (QuerySet): The events to paginate.
+            cursor (Optional[str]): The cursor returned with the previous page.
+            limit (Optional[int]): The maximum number of events in the page.
 
         Returns:
-            None
+            Tuple[list, Optional[str]]: The events of the page and the cursor of the next page.
         """
-        s3_client = boto3.client(
-                's3',
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_S3_REGION_NAME
-            )
-        s3_client.upload_fileobj(
-                image.file,
-                settings.AWS_STORAGE_BUCKET_NAME,
-                filename,
-                ExtraArgs={'ContentType': image.content_type}
-            )
-    
+        paginator = KeysetPaginator('event_create_date', cursor=cursor, limit=limit)
+        return paginator.paginate(events.select_related('organizer'))
+
+    @staticmethod
+    def event_payload(event: Event) -> dict:
+        """
+        Build the part of an event response that is the same for every user.
+
+        Args:
+            event (Event): The event, with its organizer loaded.
+
+        Returns:
+            dict: The serialized event with its engagement counts and current statuses,
+            without `user_engaged`.
+        """
+        engagement = EventResponseSchema.resolve_engagement(event)
+        EventResponseSchema.set_status_event(event)
+        event_data = EventResponseSchema.from_orm(event)
+        event_data.engagement = engagement
+        return event_data.dict()
+
+    def cached_event_payloads(self, event_ids: List[int]) -> Dict[int, dict]:
+        """
+        Get the shared payloads of events from the cache, building and caching the missing ones.
+
+        Args:
+            event_ids (List[int]): The IDs of the events.
+
+        Returns:
+            Dict[int, dict]: The payloads by event ID; events that do not exist are left out.
+        """
+        payloads, keys = get_cached_events(event_ids)
+        missing = [event_id for event_id in event_ids if event_id not in payloads]
+        if missing:
+            built = {
+                event.id: self.event_payload(event)
+                for event in Event.objects.select_related('organizer').filter(id__in=missing)
+            }
+            cache_events(keys, built)
+            payloads.update(built)
+        return payloads
+
+    def with_user_engagement(self, event_ids: List[int], payloads: Dict[int, dict]) -> List[dict]:
+        """
+        Add the current user's engagement to shared event payloads.
+
+        Args:
+            event_ids (List[int]): The IDs of the events, in response order.
+            payloads (Dict[int, dict]): The shared payloads by event ID.
+
+        Returns:
+            List[dict]: The event responses, in the order of `event_ids`.
+        """
+        event_ids = [event_id for event_id in event_ids if event_id in payloads]
+        user_engagement = EventResponseSchema.resolve_user_engagement_by_ids(event_ids, self.user)
+        return [{**payloads[event_id], 'user_engaged': user_engagement[event_id]} for event_id in event_ids]
+
     def add_event(self, event_list: list, events : list):
         """
         Add event data to a list, including engagement information and user engagement status.
 
+        The user's engagement is loaded for all events at once, so the number of queries
+        does not grow with the number of events.
+
         Args:
             event_list (list): The list to which event data will be added.
-            events (QuerySet): The events for which data will be added to the list.
+            events (list): The events for which data will be added to the list.
         """
+        user_engagement = EventResponseSchema.resolve_user_engagement_bulk(events, self.user)
         for event in events:
                 engagement = EventResponseSchema.resolve_engagement(event)
-                user_engaged = EventResponseSchema.resolve_user_engagement(event, self.user)
                 EventResponseSchema.set_status_event(event)
                 event_data = EventResponseSchema.from_orm(event)
                 event_data.engagement = engagement
-                event_data.user_engaged = user_engaged
+                event_data.user_engaged = user_engagement[event.id]
                 event_list.append(event_data)
                 
                 
@@ -138,15 +205,9 @@ class EventStrategy(ABC):
         Returns:
             None
         """
-        if self.request.headers.get("Authorization"):
-            token = self.request.headers.get('Authorization')
-            if token != None and token.startswith('Bearer '):
-                token = token[7:]
-                if JWTAuth().authenticate(self.request,token):
-                    user = JWTAuth().authenticate(self.request, token)
-                    self.user = user
-        else:
-            self.user = self.request.user
+        user = authenticate_request(self.request)
+        if user:
+            self.user = user
         
     
     
@@ -185,28 +246,33 @@ class EventOrganizerStrategy(EventStrategy):
     Strategy for retrieving events for an organizer.
     """
         
-    def execute(self):
+    def execute(self, cursor: Optional[str] = None, limit: Optional[int] = None):
         """
         Retrieve events created by the authenticated organizer.
 
         Args:
-            None
+            cursor (Optional[str]): The cursor returned with the previous page.
+            limit (Optional[int]): The maximum number of events in the page.
 
         Returns:
-            Response: List of events created by the organizer, ordered by event creation date in descending order.
+            Response: One page of events created by the organizer, ordered by event creation date in descending order,
+            with the cursor of the next page in the `X-Next-Cursor` header.
             ErrorResponseSchema: Error message with status code 404 if the user is not an organizer,
             or 400 in case of other errors.
         """
         try:
             organizer = Organizer.objects.get(user=self.user)
-            events = Event.objects.filter(organizer=organizer, event_create_date__lte=timezone.now()).order_by("-event_create_date")
+            events = Event.objects.filter(organizer=organizer, event_create_date__lte=timezone.now())
+            events, next_cursor = self.paginate_events(events, cursor, limit)
             event_list = []
             self.add_event(event_list,events)
             logger.info(f"Organizer {organizer.organizer_name} retrieved their events.")
-            return Response(event_list, status=200)
+            return paginated_response(event_list, next_cursor)
         except Organizer.DoesNotExist:
             logger.error(f"User {self.user.username} tried to access events but is not an organizer.")
             return Response({'error': 'User is not an organizer'}, status=404)
+        except HttpError:
+            raise
         except Exception as e:
             logger.error(f"Error while retrieving events for organizer {self.user.id}: {str(e)}")
             return Response({'error': str(e)}, status=400)
@@ -216,29 +282,206 @@ class EventListStrategy(EventStrategy):
     """
     Strategy for retrieving all public events.
     """
-    def execute(self):
+    def execute(self, cursor: Optional[str] = None, limit: Optional[int] = None,
+                filters: Optional[EventFilterSchema] = None):
         """
         Retrieve all public events for the homepage.
 
         Args:
-            None
+            cursor (Optional[str]): The cursor returned with the previous page.
+            limit (Optional[int]): The maximum number of events in the page.
+            filters (Optional[EventFilterSchema]): Only list the events matching these filters.
+
+        The event IDs of the page and every event's shared payload are cached separately,
+        so the page is served from the cache with only the user's engagement queried.
 
         Returns:
-            Response: List of all public events, ordered by event creation date in descending order.
+            Response: One page of public events, ordered by event creation date in descending order,
+            with the cursor of the next page in the `X-Next-Cursor` header.
             ErrorResponseSchema: Error message with status code 400 in case of other errors.
         """
-        events = Event.objects.filter(event_create_date__lte=timezone.now()).order_by("-event_create_date")
-        event_list = []
+        filters = filters or EventFilterSchema()
+        page, page_key = get_cached_event_page(cursor, limit, filters.cache_key())
+        if page is None:
+            events = filters.filter(Event.objects.filter(event_create_date__lte=timezone.now()))
+            events = events.only('id', 'event_create_date')
+            paginator = KeysetPaginator('event_create_date', cursor=cursor, limit=limit)
+            events, next_cursor = paginator.paginate(events)
+            page = ([event.id for event in events], next_cursor)
+            cache_event_page(page_key, *page)
+        event_ids, next_cursor = page
         self.autheticate_user()
 
-        self.add_event(event_list,events)
-
-        # Conditionally add user-specific engagement data
+        event_list = self.with_user_engagement(event_ids, self.cached_event_payloads(event_ids))
 
         logger.info("Retrieved all public events for the homepage.")
-        return Response(event_list, status=200)
+        return paginated_response(event_list, next_cursor)
     
     
+class EventFacetsStrategy(EventStrategy):
+    """
+    Strategy for counting the public events per filter value.
+    """
+    def execute(self, filters: Optional[EventFilterSchema] = None):
+        """
+        Count the public events per category, free and paid, and online and in person.
+
+        All counts come from a single grouped query over the three fields, cached until the
+        event list changes.
+
+        Args:
+            filters (Optional[EventFilterSchema]): Only count the events matching these filters.
+
+        Returns:
+            dict: The total and the counts per category, price and attendance.
+        """
+        filters = filters or EventFilterSchema()
+        facets, facets_key = get_cached_facets(filters.cache_key())
+        if facets is None:
+            events = filters.filter(Event.objects.filter(event_create_date__lte=timezone.now()))
+            groups = events.order_by().values('category', 'is_free', 'is_online').annotate(total=Count('id'))
+            facets = {
+                'total': 0,
+                'category': {category: 0 for category, _ in Event.EVENT_CATEGORIES},
+                'price': {'free': 0, 'paid': 0},
+                'attendance': {'online': 0, 'in_person': 0},
+            }
+            for group in groups:
+                facets['total'] += group['total']
+                facets['category'][group['category']] = facets['category'].get(group['category'], 0) + group['total']
+                facets['price']['free' if group['is_free'] else 'paid'] += group['total']
+                facets['attendance']['online' if group['is_online'] else 'in_person'] += group['total']
+            cache_facets(facets_key, facets)
+        logger.info("Counted the public events per filter value.")
+        return facets
+
+
+class EventTagsStrategy(EventStrategy):
+    """
+    Strategy for listing the tags of published events.
+    """
+    MAX_TAGS = 100
+
+    def execute(self, limit: Optional[int] = None):
+        """
+        List the tags used by the most published events.
+
+        Args:
+            limit (Optional[int]): The maximum number of tags, 20 by default.
+
+        Returns:
+            list: The tags with their event counts, most used first.
+        """
+        limit = min(max(limit or 20, 1), self.MAX_TAGS)
+        tags = list(Tag.objects.popular(limit).values('name', 'event_count'))
+        logger.info("Listed %d popular tags.", len(tags))
+        return tags
+
+
+class EventSearchStrategy(EventStrategy):
+    """
+    Strategy for searching published events.
+    """
+    def execute(self, query: str, cursor: Optional[str] = None, limit: Optional[int] = None):
+        """
+        Search events by name, tags, description, detailed description and organizer name.
+
+        The full-text index returns one page of event IDs, best match first; the events
+        themselves come from the event response cache.
+
+        Args:
+            query (str): The search text.
+            cursor (Optional[str]): The cursor returned with the previous page.
+            limit (Optional[int]): The maximum number of events in the page.
+
+        Returns:
+            Response: One page of matching events, with the cursor of the next page in the
+            `X-Next-Cursor` header.
+            Response: Error message with status code 400 if the query has no words.
+        """
+        search = get_search_backend()
+        if not search.words(query):
+            return Response({'error': 'Search query must contain at least one word.'}, status=400)
+
+        paginator = RankedPaginator(cursor=cursor, limit=limit)
+        event_ids, next_cursor = paginator.paginate(lambda count, offset: search.search(query, count, offset))
+        self.autheticate_user()
+
+        event_list = self.with_user_engagement(event_ids, self.cached_event_payloads(event_ids))
+        logger.info("Searched events for %r: %d results.", query, len(event_list))
+        return paginated_response(event_list, next_cursor)
+
+
+class EventNearbyStrategy(EventStrategy):
+    """
+    Strategy for finding upcoming events around a location.
+    """
+    DEFAULT_RADIUS_KM = 10.0
+    MAX_RADIUS_KM = 50.0
+
+    def execute(self, latitude: Optional[float] = None, longitude: Optional[float] = None,
+                radius_km: Optional[float] = None, cursor: Optional[str] = None, limit: Optional[int] = None):
+        """
+        Find the published events that have not ended within a radius of a location, closest first.
+
+        The geohash index narrows the events down to the cells covering the circle and its
+        bounding box trims the cells' edges; the exact great-circle distance then drops the
+        events outside the circle and orders the rest.
+
+        Args:
+            latitude (Optional[float]): The latitude of the location, the user's own if not given.
+            longitude (Optional[float]): The longitude of the location, the user's own if not given.
+            radius_km (Optional[float]): The search radius in kilometres, at most `MAX_RADIUS_KM`.
+            cursor (Optional[str]): The cursor returned with the previous page.
+            limit (Optional[int]): The maximum number of events in the page.
+
+        Returns:
+            Response: One page of events with their `distance_km`, with the cursor of the next page
+            in the `X-Next-Cursor` header.
+            Response: Error message with status code 400 if the location or radius is missing or invalid.
+        """
+        self.autheticate_user()
+        if latitude is None and longitude is None and self.user.is_authenticated \
+                and has_location(self.user.latitude, self.user.longitude):
+            latitude, longitude = float(self.user.latitude), float(self.user.longitude)
+        if latitude is None or longitude is None:
+            return Response({'error': 'A latitude and longitude are required.'}, status=400)
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            return Response({'error': 'The location is out of range.'}, status=400)
+        radius_km = self.DEFAULT_RADIUS_KM if radius_km is None else radius_km
+        if not 0 < radius_km <= self.MAX_RADIUS_KM:
+            return Response({'error': f'The radius must be between 0 and {self.MAX_RADIUS_KM:g} km.'}, status=400)
+
+        cells = Q()
+        for prefix in covering_prefixes(latitude, longitude, radius_km):
+            lower, upper = prefix_range(prefix)
+            cells |= Q(geohash__gte=lower, geohash__lt=upper)
+        min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+        box = Q(latitude__range=(min_lat, max_lat))
+        if -180 <= min_lng and max_lng <= 180:
+            box &= Q(longitude__range=(min_lng, max_lng))
+        now = timezone.now()
+        candidates = Event.objects.filter(cells, box, event_create_date__lte=now, end_date_event__gte=now)
+        # Plain floats are much cheaper to read than the Decimal values of the coordinate fields
+        candidates = candidates.values_list('id', Cast('latitude', FloatField()), Cast('longitude', FloatField()))
+        distances = sorted(
+            (haversine_km(latitude, longitude, event_lat, event_lng), event_id)
+            for event_id, event_lat, event_lng in candidates
+        )
+        distances = [(distance, event_id) for distance, event_id in distances if distance <= radius_km]
+
+        paginator = RankedPaginator(cursor=cursor, limit=limit)
+        page, next_cursor = paginator.paginate(lambda count, offset: distances[offset:offset + count])
+        event_ids = [event_id for _, event_id in page]
+        distance_of = {event_id: round(distance, 3) for distance, event_id in page}
+
+        event_list = self.with_user_engagement(event_ids, self.cached_event_payloads(event_ids))
+        for event_data in event_list:
+            event_data['distance_km'] = distance_of[event_data['id']]
+        logger.info("Found %d events within %g km of (%f, %f).", len(distances), radius_km, latitude, longitude)
+        return paginated_response(event_list, next_cursor)
+
+
 class EventDetailStrategy(EventStrategy):
     """
     Strategy for retrieving details of a specific event.
@@ -253,20 +496,83 @@ class EventDetailStrategy(EventStrategy):
         Returns:
             EventResponseSchema: The event details along with engagement data, user-specific engagement status,
             and updated event status.
+
+        Raises:
+            Http404: If the event does not exist.
         """
         self.autheticate_user()
         logger.info("Fetching details for event ID: %d by user %s.", event_id, self.request.user.username)
-        event = get_object_or_404(Event, id=event_id)
-        engagement_data = EventResponseSchema.resolve_engagement(event)
-        user_engaged = EventResponseSchema.resolve_user_engagement(event, self.user)
-        EventResponseSchema.set_status_event(event)
-
-        event_data = EventResponseSchema.from_orm(event)
-        event_data.engagement = engagement_data
-        event_data.user_engaged = user_engaged
-        return event_data
+        event_data = self.with_user_engagement([event_id], self.cached_event_payloads([event_id]))
+        if not event_data:
+            raise Http404("No Event matches the given query.")
+        return event_data[0]
     
     
+class EventAvailabilityStrategy(EventStrategy):
+    """
+    Strategy for retrieving the seat availability of an event.
+    """
+    def execute(self, event_id: int):
+        """
+        Retrieve the attendee count, spots left and registration status of an event.
+
+        The response is much smaller than the event detail and is the same for every user,
+        so it comes from the cache, carries an ETag and may be reused by shared caches for
+        `AVAILABILITY_MAX_AGE` seconds; a client sending the ETag back gets a 304 until a
+        seat is taken or released.
+
+        Args:
+            event_id (int): The ID of the event.
+
+        Returns:
+            Response: The availability, or a 304 response if the client's copy is current.
+
+        Raises:
+            Http404: If the event does not exist.
+        """
+        availability = Event.get_availability(event_id)
+        if availability is None:
+            raise Http404("No Event matches the given query.")
+        etag = '"{event_id}-{attendee_count}-{max_attendee}-{status_registeration}"'.format(**availability)
+        if etag in self.request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+        else:
+            response = Response(EventAvailabilitySchema(**availability).dict(), status=200)
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=settings.AVAILABILITY_MAX_AGE)
+        return response
+
+
+class EventAvailabilityStream(EventStrategy):
+    """
+    Strategy for streaming the seat availability of an event as it changes.
+    """
+    def execute(self, event_id: int):
+        """
+        Stream the availability of an event, starting with the current one.
+
+        Every ticket registration or cancellation publishes the new availability once it
+        commits, so watchers of a ticket drop cost no database queries while they wait.
+
+        Args:
+            event_id (int): The ID of the event.
+
+        Returns:
+            StreamingHttpResponse: The `text/event-stream` response of `availability` events.
+
+        Raises:
+            Http404: If the event does not exist.
+        """
+        if Event.get_availability(event_id) is None:
+            raise Http404("No Event matches the given query.")
+
+        def current():
+            return sse_frame('availability', EventAvailabilitySchema(**Event.get_availability(event_id)).dict())
+
+        logger.info(f"Streaming availability of event {event_id}.")
+        return sse_response(AVAILABILITY_CHANNEL.format(id=event_id), initial=current)
+
+
 class EventEditStrategy(EventStrategy):
     """
     Strategy for editing an event.    
@@ -311,31 +617,6 @@ class EventEditStrategy(EventStrategy):
         
 class EventUploadImageStrategy(EventStrategy):
     """Strategy for uploading an image for an event."""
-    def replace_old_image(self, old_filename):
-        """
-        Delete an existing image from S3.
-
-        Args:
-            old_filename (str): The key of the image file to be deleted in the S3 bucket.
-
-        Returns:
-            None
-
-        Logs:
-            Logs information about the deletion process. Logs an error if deletion fails.
-        """
-        s3_client = boto3.client(
-                    's3',
-                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                    region_name=settings.AWS_S3_REGION_NAME
-                )
-        try:
-            s3_client.delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=old_filename)
-            logger.info(f"Deleted old image from S3: {old_filename}")
-        except ClientError as e:
-            logger.error(f"Failed to delete old image from S3: {str(e)}")
-            
     def validate_image(self,event, organizer, file):
         """
         Validate an image before uploading it to S3.
@@ -381,19 +662,18 @@ class EventUploadImageStrategy(EventStrategy):
                 return Response({'error': str(validation_error.messages[0])}, status=400)
 
             if event.event_image:
-                old_filename = event.event_image.url
-                self.replace_old_image(old_filename)
+                self.image_uploads.delete(event.event_image.name)
 
-            filename = f'event_images/{uuid.uuid4()}{os.path.splitext(file.name)[1]}'
+            filename = self.image_uploads.build_key(file.name)
             logger.info("Starting upload for file: %s", filename)
 
             try:
-                self.upload_s3(file, filename)
-                file_url = f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/{filename}"
-                logger.info("Successfully uploaded file to S3: %s", file_url)
+                self.image_uploads.upload(file, filename)
+                file_url = self.image_uploads.file_url(filename)
 
                 event.event_image = filename
                 event.save()
+                schedule_image_variants(event, 'event_image')
 
                 return Response(FileUploadResponseSchema(
                     file_url=file_url,
@@ -417,6 +697,7 @@ class EventUploadImageStrategy(EventStrategy):
 class EventEngagement:
     """Base class for event engagement strategies."""
     def __init__(self, request, event_id):
+        self.request = request
         self.user = request.user
         self.event = get_object_or_404(Event, id=event_id)
         
@@ -434,12 +715,16 @@ class EventEngagement:
             An instance of the strategy corresponding to the given name,
             or None if the name is not recognized.
         """
+        # Every strategy loads the event, so only the requested one is constructed
         strategies = {
-            'event_comment': EventCommentStrategy(request,event_id),
-            'event_attendee': EventAllAttendee(request,event_id),
-            'event_ticket' : EventAllTicket(request, event_id)
+            'event_comment': EventCommentStrategy,
+            'event_comment_stream': EventCommentStream,
+            'event_attendee': EventAllAttendee,
+            'event_ticket' : EventAllTicket,
+            'event_attendee_export': EventAttendeeExport,
         }
-        return strategies.get(strategy_name)
+        strategy = strategies.get(strategy_name)
+        return strategy(request, event_id) if strategy else None
         
     
     @abstractmethod    
@@ -465,21 +750,57 @@ class EventEngagement:
 
 class EventCommentStrategy(EventEngagement):
     """Strategy to retrieve comments for an event."""
-    def execute(self):
+    def execute(self, cursor: Optional[str] = None, limit: Optional[int] = None):
         """
-        Execute the strategy to retrieve top-level comments for the event.
+        Execute the strategy to retrieve one page of top-level comments for the event with their threads.
+
+        One query loads the page of top-level comments, one recursive query loads every
+        reply below them, each with its author, and one grouped query counts their
+        reactions, so a thread with thousands of replies takes the same number of queries
+        as an empty one.
+
+        Args:
+            cursor (Optional[str]): The cursor returned with the previous page.
+            limit (Optional[int]): The maximum number of top-level comments in the page.
 
         Returns:
             Response: A response containing a list of serialized top-level comments
-            for the event, including related user, replies, and reactions.
-            The comments are ordered by creation date in descending order.
-        """
-        comments = Comment.objects.filter(event=self.event, parent=None).select_related('user').prefetch_related('replies', 'reactions').order_by('-created_at')
-        response_data = [CommentResponseSchema.from_orm(comment) for comment in comments]
+            for the event, including their users, nested replies, reply counts, reaction
+            counts and the reactions of the user of the request's bearer token, if any.
+            The comments and the replies under each comment are ordered by creation date
+            in descending order; the cursor of the next page is in the `X-Next-Cursor` header.
+        """
+        comments = Comment.objects.filter(event=self.event, parent=None).select_related('user')
+        comments, next_cursor = KeysetPaginator('created_at', cursor=cursor, limit=limit).paginate(comments)
+        replies = (
+            Comment.objects.descendants_of([comment.id for comment in comments])
+            .select_related('user')
+            .order_by('-created_at', '-id')
+        )
+        user = authenticate_request(self.request)
+        response_data = CommentResponseSchema.build_forest(comments, replies, user)
         logger.info(f"Retrieved {len(comments)} comments for event {self.event.id}.")
-        return Response(response_data, status=200)
+        return paginated_response(response_data, next_cursor)
     
     
+class EventCommentStream(EventEngagement):
+    """Strategy to stream the comment changes of an event as they happen."""
+    def execute(self):
+        """
+        Execute the strategy to stream the comments created, edited or deleted on the event.
+
+        Clients load the comments once and then follow this stream instead of polling the
+        comment list. Each change is a server-sent event named `comment.created`,
+        `comment.edited` or `comment.deleted` whose data is the comment as JSON, with its
+        `parent_id`; a deleted comment has only its `id` and `parent_id`.
+
+        Returns:
+            StreamingHttpResponse: The `text/event-stream` response, served by the ASGI application.
+        """
+        logger.info(f"Streaming comments of event {self.event.id}.")
+        return sse_response(COMMENT_CHANNEL.format(id=self.event.id))
+
+
 class EventAllAttendee(EventEngagement):
     """Strategy to retrieve all attendees for an event."""
     def execute(self):
@@ -496,7 +817,7 @@ class EventAllAttendee(EventEngagement):
             if self.event.organizer != organizer:
                 logger.warning(f"User {self.user.username} tried to access attendee list but is not an organizer.")
                 return Response({'error': 'You are not allowed to access this event.'}, status=403)
-            tickets = Ticket.objects.filter(event=self.event).order_by('attendee__username')
+            tickets = Ticket.objects.filter(event=self.event).select_related('attendee').order_by('attendee__username')
             response_data = [UserResponseSchema.from_orm(ticket.attendee) for ticket in tickets]
             logger.info(f"Retrieved attendee list for event {self.event.id}.")
             return Response(response_data, status=200)
@@ -514,13 +835,48 @@ class EventAllTicket(EventEngagement):
         Returns:
             Response: A response containing a list of serialized tickets for the event, ordered by ticket ID.
         """
-        tickets = Ticket.objects.filter(event=self.event).order_by('id')
+        tickets = Ticket.objects.filter(event=self.event).select_related('event', 'attendee').order_by('id')
         response_data = [TicketResponseSchema(
                             **ticket.get_ticket_details()
                         )
                         for ticket in tickets]
         logger.info(f"Retrieved ticket list for event {self.event.id}.")
         return Response(response_data, status=200)
+
+
+class EventAttendeeExport(EventEngagement):
+    """Strategy to export the attendees of an event as a file."""
+    COLUMNS = ('ticket_number', 'ticket_status', 'register_date', 'attendee_id', 'username',
+               'first_name', 'last_name', 'email', 'phone_number', 'nationality', 'company')
+    FIELDS = ('ticket_number', 'status', 'register_date', 'attendee_id', 'attendee__username',
+              'attendee__first_name', 'attendee__last_name', 'attendee__email', 'attendee__phone_number',
+              'attendee__nationality', 'attendee__company')
+
+    def execute(self, export_format: str = 'csv'):
+        """
+        Stream every ticket of the event with its attendee, ordered by ticket ID.
+
+        The rows are read in chunks from a single query joining the attendees and written out
+        as they are read, so exporting 20,000 attendees takes as little memory as exporting 20.
+
+        Args:
+            export_format (str): `csv` or `ndjson`.
+
+        Returns:
+            StreamingHttpResponse: The export file.
+            Response: Error message with status code 403 if the user is not the event's organizer.
+        """
+        if not Organizer.objects.filter(user=self.user, id=self.event.organizer_id).exists():
+            logger.warning(f"User {self.user.username} tried to export attendees but is not the organizer.")
+            return Response({'error': 'You are not allowed to access this event.'}, status=403)
+        rows = (
+            Ticket.objects.filter(event=self.event)
+            .order_by('id')
+            .values_list(*self.FIELDS)
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        logger.info(f"Exporting attendees of event {self.event.id} as {export_format}.")
+        return streaming_export(self.COLUMNS, rows, export_format, f'event-{self.event.id}-attendees')
         
         
 
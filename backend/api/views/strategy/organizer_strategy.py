@@ -1,6 +1,8 @@
 from api.views.modules import *
 from api.views.schemas.organizer_schema import *
 from api.views.schemas.other_schema import FileUploadResponseSchema
+from api.storage import ImageUploadService
+from api.images import schedule_image_variants
 
 
 logger = logging.getLogger(__name__)
@@ -231,64 +233,8 @@ class UploadLogoStrategy(OrganizerStrategy):
     """Upload a logo for an organizer"""
     ALLOWED_IMAGE_TYPES = ['image/jpeg', 'image/png', 'image/jpg']
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+    logo_uploads = ImageUploadService('logos')
     
-    def _delete_existing_logo(self, old_filename):
-        """
-        Delete an existing logo from S3.
-
-        Args:
-            old_filename (str): The name of the existing logo file to be deleted.
-
-        Returns:
-            None
-        """
-        logger.info(f"Deleting old image from S3: {old_filename}")
-        try:
-            s3_client = boto3.client(
-                's3',
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_S3_REGION_NAME
-            )
-            s3_client.delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=old_filename)
-            logger.info(f"Deleted old image from S3: {old_filename}")
-        except ClientError as e:
-            logger.error(f"Failed to delete old image from S3: {str(e)}")
-
-    def _upload_to_s3(self, file_obj, filename):
-        """
-        Upload a file to S3 directly using boto3.
-
-        Args:
-            file_obj (File): The file to be uploaded.
-            filename (str): The filename to use when uploading the file.
-
-        Returns:
-            str: The URL of the uploaded file.
-        """
-        try:
-            s3_client = boto3.client(
-                's3',
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_S3_REGION_NAME
-            )
-
-            s3_client.upload_fileobj(
-                file_obj,
-                settings.AWS_STORAGE_BUCKET_NAME,
-                filename,
-                ExtraArgs={'ContentType': file_obj.content_type}
-            )
-
-            file_url = f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/{filename}"
-            logger.info(f"Successfully uploaded file to S3: {file_url}")
-            return file_url
-
-        except ClientError as e:
-            logger.error(f"S3 upload error: {str(e)}")
-            raise
-
     def execute(self, request: HttpRequest, organizer_id: int, logo: UploadedFile = File(...)):
         """
         Upload a logo for an organizer.
@@ -317,13 +263,14 @@ class UploadLogoStrategy(OrganizerStrategy):
                 )
 
             if organizer.logo:
-                self._delete_existing_logo(organizer.logo.url)
+                self.logo_uploads.delete(organizer.logo.name)
 
-            filename = f'logos/{uuid.uuid4()}{os.path.splitext(logo.name)[1]}'
-            file_url = self._upload_to_s3(logo, filename)
+            filename = self.logo_uploads.upload(logo)
+            file_url = self.logo_uploads.file_url(filename)
 
             organizer.logo = filename
             organizer.save()
+            schedule_image_variants(organizer, 'logo')
 
             return Response(FileUploadResponseSchema(
                 file_url=file_url,
@@ -1,6 +1,18 @@
 from abc import ABC, abstractmethod
 from api.views.modules import *
 from api.views.schemas.ticket_schema import *
+from api.live import AVAILABILITY_CHANNEL, publish_on_commit
+from api.waiting_room import get_waiting_room
+
+def publish_availability(event_id: int) -> None:
+    """
+    Push the seat availability of an event to its live streams once the ticket change commits.
+
+    Args:
+        event_id (int): The ID of the event.
+    """
+    publish_on_commit(AVAILABILITY_CHANNEL.format(id=event_id), 'availability', lambda: Event.get_availability(event_id))
+
 
 class TicketStrategy(ABC):
     """
@@ -23,6 +35,8 @@ class TicketStrategy(ABC):
             'register_ticket': TicketRegisterStrategy(),
             'cancel_ticket': TicketDeleteStrategy(),
             'sent_reminder': TicketSendReminderStrategy(),
+            'join_waiting_room': TicketJoinWaitingRoomStrategy(),
+            'waiting_room_status': TicketWaitingRoomStatusStrategy(),
         }
         return strategies.get(strategy_name)
     
@@ -126,12 +140,14 @@ class TicketRegisterStrategy(TicketStrategy):
         if event.is_max_attendee():
             raise ValidationError("This event has reached the maximum number of attendees.")
 
+        # The stored status is only refreshed periodically, for listings
+        registeration_status = event.compute_registeration_status()
+        if registeration_status != 'OPEN':
+            raise ValidationError(f"Registration for this event is {registeration_status.lower()} now.")
+
         if not event.can_register():
             raise ValidationError("Registration for this event is not allowed.")
 
-        if not event.is_registration_status_allowed():
-            raise ValidationError(f"Registration for this event is {event.status_registeration.lower()} now.")
-
         if event.visibility == 'PRIVATE' and not event.is_email_allowed(user.email):
             raise PermissionDenied("Your email domain is not authorized to register for this event.")
 
@@ -153,6 +169,8 @@ class TicketRegisterStrategy(TicketStrategy):
         Raises:
             400: If the registration fails due to invalid data.
             403: If the event is private and the user's email domain is not authorized to register for this event.
+            429: If the event's waiting room has not admitted the user yet; the response holds
+                the user's place in the queue and a `Retry-After` header.
             500: If an error occurs during the registration process.
         """
         user = request.user
@@ -185,12 +203,25 @@ class TicketRegisterStrategy(TicketStrategy):
                 status=400
             )
 
+        waiting_room = get_waiting_room()
+        admission = waiting_room.admit(event, user.id)
+        if admission and not admission.admitted:
+            status = waiting_room.status(admission)
+            response = Response({'error': "You are in the waiting room for this event.", **status}, status=429)
+            response['Retry-After'] = str(min(status['estimated_wait_seconds'] or 1, 30))
+            return response
+
         try:
-            ticket.clean()
-            ticket.save()
+            # The confirmation email is queued on commit, after the ticket is saved
+            with transaction.atomic():
+                ticket.clean()
+                ticket.save()
 
-            notification_manager = TicketNotificationManager(ticket)
-            notification_manager.send_registration_confirmation()
+                notification_manager = TicketNotificationManager(ticket)
+                notification_manager.send_registration_confirmation()
+                publish_availability(event.id)
+            if admission:
+                waiting_room.release(event.id, user.id)
             return Response(TicketResponseSchema(
                 **ticket.get_ticket_details()).dict(), status=201)
 
@@ -223,15 +254,17 @@ class TicketDeleteStrategy(TicketStrategy):
         this_user = request.user
         try:
             ticket = Ticket.objects.get(id=ticket_id, attendee=this_user)
-            # Send cancellation email before deleting the ticket
-            try:
-                notification_manager = TicketNotificationManager(ticket)
-                notification_manager.send_cancellation_notification()
-            except Exception as email_error:
-                logger.error("Failed to send cancellation email: %s", email_error)
-                return Response({'error': 'Failed to send cancellation email'}, status=500)
-
-            ticket.delete()
+            with transaction.atomic():
+                # Queue the cancellation email before deleting the ticket, it is sent on commit
+                try:
+                    notification_manager = TicketNotificationManager(ticket)
+                    notification_manager.send_cancellation_notification()
+                except Exception as email_error:
+                    logger.error("Failed to send cancellation email: %s", email_error)
+                    return Response({'error': 'Failed to send cancellation email'}, status=500)
+
+                ticket.delete()
+                publish_availability(ticket.event_id)
             return Response({
                 "success": f"Ticket with ID {ticket_id} has been canceled."
             }, status=200)
@@ -246,6 +279,51 @@ class TicketDeleteStrategy(TicketStrategy):
             return Response({'error': 'Internal server error'}, status=500)
         
         
+class TicketJoinWaitingRoomStrategy(TicketStrategy):
+    """
+    Join the waiting room of an event.
+    """
+    def execute(self, request: HttpRequest, event_id: int) -> Response:
+        """
+        Take a place in the waiting room of an event, keeping the place already taken.
+
+        Args:
+            request (HttpRequest): The request object containing the user joining.
+            event_id (int): The ID of the event.
+
+        Returns:
+            Response: The user's place in the queue; the state is `open` if the event
+            has no waiting room now, and `admitted` once the user may register.
+        """
+        event = get_object_or_404(Event, id=event_id)
+        waiting_room = get_waiting_room()
+        return Response(waiting_room.status(waiting_room.admit(event, request.user.id)), status=200)
+
+
+class TicketWaitingRoomStatusStrategy(TicketStrategy):
+    """
+    Check a place in the waiting room of an event.
+    """
+    def execute(self, request: HttpRequest, event_id: int) -> Response:
+        """
+        Get the user's place in the waiting room of an event without joining it.
+
+        Checking also lets in the users the admission rate allows, so the queue moves
+        while its users poll.
+
+        Args:
+            request (HttpRequest): The request object containing the user.
+            event_id (int): The ID of the event.
+
+        Returns:
+            Response: The user's place in the queue; the state is `not_queued` if the
+            user has not joined.
+        """
+        event = get_object_or_404(Event, id=event_id)
+        waiting_room = get_waiting_room()
+        return Response(waiting_room.status(waiting_room.admit(event, request.user.id, join=False)), status=200)
+
+
 class TicketSendReminderStrategy(TicketStrategy):
     """
     Send a reminder email to a specific ticket holder.
@@ -0,0 +1,187 @@
+from abc import ABC, abstractmethod
+from django.core import signing
+from api.images import IMAGE_VARIANT_FIELDS, schedule_image_variants
+from api.views.modules import *
+from api.views.schemas.other_schema import *
+from api.views.strategy.event_strategy import EventStrategy
+from api.views.strategy.organizer_strategy import UploadLogoStrategy
+from api.views.strategy.user_strategy import UserUploadProfilePicture
+
+PRESIGNED_UPLOAD_EXPIRY = 10 * 60  # 10 minutes
+UPLOAD_TOKEN_SALT = 'api.uploads'
+
+
+class UploadStrategy(ABC):
+    """
+    Base class for direct-to-S3 upload strategies.
+
+    The client asks for a presigned POST, uploads the file straight to the bucket, then
+    calls the completion endpoint, so the file never passes through an API worker.
+    """
+    # Upload target -> (upload service, model field)
+    TARGETS = {
+        UploadTarget.EVENT_IMAGE: (EventStrategy.image_uploads, 'event_image'),
+        UploadTarget.LOGO: (UploadLogoStrategy.logo_uploads, 'logo'),
+        UploadTarget.PROFILE_PICTURE: (UserUploadProfilePicture.picture_uploads, 'profile_picture'),
+    }
+
+    def __init__(self, request: HttpRequest):
+        self.user = request.user
+
+    @staticmethod
+    def get_strategy(strategy_name: str, request: HttpRequest):
+        """
+        Retrieve the upload strategy instance based on the provided strategy name.
+
+        Args:
+            strategy_name (str): The name of the strategy to retrieve.
+            request (HttpRequest): The HTTP request object, containing user and request metadata.
+
+        Returns:
+            An instance of the corresponding upload strategy class,
+            or None if the strategy name is not found.
+        """
+        strategies = {
+            'presign_upload': PresignUploadStrategy(request),
+            'complete_upload': CompleteUploadStrategy(request),
+        }
+        return strategies.get(strategy_name)
+
+    @abstractmethod
+    def execute(self, *arg, **kwargs):
+        """
+        Execute the upload strategy with the given arguments.
+
+        Args:
+            *arg: Variable length argument list. The arguments passed to this method
+                depend on the specific strategy being executed.
+            **kwargs: Keyword argument dictionary. The keyword arguments passed to this
+                method depend on the specific strategy being executed.
+        """
+        pass
+
+    def get_target_instance(self, target: UploadTarget, target_id: Optional[int]):
+        """
+        Get the object whose image is uploaded, checking that the user may change it.
+
+        Args:
+            target (UploadTarget): What the image is for.
+            target_id (Optional[int]): The ID of the event or organizer; unused for profile pictures.
+
+        Returns:
+            Model: The event, organizer or user the image belongs to.
+
+        Raises:
+            Http404: If the event or organizer does not exist.
+            PermissionDenied: If the user does not own the event or organizer.
+        """
+        if target == UploadTarget.PROFILE_PICTURE:
+            return self.user
+        model = Event if target == UploadTarget.EVENT_IMAGE else Organizer
+        instance = get_object_or_404(model, id=target_id)
+        owner_id = instance.organizer.user_id if target == UploadTarget.EVENT_IMAGE else instance.user_id
+        if owner_id != self.user.id:
+            raise PermissionDenied(f'You are not allowed to upload an image for this {model.__name__.lower()}.')
+        return instance
+
+
+class PresignUploadStrategy(UploadStrategy):
+    """Strategy for issuing a presigned upload."""
+    def execute(self, data: PresignedUploadRequestSchema) -> Response:
+        """
+        Issue a presigned POST for uploading an image straight to S3.
+
+        Args:
+            data (PresignedUploadRequestSchema): What the image is for and the file's name, type and size.
+
+        Returns:
+            Response: The presigned POST and a signed token to pass to the completion endpoint,
+            or an error response if the file or target is not allowed.
+        """
+        if data.content_type not in ALLOWED_IMAGE_TYPES:
+            return Response({'error': 'Invalid file type. Only JPEG and PNG are allowed.'}, status=400)
+        if not 0 < data.size <= MAX_FILE_SIZE:
+            return Response({'error': f'File size exceeds the limit of {MAX_FILE_SIZE / (1024 * 1024)} MB.'}, status=400)
+
+        try:
+            instance = self.get_target_instance(data.target, data.target_id)
+        except PermissionDenied as permission_error:
+            return Response({'error': str(permission_error)}, status=403)
+
+        uploads, _ = self.TARGETS[data.target]
+        key = uploads.build_key(data.filename)
+        try:
+            presigned = uploads.presign_post(key, data.content_type, MAX_FILE_SIZE, PRESIGNED_UPLOAD_EXPIRY)
+        except ClientError as client_error:
+            logger.error("Failed to presign upload: %s", str(client_error))
+            return Response({'error': 'Could not create the upload.'}, status=400)
+
+        upload_token = signing.dumps(
+            {'target': data.target.value, 'id': instance.pk, 'key': key, 'user': self.user.id},
+            salt=UPLOAD_TOKEN_SALT,
+        )
+        return Response(PresignedUploadResponseSchema(
+            url=presigned['url'],
+            fields=presigned['fields'],
+            key=key,
+            upload_token=upload_token,
+            expires_in=PRESIGNED_UPLOAD_EXPIRY,
+        ).dict(), status=200)
+
+
+class CompleteUploadStrategy(UploadStrategy):
+    """Strategy for completing a presigned upload."""
+    def execute(self, data: UploadCompleteSchema) -> Response:
+        """
+        Verify an object uploaded with a presigned POST and set it as the target's image.
+
+        The previous image is deleted from the bucket. An uploaded object that breaks the
+        type or size rules is deleted and rejected.
+
+        Args:
+            data (UploadCompleteSchema): The token returned when the upload was presigned.
+
+        Returns:
+            Response: Details of the uploaded image, or an error response if the upload is
+            invalid.
+        """
+        try:
+            upload = signing.loads(data.upload_token, salt=UPLOAD_TOKEN_SALT, max_age=PRESIGNED_UPLOAD_EXPIRY)
+        except signing.BadSignature:
+            return Response({'error': 'Invalid or expired upload token.'}, status=400)
+        if upload['user'] != self.user.id:
+            return Response({'error': 'Invalid or expired upload token.'}, status=400)
+
+        target = UploadTarget(upload['target'])
+        try:
+            instance = self.get_target_instance(target, upload['id'])
+        except PermissionDenied as permission_error:
+            return Response({'error': str(permission_error)}, status=403)
+
+        uploads, field = self.TARGETS[target]
+        key = upload['key']
+        try:
+            head = uploads.head(key)
+        except ClientError:
+            return Response({'error': 'Uploaded file not found.'}, status=400)
+
+        if head.get('ContentType') not in ALLOWED_IMAGE_TYPES or head.get('ContentLength', 0) > MAX_FILE_SIZE:
+            uploads.delete(key)
+            return Response({'error': 'Uploaded file is not a valid image.'}, status=400)
+
+        old_image = getattr(instance, field)
+        if old_image and old_image.name != key:
+            uploads.delete(old_image.name)
+        setattr(instance, field, key)
+        instance.save(update_fields=[field])
+        if field in IMAGE_VARIANT_FIELDS:
+            schedule_image_variants(instance, field)
+
+        file_url = uploads.file_url(key)
+        logger.info("Completed direct upload: %s", file_url)
+        return Response(FileUploadResponseSchema(
+            file_url=file_url,
+            message="Upload successful",
+            file_name=os.path.basename(key),
+            uploaded_at=timezone.now()
+        ).dict(), status=200)
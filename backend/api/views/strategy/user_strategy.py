@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from api.views.modules import *
 from api.views.schemas.user_schema import *
 from api.views.schemas.other_schema import FileUploadResponseSchema
+from api.storage import ImageUploadService
+from api.cache import invalidate_events
 
 
 class UserStrategy(ABC):
@@ -320,8 +322,17 @@ class UserDeleteAccount(UserStrategy):
 
         user = request.user
         get_user = AttendeeUser.objects.get(id = user.id)
+        engaged_event_ids = set(Ticket.objects.filter(attendee=get_user).values_list('event_id', flat=True))
+        engaged_event_ids.update(Like.objects.filter(user=get_user).values_list('event_id', flat=True))
+        engaged_event_ids.update(Bookmarks.objects.filter(attendee=get_user).values_list('event_id', flat=True))
 
-        get_user.delete()
+        owned_event_ids = list(Event.objects.filter(organizer__user=get_user).values_list('id', flat=True))
+
+        with transaction.atomic():
+            get_user.delete()
+            # The cascade bypasses the per-row counter updates and cache invalidation
+            Event.objects.filter(id__in=engaged_event_ids).reconcile_counters()
+            invalidate_events(owned_event_ids, listing=True)
             
         return Response({'success': 'Your account has been deleted'})
     
@@ -329,10 +340,12 @@ class UserUploadProfilePicture(UserStrategy):
     """
     Strategy for uploading a user's profile picture.
     """
+    picture_uploads = ImageUploadService('picture_profiles')
+
     @staticmethod
     def upload_file_to_s3(user,filename, profile_picture):
         """
-        Upload a file to S3 directly using boto3.
+        Upload a file to S3 with the shared upload service.
 
         Args:
             user (AttendeeUser): The user who is uploading the file.
@@ -343,26 +356,8 @@ class UserUploadProfilePicture(UserStrategy):
             Response: A response containing the uploaded file's details upon successful upload.
         """
         try:
-                # Direct S3 upload using boto3
-                s3_client = boto3.client(
-                    's3',
-                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                    region_name=settings.AWS_S3_REGION_NAME
-                )
-
-                # Upload file to S3
-                s3_client.upload_fileobj(
-                    profile_picture.file,
-                    settings.AWS_STORAGE_BUCKET_NAME,
-                    filename,
-                    ExtraArgs={
-                        'ContentType': profile_picture.content_type,
-                    }
-                )
-
-                file_url = f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/{filename}"
-                logger.info(f"Successfully uploaded file to S3: {file_url}")
+                UserUploadProfilePicture.picture_uploads.upload(profile_picture, filename)
+                file_url = UserUploadProfilePicture.picture_uploads.file_url(filename)
                 
                 user.profile_picture = filename
                 user.save()
@@ -399,7 +394,7 @@ class UserUploadProfilePicture(UserStrategy):
             if profile_picture.size > MAX_FILE_SIZE:
                 return Response({'error': f'File size exceeds the limit of {MAX_FILE_SIZE / (1024 * 1024)} MB.'}, status=400)
 
-            filename = f'picture_profiles/{uuid.uuid4()}{os.path.splitext(profile_picture.name)[1]}'
+            filename = self.picture_uploads.build_key(profile_picture.name)
             logger.info(f"Starting upload for file: {filename}")
             upload_file = self.upload_file_to_s3(user, filename, profile_picture)
             return upload_file
@@ -1,4 +1,4 @@
-from api.views.schemas.ticket_schema import TicketResponseSchema
+from api.views.schemas.ticket_schema import TicketResponseSchema, WaitingRoomStatusSchema
 from api.views.schemas.other_schema import ErrorResponseSchema
 from .modules import *
 from .strategy.ticket_strategy import *
@@ -10,7 +10,7 @@ class TicketAPI:
     """
     Controller for handling ticket-related operations.
     """
-    @route.get('/user/{user_id}', response=List[TicketResponseSchema], auth=JWTAuth())
+    @route.get('/user/{user_id}', response=List[TicketResponseSchema], auth=CachedJWTAuth())
     def list_user_tickets(self, request: HttpRequest, user_id: int):
         """
         Retrieve a list of tickets for a specific user.
@@ -26,7 +26,7 @@ class TicketAPI:
         return strategy.execute(user_id)
             
 
-    @route.post('/event/{event_id}/register', response={201: TicketResponseSchema, 400: ErrorResponseSchema}, auth=JWTAuth())
+    @route.post('/event/{event_id}/register', response={201: TicketResponseSchema, 400: ErrorResponseSchema, 429: WaitingRoomStatusSchema}, auth=CachedJWTAuth())
     def register_for_event(self,request: HttpRequest, event_id: int):
         """
         Register a user for an event.
@@ -40,13 +40,44 @@ class TicketAPI:
 
         Raises:
             400: If event registration is not allowed or if the user is already registered for the event.
+            429: If the event's waiting room has not admitted the user yet.
         """
 
         strategy : TicketStrategy = TicketStrategy.get_strategy('register_ticket')
         return strategy.execute(request, event_id)
         
 
-    @route.delete('/{ticket_id}/cancel', auth=JWTAuth())
+    @route.post('/event/{event_id}/queue', response=WaitingRoomStatusSchema, auth=CachedJWTAuth())
+    def join_waiting_room(self, request: HttpRequest, event_id: int):
+        """
+        Join the waiting room of an event whose registration just opened.
+
+        Args:
+            request (HttpRequest): The HTTP request object, containing user and request metadata.
+            event_id (int): The ID of the event.
+
+        Returns:
+            WaitingRoomStatusSchema: The user's place in the queue.
+        """
+        strategy : TicketStrategy = TicketStrategy.get_strategy('join_waiting_room')
+        return strategy.execute(request, event_id)
+
+    @route.get('/event/{event_id}/queue', response=WaitingRoomStatusSchema, auth=CachedJWTAuth())
+    def waiting_room_status(self, request: HttpRequest, event_id: int):
+        """
+        Check the user's place in the waiting room of an event.
+
+        Args:
+            request (HttpRequest): The HTTP request object, containing user and request metadata.
+            event_id (int): The ID of the event.
+
+        Returns:
+            WaitingRoomStatusSchema: The user's place in the queue.
+        """
+        strategy : TicketStrategy = TicketStrategy.get_strategy('waiting_room_status')
+        return strategy.execute(request, event_id)
+
+    @route.delete('/{ticket_id}/cancel', auth=CachedJWTAuth())
     def cancel_ticket(self,request: HttpRequest, ticket_id: int):
         """
         Cancel a ticket for a specific user.
@@ -65,7 +96,7 @@ class TicketAPI:
         strategy : TicketStrategy = TicketStrategy.get_strategy('cancel_ticket')
         return strategy.execute(request, ticket_id)
         
-    @route.get('/{ticket_id}', response=TicketResponseSchema, auth=JWTAuth())
+    @route.get('/{ticket_id}', response=TicketResponseSchema, auth=CachedJWTAuth())
     def ticket_detail(self,request: HttpRequest, ticket_id: int):
         """
         Retrieve detailed information for a specific ticket.
@@ -84,7 +115,7 @@ class TicketAPI:
         strategy : TicketStrategy = TicketStrategy.get_strategy('get_ticket_detail')
         return strategy.execute(ticket_id)
 
-    @route.post('/{ticket_id}/send-reminder', auth=JWTAuth())
+    @route.post('/{ticket_id}/send-reminder', auth=CachedJWTAuth())
     def send_remider(self,request: HttpRequest, ticket_id: int):
         """
         Send a reminder email to a specific ticket holder.
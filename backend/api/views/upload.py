@@ -0,0 +1,42 @@
+from .modules import *
+from api.views.schemas.other_schema import *
+from api.views.strategy.upload_strategy import UploadStrategy
+
+
+@api_controller('/uploads', tags=['Uploads'])
+class UploadAPI:
+    """
+    API endpoints for uploading images straight to S3.
+    """
+    @route.post('/presign', response={200: PresignedUploadResponseSchema, 400: ErrorResponseSchema, 403: ErrorResponseSchema, 404: ErrorResponseSchema}, auth=CachedJWTAuth())
+    def presign_upload(self, request: HttpRequest, data: PresignedUploadRequestSchema):
+        """
+        Issues a presigned POST for uploading an event image, organizer logo or profile picture.
+
+        The client posts the file with the returned `fields` to `url`, then calls `/uploads/complete`
+        with the `upload_token`.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            data (PresignedUploadRequestSchema): What the image is for and the file's name, type and size.
+
+        Returns:
+            PresignedUploadResponseSchema: The presigned POST and the upload token.
+        """
+        strategy : UploadStrategy = UploadStrategy.get_strategy('presign_upload', request)
+        return strategy.execute(data)
+
+    @route.post('/complete', response={200: FileUploadResponseSchema, 400: ErrorResponseSchema, 403: ErrorResponseSchema, 404: ErrorResponseSchema}, auth=CachedJWTAuth())
+    def complete_upload(self, request: HttpRequest, data: UploadCompleteSchema):
+        """
+        Verifies an image uploaded with a presigned POST and sets it on the event, organizer or user.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            data (UploadCompleteSchema): The upload token returned by `/uploads/presign`.
+
+        Returns:
+            FileUploadResponseSchema: Details of the uploaded image.
+        """
+        strategy : UploadStrategy = UploadStrategy.get_strategy('complete_upload', request)
+        return strategy.execute(data)
@@ -70,7 +70,7 @@ class UserAPI:
         strategy : UserStrategy = UserStrategy.get_strategy('user_login')
         return strategy.execute(request, form)
 
-    @route.get('/profile', response=UserResponseSchema, auth=JWTAuth())
+    @route.get('/profile', response=UserResponseSchema, auth=CachedJWTAuth())
     def view_profile(self,request):
         """
         Retrieve the profile of the currently logged-in user.
@@ -81,7 +81,7 @@ class UserAPI:
         strategy : UserStrategy = UserStrategy.get_strategy('user_view_profile')
         return strategy.execute(request)
 
-    @route.patch('/edit-profile/{user_id}/', response=UserupdateSchema, auth=JWTAuth())
+    @route.patch('/edit-profile/{user_id}/', response=UserupdateSchema, auth=CachedJWTAuth())
     def edit_profile(self,request, user_id: int, new_data: UserupdateSchema):
         """
         Update the profile information of a user by user ID.
@@ -97,7 +97,7 @@ class UserAPI:
         strategy : UserStrategy = UserStrategy.get_strategy('user_edit_profile')
         return strategy.execute(user_id, new_data)
 
-    @route.delete('delete/', auth=JWTAuth())
+    @route.delete('delete/', auth=CachedJWTAuth())
     def delete_profile(self,request):
         """
         Delete a user profile by user ID.
@@ -111,7 +111,7 @@ class UserAPI:
         """
         strategy : UserStrategy = UserStrategy.get_strategy('user_delete_account')
         return strategy.execute(request)
-    @route.post('/{user_id}/upload/profile-picture/', response={200: FileUploadResponseSchema, 400: ErrorResponseSchema}, auth=JWTAuth())
+    @route.post('/{user_id}/upload/profile-picture/', response={200: FileUploadResponseSchema, 400: ErrorResponseSchema}, auth=CachedJWTAuth())
     def upload_profile_picture(self,request: HttpRequest, user_id: int, profile_picture: UploadedFile = File(...)):
         """
         Upload a profile picture for the specified user.
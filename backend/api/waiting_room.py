@@ -0,0 +1,290 @@
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Optional
+
+import redis
+from django.conf import settings
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = 'waiting:{id}:queue'
+ADMITTED_KEY = 'waiting:{id}:admitted'
+BUCKET_KEY = 'waiting:{id}:bucket'
+SEQUENCE_KEY = 'waiting:{id}:sequence'
+
+
+@dataclass
+class Admission:
+    """
+    The place of a user in the waiting room of an event.
+
+    Fields:
+        admitted (bool): Whether the user may register now.
+        position (Optional[int]): The place of the user in the queue, 1 for the next one
+            admitted, or None if the user is admitted or not in the queue.
+        queue_length (int): The number of users waiting.
+        admitted_until (Optional[float]): When the admission expires, as a Unix timestamp.
+    """
+    admitted: bool
+    position: Optional[int]
+    queue_length: int
+    admitted_until: Optional[float] = None
+
+
+class WaitingRoom(ABC):
+    """
+    Admission control for registrations to popular events.
+
+    When a capacity-limited event opens its registration, every client registers at once
+    and all of them contend for the seat counter of the same event row. During the first
+    `WAITING_ROOM_WINDOW_SECONDS` of the registration, users instead take a place in a
+    queue and are let into the registration at `WAITING_ROOM_RATE` users per second, a
+    token bucket holding up to one second of admissions. An admission lasts
+    `WAITING_ROOM_ADMISSION_SECONDS`. While the queue is empty users are admitted straight
+    away, so the room only shows when demand exceeds the rate.
+    """
+    def __init__(self):
+        self.clock = time.time
+
+    @abstractmethod
+    def _advance(self, event_id: int, user_id: int, join: bool, now: float) -> Admission:
+        """
+        Admit the users the token bucket allows, after adding the user to the queue.
+
+        Args:
+            event_id (int): The ID of the event.
+            user_id (int): The ID of the user.
+            join (bool): Whether to add the user to the queue if they are not in it.
+            now (float): The current Unix time.
+
+        Returns:
+            Admission: The place of the user.
+        """
+
+    @abstractmethod
+    def release(self, event_id: int, user_id: int) -> None:
+        """
+        End the admission of a user who completed the registration.
+
+        Args:
+            event_id (int): The ID of the event.
+            user_id (int): The ID of the user.
+        """
+
+    @staticmethod
+    def is_active(event, now: Optional[datetime] = None) -> bool:
+        """
+        Check whether registrations to an event go through the waiting room.
+
+        Args:
+            event (Event): The event.
+            now (Optional[datetime]): The current time.
+
+        Returns:
+            bool: True for capacity-limited events early in their registration period.
+        """
+        now = now or timezone.now()
+        if not event.max_attendee or not event.start_date_register:
+            return False
+        window = timedelta(seconds=settings.WAITING_ROOM_WINDOW_SECONDS)
+        return event.start_date_register <= now < event.start_date_register + window
+
+    def admit(self, event, user_id: int, join: bool = True) -> Optional[Admission]:
+        """
+        Take a place in the waiting room of an event, or check the place taken.
+
+        Args:
+            event (Event): The event.
+            user_id (int): The ID of the user.
+            join (bool): Whether to join the queue if the user is not in it yet.
+
+        Returns:
+            Optional[Admission]: The place of the user, or None if the event has no waiting room now.
+            Registrations are let through while the waiting room cannot be reached, as the seat
+            counter of the event still guards its capacity.
+        """
+        if not self.is_active(event):
+            return None
+        try:
+            return self._advance(event.id, user_id, join, self.clock())
+        except redis.RedisError as e:
+            logger.error(f"Waiting room unavailable, letting the registration through: {str(e)}")
+            return None
+
+    @staticmethod
+    def status(admission: Optional[Admission]) -> Dict:
+        """
+        Describe a place in the waiting room for the client.
+
+        Args:
+            admission (Optional[Admission]): The place, or None if there is no waiting room.
+
+        Returns:
+            Dict: The `state` (`open`, `admitted`, `waiting` or `not_queued`), the position,
+            the queue length, the estimated wait in seconds and the admission expiry.
+        """
+        if admission is None:
+            return {'state': 'open', 'position': None, 'queue_length': 0,
+                    'estimated_wait_seconds': None, 'admitted_until': None}
+        if admission.admitted:
+            state = 'admitted'
+        else:
+            state = 'waiting' if admission.position else 'not_queued'
+        wait = math.ceil(admission.position / settings.WAITING_ROOM_RATE) if admission.position else None
+        until = (datetime.fromtimestamp(admission.admitted_until, tz=dt_timezone.utc)
+                 if admission.admitted_until else None)
+        return {'state': state, 'position': admission.position, 'queue_length': admission.queue_length,
+                'estimated_wait_seconds': wait, 'admitted_until': until}
+
+    @staticmethod
+    def _limits():
+        """Get the admission rate, the token bucket size and the admission duration."""
+        rate = settings.WAITING_ROOM_RATE
+        return rate, max(rate, 1), settings.WAITING_ROOM_ADMISSION_SECONDS
+
+
+class RedisWaitingRoom(WaitingRoom):
+    """
+    Waiting room kept in Redis, shared by every worker.
+
+    The queue is a sorted set of user IDs scored by arrival, the admissions a sorted set
+    scored by expiry, and each step runs as one Lua script, so concurrent requests never
+    admit a user twice or more users than the bucket holds.
+    """
+    ADVANCE_SCRIPT = """
+        local queue, admitted, bucket, sequence = KEYS[1], KEYS[2], KEYS[3], KEYS[4]
+        local user, now, rate, burst = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+        local hold, ttl, join = tonumber(ARGV[5]), tonumber(ARGV[6]), ARGV[7] == '1'
+
+        redis.call('ZREMRANGEBYSCORE', admitted, '-inf', now)
+        local state = redis.call('HMGET', bucket, 'tokens', 'at')
+        local tokens = math.min(burst, (tonumber(state[1]) or burst) + (now - (tonumber(state[2]) or now)) * rate)
+        if join and not redis.call('ZSCORE', admitted, user) and not redis.call('ZSCORE', queue, user) then
+            redis.call('ZADD', queue, redis.call('INCR', sequence), user)
+        end
+        while tokens >= 1 do
+            local head = redis.call('ZPOPMIN', queue)
+            if #head == 0 then break end
+            redis.call('ZADD', admitted, now + hold, head[1])
+            tokens = tokens - 1
+        end
+        redis.call('HSET', bucket, 'tokens', tostring(tokens), 'at', tostring(now))
+        for _, key in ipairs(KEYS) do redis.call('EXPIRE', key, ttl) end
+
+        local length = redis.call('ZCARD', queue)
+        local expiry = redis.call('ZSCORE', admitted, user)
+        if expiry then return {1, 0, length, expiry} end
+        local rank = redis.call('ZRANK', queue, user)
+        return {0, rank and rank + 1 or 0, length, false}
+    """
+
+    def __init__(self, url: str):
+        super().__init__()
+        self.redis = redis.Redis.from_url(url)
+        self.advance_script = self.redis.register_script(self.ADVANCE_SCRIPT)
+
+    @staticmethod
+    def _keys(event_id: int):
+        return [key.format(id=event_id) for key in (QUEUE_KEY, ADMITTED_KEY, BUCKET_KEY, SEQUENCE_KEY)]
+
+    def _advance(self, event_id: int, user_id: int, join: bool, now: float) -> Admission:
+        rate, burst, hold = self._limits()
+        ttl = settings.WAITING_ROOM_WINDOW_SECONDS + hold
+        admitted, rank, length, expiry = self.advance_script(
+            keys=self._keys(event_id), args=[user_id, now, rate, burst, hold, ttl, int(join)],
+        )
+        if admitted:
+            return Admission(True, None, length, float(expiry))
+        return Admission(False, rank or None, length)
+
+    def release(self, event_id: int, user_id: int) -> None:
+        try:
+            self.redis.zrem(ADMITTED_KEY.format(id=event_id), user_id)
+        except redis.RedisError as e:
+            # The admission lapses on its own
+            logger.error(f"Failed to release a waiting room admission: {str(e)}")
+
+
+class _Room:
+    """The state of the waiting room of one event, in memory."""
+    def __init__(self, burst: float, now: float):
+        self.order = deque()
+        self.sequence: Dict[int, int] = {}
+        self.admitted: Dict[int, float] = {}
+        # Admissions in the order they expire, as they all last as long
+        self.expiries = deque()
+        self.tokens = burst
+        self.at = now
+
+
+class InMemoryWaitingRoom(WaitingRoom):
+    """Waiting room kept in this process, for tests and a single worker."""
+
+    def __init__(self):
+        super().__init__()
+        self._rooms: Dict[int, _Room] = {}
+        self._lock = threading.Lock()
+
+    def _advance(self, event_id: int, user_id: int, join: bool, now: float) -> Admission:
+        rate, burst, hold = self._limits()
+        with self._lock:
+            room = self._rooms.setdefault(event_id, _Room(burst, now))
+            while room.expiries and room.expiries[0][0] <= now:
+                expiry, admitted_id = room.expiries.popleft()
+                if room.admitted.get(admitted_id) == expiry:
+                    del room.admitted[admitted_id]
+            room.tokens = min(burst, room.tokens + (now - room.at) * rate)
+            room.at = now
+            if join and user_id not in room.admitted and user_id not in room.sequence:
+                room.sequence[user_id] = room.sequence[room.order[-1]] + 1 if room.order else 0
+                room.order.append(user_id)
+            while room.tokens >= 1 and room.order:
+                head = room.order.popleft()
+                del room.sequence[head]
+                room.admitted[head] = now + hold
+                room.expiries.append((now + hold, head))
+                room.tokens -= 1
+
+            if user_id in room.admitted:
+                return Admission(True, None, len(room.order), room.admitted[user_id])
+            if user_id not in room.sequence:
+                return Admission(False, None, len(room.order))
+            # Users only leave the queue from its head, so the arrival numbers are consecutive
+            position = room.sequence[user_id] - room.sequence[room.order[0]] + 1
+            return Admission(False, position, len(room.order))
+
+    def release(self, event_id: int, user_id: int) -> None:
+        with self._lock:
+            room = self._rooms.get(event_id)
+            if room:
+                room.admitted.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Empty every waiting room."""
+        with self._lock:
+            self._rooms.clear()
+
+
+_room: Optional[WaitingRoom] = None
+
+
+def get_waiting_room() -> WaitingRoom:
+    """
+    Get the waiting room of this process.
+
+    Returns:
+        WaitingRoom: The Redis waiting room, or the in-memory one when `WAITING_ROOM_URL` is not set.
+    """
+    global _room
+    if _room is None:
+        url = settings.WAITING_ROOM_URL
+        _room = RedisWaitingRoom(url) if url else InMemoryWaitingRoom()
+    return _room
@@ -54,6 +54,10 @@ AWS_S3_FILE_OVERWRITE = False
 AWS_DEFAULT_ACL = 'public-read' 
 AWS_S3_SIGNATURE_VERSION = 's3v4'
 AWS_QUERYSTRING_AUTH = False 
+# Connections kept open by the process-wide S3 client
+AWS_S3_MAX_POOL_CONNECTIONS = config('AWS_S3_MAX_POOL_CONNECTIONS', default=20, cast=int)
+# Threads each image variant task uses to resize and upload variants
+IMAGE_VARIANT_WORKERS = config('IMAGE_VARIANT_WORKERS', default=4, cast=int)
 
 
 GOOGLE_OAUTH_TESTING = True 
@@ -87,6 +91,8 @@ EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 
 DEFAULT_FROM_EMAIL = config('EMAIL_HOST_USER')
 EMAIL_TIMEOUT = 20
+# Number of SMTP connections kept open per process for sending ticket emails
+EMAIL_POOL_SIZE = config('EMAIL_POOL_SIZE', default=4, cast=int)
 
 
 
@@ -213,6 +219,9 @@ NINJA_JWT = {
     'JWT_SECRET' : config('JWT_SECRET'),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
+# Verified access tokens remembered per process, and for how many seconds
+JWT_AUTH_CACHE_SIZE = config('JWT_AUTH_CACHE_SIZE', default=4096, cast=int)
+JWT_AUTH_CACHE_TTL = config('JWT_AUTH_CACHE_TTL', default=30, cast=int)
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
@@ -257,6 +266,8 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+CORS_EXPOSE_HEADERS = ['X-Next-Cursor']
+
 AUTH_USER_MODEL = 'api.AttendeeUser'
 
 
@@ -268,14 +279,58 @@ ACCOUNT_UNIQUE_EMAIL = True
 LOGIN_REDIRECT_URL = '/' 
 
 
+# Cache: Redis in production, local memory in tests so they do not need a Redis server
+if 'test' in sys.argv:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': config('CACHE_URL', default='redis://localhost:6379/1'),
+            'KEY_PREFIX': 'event-ease',
+        }
+    }
+# Longest time an event response stays cached, in seconds
+EVENT_CACHE_TIMEOUT = config('EVENT_CACHE_TIMEOUT', default=300, cast=int)
+
+# Live comment streams: Redis pub/sub in production, an in-process hub in tests
+LIVE_PUBSUB_URL = None if 'test' in sys.argv else config('LIVE_PUBSUB_URL', default='redis://localhost:6379/2')
+# Seconds between keepalive lines of an idle stream, and before a stream ends for the client to reconnect
+LIVE_KEEPALIVE_SECONDS = config('LIVE_KEEPALIVE_SECONDS', default=15, cast=int)
+LIVE_STREAM_SECONDS = config('LIVE_STREAM_SECONDS', default=300, cast=int)
+# Seconds clients and shared caches may reuse a seat availability response
+AVAILABILITY_MAX_AGE = config('AVAILABILITY_MAX_AGE', default=1, cast=int)
+
+# Waiting room of ticket drops: Redis in production, in memory in tests
+WAITING_ROOM_URL = None if 'test' in sys.argv else config('WAITING_ROOM_URL', default='redis://localhost:6379/3')
+# Users let into the registration of an event per second while its waiting room is active
+WAITING_ROOM_RATE = config('WAITING_ROOM_RATE', default=50, cast=int)
+# Seconds after registration opens during which registrations go through the waiting room
+WAITING_ROOM_WINDOW_SECONDS = config('WAITING_ROOM_WINDOW_SECONDS', default=1800, cast=int)
+# Seconds an admitted user has to complete the registration
+WAITING_ROOM_ADMISSION_SECONDS = config('WAITING_ROOM_ADMISSION_SECONDS', default=120, cast=int)
+
+
 CELERY_BROKER_URL = 'redis://localhost:6379/0' 
 CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
+# Number of tickets each reminder subtask sends
+REMINDER_CHUNK_SIZE = config('REMINDER_CHUNK_SIZE', default=200, cast=int)
+# Run tasks inline instead of sending them to the broker, e.g. for local development without Redis
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=False, cast=bool)
 
 CELERY_BEAT_SCHEDULE = {
     'send-daily-reminders': {
-        'task': 'utils.send_reminder_emails',
+        'task': 'api.utils.send_reminder_emails',
         'schedule': crontab(hour=9, minute=0), 
     },
+    'refresh-event-statuses': {
+        'task': 'api.utils.refresh_event_statuses',
+        'schedule': crontab(minute='*/5'),
+    },
 }
 
 
@@ -3,4 +3,4 @@
 cd backend
 python manage.py migrate --no-input
 python manage.py collectstatic --no-input
-gunicorn backend.wsgi:application --bind 0.0.0.0:8000
\ No newline at end of file
+gunicorn backend.asgi:application -k uvicorn_worker.UvicornWorker --bind 0.0.0.0:8000
\ No newline at end of file
@@ -27,4 +27,17 @@ api.interceptors.response.use(
   }
 );
 
+// List endpoints return one page at a time; the cursor of the next page comes in the X-Next-Cursor header
+export const getAllPages = async (url, config = {}) => {
+  const items = [];
+  let cursor = null;
+  do {
+    const params = cursor ? { ...config.params, cursor } : config.params;
+    const response = await api.get(url, { ...config, params });
+    items.push(...response.data);
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+  return items;
+};
+
 export default api;
@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { useForm } from 'react-hook-form';
 import { LuTrash2, LuSend, LuCheck, LuX } from "react-icons/lu";
 import { FiEdit2, FiMessageSquare } from "react-icons/fi";
-import api from '../../../api';
+import api, { getAllPages } from '../../../api';
 import { USER_ID } from '../../../constants';
 import { HiOutlineDotsVertical } from "react-icons/hi";
 import { ACCESS_TOKEN } from '../../../constants';
@@ -29,8 +29,7 @@ export function CommentSection({ event }) {
         const headers = {
           Authorization: `Bearer ${token}`,
         };
-        const response = await api.get(`/events/${eventId}/comments`, { headers });
-        return response.data;
+        return await getAllPages(`/events/${eventId}/comments`, { headers });
       } catch (error) {
         throw new Error('Error fetching comments: ' + (error.response?.data?.detail));
       }
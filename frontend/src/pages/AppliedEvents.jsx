@@ -3,7 +3,7 @@ import PageLayout from '../components/PageLayout';
 import { useNavigate } from 'react-router-dom';
 import EventCard from '../components/EventCard';
 import { ACCESS_TOKEN } from "../constants";
-import api from '../api';
+import api, { getAllPages } from '../api';
 import useUserProfile from '../hooks/useUserProfile';
 
 function AppliedEvents() {
@@ -23,7 +23,7 @@ function AppliedEvents() {
                 }
 
                 // Fetch all events from the API
-                const eventsResponse = await api.get(`/events/events`, {
+                const events = await getAllPages(`/events/events`, {
                     headers: {
                         Authorization: `Bearer ${token}`,
                     },
@@ -40,7 +40,7 @@ function AppliedEvents() {
                 const eventIds = ticketsResponse.data.map(ticket => ticket.event_id);
 
                 // Filter events based on applied event IDs
-                const appliedEvents = eventsResponse.data.filter(event => eventIds.includes(event.id));
+                const appliedEvents = events.filter(event => eventIds.includes(event.id));
 
                 setEvents(appliedEvents);
                 console.log('Fetched applied events:', appliedEvents);
@@ -4,7 +4,7 @@ import { useNavigate } from 'react-router-dom';
 import EventCard from '../components/EventCard';
 import { ACCESS_TOKEN } from "../constants";
 import useUserProfile from '../hooks/useUserProfile';
-import api from '../api';
+import { getAllPages } from '../api';
 
 function Bookmark() {
     const [events, setEvents] = useState([]);
@@ -22,15 +22,15 @@ function Bookmark() {
                     throw new Error('No access token or user ID found');
                 }
 
-                const response = await api.get(`/bookmarks/my-favorite/`, {
+                const events = await getAllPages(`/bookmarks/my-favorite/`, {
                     headers: {
                         Authorization: `Bearer ${token}`,
                         "Content-Type": "application/json"
                     },
                 });
 
-                setEvents(response.data);
-                console.log('Fetched bookmarked events:', response.data);
+                setEvents(events);
+                console.log('Fetched bookmarked events:', events);
             } catch (err) {
                 console.error('Error fetching bookmarked events:', err);
                 setError(err);
@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from 'react';
-import api from '../api';
+import { getAllPages } from '../api';
 import EventCard from '../components/EventCard';
 import PageLayout from '../components/PageLayout';
 import Sidebar from '../components/Discovery/Sidebar';
@@ -25,9 +25,9 @@ export default function Discover() {
       try {
         const token = localStorage.getItem(ACCESS_TOKEN);
         const headers = token ? { Authorization: `Bearer ${token}` } : {};
-        const response = await api.get('/events/events', { headers });
-        console.log(response.data);
-        setEvents(response.data);
+        const events = await getAllPages('/events/events', { headers });
+        console.log(events);
+        setEvents(events);
       } catch (err) {
         setError(err);
       } finally {
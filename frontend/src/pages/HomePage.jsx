@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from 'react';
-import api from '../api';
+import { getAllPages } from '../api';
 import EventCard from '../components/EventCard';
 import PageLayout from '../components/PageLayout';
 import { useNavigate,Link } from 'react-router-dom';
@@ -16,8 +16,8 @@ export default function Home() {
   useEffect(() => {
     const fetchEvents = async () => {
       try {
-        const response = await api.get('/events/events');
-        const sortedEvents = response.data.slice().sort((a, b) => new Date(b.start_date_event) - new Date(a.start_date_event));
+        const events = await getAllPages('/events/events');
+        const sortedEvents = events.slice().sort((a, b) => new Date(b.start_date_event) - new Date(a.start_date_event));
         setLatestEvents(sortedEvents.slice(0, 3));
       } catch (err) {
         setError(err);
@@ -4,7 +4,7 @@ import { useNavigate } from 'react-router-dom';
 import EventCard from '../components/EventCard';
 import { ACCESS_TOKEN } from "../constants";
 import useUserProfile from '../hooks/useUserProfile';
-import api from '../api';
+import { getAllPages } from '../api';
 
 function MyEvents() {
     const [events, setEvents] = useState([]);
@@ -27,15 +27,15 @@ function MyEvents() {
                 }
 
                 // Fetch organizer events from the API
-                const response = await api.get(`/events/my-events`, {
+                const events = await getAllPages(`/events/my-events`, {
                     headers: {
                         Authorization: `Bearer ${token}`,
                         "Content-Type": "application/json"
                     },
                 });
 
-                setEvents(response.data);
-                console.log('Fetched organizer events:', response.data);
+                setEvents(events);
+                console.log('Fetched organizer events:', events);
             } catch (err) {
                 console.error('Error fetching organizer events:', err);
                 setError(err);